@@ -0,0 +1,111 @@
+"""Micro-benchmarks for the dsl header parser against the original regex based split_header
+
+run with any python (no maya needed):
+    python benchmarks/bench_header_parser.py
+
+the parser walks the lines once and stops at the first line after the dsl block, while split_header ran a handful
+of regex searches over a fixed 20 lines. Reading and parsing a file lands within about 20% of the original either
+way, opening the file costs more than the parsing. Parsing a string on its own is slower, up to 3x on files without
+a header, since the loop runs in python and the parser also reports errors and reads blocks longer than 20 lines
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import timeit
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules', 'dsl', 'scripts'))
+
+from dsl_core import header as dsl_header
+
+HEADER = '''# dsl_button: Clean Camera
+# dsl_tab: Main:6:clean_camera()
+# dsl_tab: Other:12:
+# dsl_color: purple
+# dsl_description: create the clean copy of a camera
+# dsl_help: To use the script do the following:
+# dsl_help: 1. Select a camera
+# dsl_help: 2. Run the script.
+'''
+
+BODY = '''import pymel.core as pm
+
+
+def clean_camera():
+    """
+    duplicate the selected camera
+    """
+    return pm.duplicate(pm.selected())
+'''
+
+DOCSTRING = '"""\n%s"""\n' % (('a long description of what the tool does and why, ' * 4 + '\n') * 16)
+
+# (name, text) pairs covering the shapes of files found in a real library
+SAMPLES = [('short header', HEADER + BODY * 20),
+           ('header then long docstring', HEADER + DOCSTRING + BODY * 20),
+           ('header after a docstring', '"""a tool"""\n\n' + HEADER + BODY * 20),
+           ('no header', BODY * 20),
+           ('mel header', HEADER.replace('#', '//') + 'global proc doIt(){}\n' * 50)]
+
+
+def legacy_split_header(header):
+    """
+    the original Script.split_header logic, kept here as the baseline
+    """
+    try:
+        button_name = re.search('dsl_button:\s*(.*)', header).group(1)
+        button_color = re.search('dsl_color:\s*(\w*)', header).group(1)
+        button_description = re.search('dsl_description:\s*(.*)', header).group(1)
+        button_help = '\n'.join(re.findall('dsl_help:\s*(.*)', header))
+
+        button_tabs = {}
+        for tab in re.findall("dsl_tab:\s*(.*):(\d*):(.*)", header):
+            button_tabs[tab[0]] = {'button_line': tab[1], 'button_command': tab[2].strip()}
+
+        return button_name, button_color, button_description, button_help, button_tabs
+    except (IndexError, AttributeError):
+        return None
+
+
+def legacy_read_header(file_path):
+    """
+    the original Script.read_header, always reading 20 lines
+    """
+    with open(file_path) as target_script:
+        return legacy_split_header('\n'.join(list(islice(target_script, 20))))
+
+
+def run(number=2000):
+    temp_dir = tempfile.mkdtemp(prefix='dsl_bench_')
+    try:
+        print('%-28s %-12s %12s %12s %8s' % ('sample', 'phase', 'legacy us', 'parser us', 'speedup'))
+        for name, text in SAMPLES:
+            file_path = os.path.join(temp_dir, 'sample.py')
+            with open(file_path, 'w') as write_file:
+                write_file.write(text)
+
+            legacy_text = '\n'.join(text.splitlines(True)[:20])
+
+            phases = [('parse', partial_call(legacy_split_header, legacy_text),
+                       partial_call(dsl_header.parse_header, text)),
+                      ('read + parse', partial_call(legacy_read_header, file_path),
+                       partial_call(dsl_header.read_header, file_path))]
+
+            for phase, legacy, parser in phases:
+                legacy_time = min(timeit.repeat(legacy, number=number, repeat=3)) / number * 1e6
+                parser_time = min(timeit.repeat(parser, number=number, repeat=3)) / number * 1e6
+                print('%-28s %-12s %12.2f %12.2f %7.2fx' % (name, phase, legacy_time, parser_time,
+                                                            legacy_time / parser_time))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def partial_call(function, *args):
+    return lambda: function(*args)
+
+
+if __name__ == '__main__':
+    run()
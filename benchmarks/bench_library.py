@@ -0,0 +1,168 @@
+"""Times every phase of loading a library, on a synthetic library written for the run
+
+run with any python (no maya needed), results are printed as json or written to --output:
+    python benchmarks/bench_library.py --scripts 1000 5000 --output results.json
+
+phases:
+    scan                listing the folders and stating the scripts
+    read_headers        reading and parsing every header with an empty script index
+    read_headers_cached the same with a warm script index, like a refresh
+    build_script_list   a whole refresh, scan, cached headers and grouping by tab, like DSL.build_script_list
+    build_tabs          creating the tabs and buttons of every script, with real qt widgets on the offscreen
+                        platform when PySide2 is installed and qt stand-ins otherwise
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'modules', 'dsl', 'scripts'))
+
+import qt_standin
+from synthetic_library import generate_library
+
+from dsl_core import LibraryScanner, ScriptIndex, group_scripts
+
+QT = qt_standin.install()
+
+import DynamicScriptLibrary
+
+
+def scan(root):
+    scanner = LibraryScanner(root, None)
+    scanner.list_files()
+    return scanner
+
+
+def read_scripts(root, script_index):
+    scanner = LibraryScanner(root, script_index)
+    scanner.list_files()
+    return [script for batch in scanner.iter_scripts() for script in batch]
+
+
+def empty_index():
+    script_index = ScriptIndex(None)
+    script_index.entries = {}
+    return script_index
+
+
+def build_tabs(scripts, button_engine='widgets'):
+    """
+    give every script its buttons the way DSL.add_scripts does, then build every tab
+    :param scripts: list(Script), the scripts of the library
+    :param button_engine: str, 'widgets' or 'grid'
+    :return: dict, tab name to the built tab
+    """
+    tab_class = DynamicScriptLibrary.DSLGridTab if button_engine == 'grid' else DynamicScriptLibrary.DSLTab
+    tabs = {}
+    for script in scripts:
+        if not script.is_valid:
+            continue
+        for tab in script.tab_names:
+            if tab not in tabs:
+                tabs[tab] = tab_class(tab)
+            tabs[tab].add_script(script)
+
+    # the window only builds the tab on screen, building them all gives the worst case
+    for tab in tabs.values():
+        tab.build()
+        tab.fill_empty_rows()
+
+    return tabs
+
+
+def measure(function, repeat, setup=None):
+    """
+    :param function: callable, the phase to time, it is handed what setup returns
+    :param repeat: int, how many times to run it
+    :param setup: callable, runs before every run without being timed
+    :return: dict, the fastest, mean and every run time in seconds
+    """
+    runs = []
+    for _ in range(repeat):
+        arguments = (setup(),) if setup is not None else ()
+        start_time = time.time()
+        function(*arguments)
+        runs.append(time.time() - start_time)
+
+    return {'min': min(runs), 'mean': sum(runs) / len(runs), 'runs': runs}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                                       stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(script_count, args):
+    """
+    :param script_count: int, how many scripts the library has
+    :param args: argparse.Namespace, the command line options
+    :return: dict, the library and the times of every phase
+    """
+    root = tempfile.mkdtemp(prefix='dsl_bench_library_')
+    try:
+        counts = generate_library(root, script_count, args.tabs, args.folders, args.depth, args.mel,
+                                  args.headerless, args.seed)
+
+        warm_index = empty_index()
+        scripts = read_scripts(root, warm_index)
+
+        phases = {'scan': measure(lambda: scan(root), args.repeat),
+                  'read_headers': measure(lambda script_index: read_scripts(root, script_index), args.repeat,
+                                          empty_index),
+                  'read_headers_cached': measure(lambda: read_scripts(root, warm_index), args.repeat),
+                  'build_script_list': measure(lambda: group_scripts(read_scripts(root, warm_index)), args.repeat),
+                  'build_tabs': measure(lambda: build_tabs(scripts, args.engine), args.repeat)}
+
+        buttons = sum(len(script.button_tabs) for script in scripts if script.is_valid)
+        return {'scripts': script_count, 'files': counts, 'buttons': buttons,
+                'phases': phases}
+    finally:
+        shutil.rmtree(root)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the phases of loading a dsl library')
+    parser.add_argument('--scripts', type=int, nargs='+', default=[1000], help='library sizes to run')
+    parser.add_argument('--tabs', type=int, default=6, help='number of tabs')
+    parser.add_argument('--folders', type=int, default=10, help='number of top level folders')
+    parser.add_argument('--depth', type=int, default=2, help='depth of the helper packages')
+    parser.add_argument('--mel', type=float, default=0.2, help='share of mel scripts')
+    parser.add_argument('--headerless', type=float, default=0.1, help='share of scripts without a header')
+    parser.add_argument('--seed', type=int, default=1, help='random seed of the library')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of every phase, the fastest is the one to track')
+    parser.add_argument('--engine', choices=('widgets', 'grid'), default='widgets', help='button engine')
+    parser.add_argument('--output', help='json file to write the results to, printed when left out')
+    args = parser.parse_args(argv)
+
+    results = {'benchmark': 'library',
+               'revision': git_revision(),
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'qt': QT,
+               'created': time.time(),
+               'options': dict((key, value) for key, value in vars(args).items() if key != 'output'),
+               'sizes': [run_size(script_count, args) for script_count in args.scripts]}
+
+    if args.output:
+        with open(args.output, 'w') as write_file:
+            json.dump(results, write_file, indent=2, sort_keys=True)
+        for size in results['sizes']:
+            print('%6d scripts  %s' % (size['scripts'], '  '.join('%s %.1fms' % (phase, times['min'] * 1e3)
+                                                                   for phase, times in sorted(size['phases'].items()))))
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Memory each loaded script costs, the compact Script against the layout scripts had before it
+
+run with any python (no maya needed), results are printed as a table or written to --output as json:
+    python benchmarks/bench_memory.py --scripts 10000 100000
+
+the records go through json like the script index does, so every script starts out with its own copy of its strings.
+the size of a script is sys.getsizeof added up over everything it holds, what scripts share is only counted once
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'modules', 'dsl', 'scripts'))
+
+from synthetic_library import WORDS, script_header, tab_names
+
+from dsl_core import Script, HeaderError
+
+
+class LegacyScript(object):
+    """
+    The layout of a script before it was made compact: an instance dict, the header text
+    and a dict for every tab
+    """
+
+    def __init__(self, file_path, record, header):
+        self.valid = record['valid']
+        self.file_path = file_path
+        self.header = header
+        self.script_name, self.script_extension = os.path.splitext(os.path.basename(file_path))
+        self.button_color = record['button_color']
+        self.button_name = record['button_name']
+        self.button_description = record['button_description']
+        self.button_help = record['button_help']
+        self.button_tabs = dict((tab, {'button_line': str(line), 'button_command': command})
+                                for tab, line, command in record['button_tabs'])
+        self.parse_errors = [HeaderError(*error) for error in record['parse_errors']]
+        self.stamp = (1500000000.0, 1024)
+
+
+def make_records(count, tab_count=6, seed=1):
+    """
+    :param count: int, how many scripts to make up
+    :param tab_count: int, how many tabs the buttons are spread over
+    :return: list(tuple(str, str, dict)), the path, header text and index record of every script
+    """
+    generator = random.Random(seed)
+    tabs = tab_names(tab_count)
+    records = []
+    for i in range(count):
+        name = 'tool_%06d' % i
+        header = script_header(generator, name, tabs, '#')
+        button_tabs = [[line.split(':')[1].strip(), int(line.split(':')[2]), name + '()']
+                       for line in header.splitlines() if line.startswith('# dsl_tab:')]
+        record = {'valid': True,
+                  'button_name': ' '.join(generator.sample(WORDS, 2)).title(),
+                  'button_color': generator.choice(('yellow', 'red', 'green', 'blue', 'purple')),
+                  'button_description': ' '.join(generator.sample(WORDS, 6)),
+                  'button_help': ' '.join(generator.sample(WORDS, 16)),
+                  'button_tabs': button_tabs,
+                  'suspend_refresh': False,
+                  'parse_errors': []}
+        records.append(('/library/folder_%02d/%s.py' % (i % 10, name), header, record))
+
+    # a round trip through json, like loading the script index
+    return json.loads(json.dumps(records))
+
+
+def deep_size(value, seen):
+    """
+    :param value: anything a script holds
+    :param seen: set, ids already counted, values shared between scripts are only counted once
+    :return: int, bytes held by the value and everything in it
+    """
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, '__dict__'):
+        size += deep_size(vars(value), seen)
+    elif hasattr(value, '__slots__'):
+        size += sum(deep_size(getattr(value, name), seen) for name in value.__slots__ if hasattr(value, name))
+
+    return size
+
+
+def build_legacy(records):
+    return [LegacyScript(file_path, record, header) for file_path, header, record in records]
+
+
+def build_compact(records):
+    return [Script.from_record(file_path, record, (1500000000.0, 1024)) for file_path, header, record in records]
+
+
+def measure(build, records):
+    """
+    :param build: callable, makes the scripts from the records
+    :param records: list, the made up records
+    :return: dict, the total bytes the scripts hold, bytes per script and how long building them took
+    """
+    start_time = time.time()
+    scripts = build(records)
+    build_time = time.time() - start_time
+
+    # the records are let go once the scripts are built, so the strings the scripts took from them count
+    seen = set()
+    total = sum(deep_size(script, seen) for script in scripts)
+
+    return {'bytes': total, 'per_script': float(total) / len(scripts), 'build_time': build_time}
+
+
+def run_size(script_count, args):
+    records = make_records(script_count, args.tabs, args.seed)
+    return {'scripts': script_count,
+            'legacy': measure(build_legacy, records),
+            'compact': measure(build_compact, records)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the memory loaded scripts take')
+    parser.add_argument('--scripts', type=int, nargs='+', default=[10000, 100000], help='library sizes to run')
+    parser.add_argument('--tabs', type=int, default=6, help='number of tabs')
+    parser.add_argument('--seed', type=int, default=1, help='random seed of the records')
+    parser.add_argument('--output', help='json file to write the results to')
+    args = parser.parse_args(argv)
+
+    results = {'benchmark': 'memory',
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'created': time.time(),
+               'sizes': [run_size(script_count, args) for script_count in args.scripts]}
+
+    print('%8s %16s %16s %10s' % ('scripts', 'legacy b/script', 'compact b/script', 'saved'))
+    for size in results['sizes']:
+        legacy, compact = size['legacy']['per_script'], size['compact']['per_script']
+        print('%8d %16.0f %16.0f %9.0f%%' % (size['scripts'], legacy, compact, (1 - compact / legacy) * 100))
+
+    if args.output:
+        with open(args.output, 'w') as write_file:
+            json.dump(results, write_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Build and query times of the button search index on a synthetic library
+
+run with any python (no maya needed):
+    python benchmarks/bench_search.py [script count]
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules', 'dsl', 'scripts'))
+
+from synthetic_library import WORDS
+
+from dsl_core import Script, SearchIndex
+
+TABS = ('Main', 'Rigging', 'Animation', 'Lighting', 'FX', 'Pipeline')
+
+QUERIES = ('c', 'cam', 'camera', 'clean cam', 'camrea', 'rig export', 'anim', 'pipeline publish', 'zzz')
+
+
+def make_scripts(count, seed=1):
+    """
+    :param count: int, how many scripts to make up
+    :return: list(Script), scripts with random names, descriptions, help and tabs
+    """
+    generator = random.Random(seed)
+    words = list(WORDS) + ['tool%d' % i for i in range(count // 4)]
+
+    scripts = []
+    for i in range(count):
+        tabs = generator.sample(TABS, generator.randint(1, 2))
+        record = {'valid': True,
+                  'button_color': 'yellow',
+                  'button_name': ' '.join(generator.sample(words, 2)).title(),
+                  'button_description': ' '.join(generator.sample(words, 8)),
+                  'button_help': ' '.join(generator.sample(words, 20)),
+                  'button_tabs': [[tab, generator.randint(1, 20), 'main()'] for tab in tabs],
+                  'suspend_refresh': False,
+                  'parse_errors': []}
+        scripts.append(Script.from_record('/library/tools/script_%d.py' % i, record))
+
+    return scripts
+
+
+def run(count=10000, number=50):
+    scripts = make_scripts(count)
+
+    search_index = SearchIndex()
+    build_time = timeit.timeit(lambda: [search_index.add(script) for script in scripts], number=1)
+    print('indexed %s scripts (%s buttons) in %.1f ms, %.1f us per script' % (
+        count, len(search_index), build_time * 1e3, build_time / count * 1e6))
+
+    update_time = min(timeit.repeat(lambda: search_index.add(scripts[count // 2]), number=number, repeat=3)) / number
+    print('re-indexing one changed script: %.1f us' % (update_time * 1e6))
+
+    print('%-20s %10s %8s' % ('query', 'ms', 'results'))
+    for query in QUERIES:
+        search_index.search(query)
+        query_time = min(timeit.repeat(lambda: search_index.search(query), number=number, repeat=3)) / number
+        print('%-20s %10.3f %8d' % (query, query_time * 1e3, len(search_index.search(query))))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,183 @@
+"""Stand-ins for qt and maya so the front-end can be imported and its tabs built by the benchmarks
+
+real PySide2 is used when it is installed, on the offscreen platform so no display is needed. Without it every qt
+class becomes a stand-in that accepts any call, only layouts keep track of what is added to them so the tabs go
+through the same steps as with real widgets. maya is always stood in for unless running in mayapy.
+"""
+
+import os
+import sys
+import types
+
+QT_MODULES = ('PySide2', 'PySide2.QtCore', 'PySide2.QtWidgets', 'PySide2.QtGui', 'shiboken2')
+
+MAYA_MODULES = ('maya', 'maya.cmds', 'maya.mel', 'maya.utils', 'maya.OpenMayaUI', 'maya.app', 'maya.app.general',
+                'maya.app.general.mayaMixin')
+
+
+class StandIn(object):
+    """
+    Accepts any attribute, call or arithmetic
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return StandIn()
+
+    def __call__(self, *args, **kwargs):
+        return StandIn()
+
+    def __add__(self, other):
+        return 0
+
+    __radd__ = __add__
+
+    def __or__(self, other):
+        return self
+
+    def __int__(self):
+        return 0
+
+    def __iter__(self):
+        return iter([])
+
+
+class StandInType(type):
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return StandIn()
+
+
+# a base class any qt class can be stood in for, subclasses work like with the real classes
+StandInWidget = StandInType('StandInWidget', (object,), {'__init__': vars(StandIn)['__init__'],
+                                                           '__getattr__': vars(StandIn)['__getattr__']})
+
+
+class LayoutItem(object):
+
+    def __init__(self, widget):
+        self._widget = widget
+
+    def widget(self):
+        return self._widget
+
+
+class StandInLayout(StandInWidget):
+    """
+    A layout that holds on to its widgets and layouts
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.items = []
+
+    def addWidget(self, widget, *args):
+        self.items.append(LayoutItem(widget))
+
+    def addLayout(self, layout, *args):
+        self.items.append(layout)
+
+    def count(self):
+        return len(self.items)
+
+    def itemAt(self, index):
+        return self.items[index] if index < len(self.items) else None
+
+    def takeAt(self, index):
+        return self.items.pop(index)
+
+    def widget(self):
+        return None
+
+
+class StandInColor(StandInWidget):
+    """
+    A color that understands #rrggbb, which is all the button palette hands it besides its own names
+    """
+
+    def __init__(self, name='', *args):
+        self._name = name.lower() if len(name) == 7 and name.startswith('#') else None
+
+    def isValid(self):
+        return self._name is not None
+
+    def name(self):
+        return self._name
+
+    def red(self):
+        return int(self._name[1:3], 16)
+
+    def green(self):
+        return int(self._name[3:5], 16)
+
+    def blue(self):
+        return int(self._name[5:7], 16)
+
+
+class StandInModule(types.ModuleType):
+    """
+    A module that makes up a stand-in class for any name asked for
+    """
+
+    layouts = ('QVBoxLayout', 'QHBoxLayout', 'QGridLayout', 'QFormLayout', 'QBoxLayout')
+
+    # mixed into real qt classes, a plain class avoids clashing with their metaclass
+    mixins = ('MayaQWidgetDockableMixin',)
+
+    def __init__(self, name):
+        super(StandInModule, self).__init__(name)
+        self._classes = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if '%s.%s' % (self.__name__, name) in sys.modules:
+            return sys.modules['%s.%s' % (self.__name__, name)]
+        if name == 'Signal':
+            return StandIn
+        if name in self.mixins:
+            return self._classes.setdefault(name, type(name, (object,), {}))
+        if name == 'QColor':
+            return StandInColor
+        if name not in self._classes:
+            base = StandInLayout if name in self.layouts else StandInWidget
+            self._classes[name] = StandInType(name, (base,), {})
+        return self._classes[name]
+
+
+def can_import(module_name):
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def install():
+    """
+    put stand-ins in place of the qt and maya modules that can't be imported
+    :return: str, 'pyside2' when real widgets are built, 'stand-in' otherwise
+    """
+    qt = 'pyside2'
+    if not can_import('PySide2.QtWidgets'):
+        qt = 'stand-in'
+        for module_name in QT_MODULES:
+            sys.modules[module_name] = StandInModule(module_name)
+
+    if not can_import('maya.cmds'):
+        for module_name in MAYA_MODULES:
+            sys.modules[module_name] = StandInModule(module_name)
+
+    if qt == 'pyside2':
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PySide2 import QtWidgets
+        if QtWidgets.QApplication.instance() is None:
+            # kept on the module so the application lives as long as the benchmark
+            install.application = QtWidgets.QApplication([])
+
+    return qt
@@ -0,0 +1,135 @@
+"""Writes made up script libraries for the benchmarks
+
+run with any python (no maya needed):
+    python benchmarks/synthetic_library.py <folder> [--scripts 1000] [--tabs 6] [--folders 10] [--depth 2]
+"""
+
+import os
+import sys
+import random
+import argparse
+
+TAB_NAMES = ('Main', 'Rigging', 'Animation', 'Lighting', 'FX', 'Pipeline', 'Modeling', 'Layout', 'Render', 'Cfx')
+
+COLORS = ('yellow', 'red', 'green', 'blue', 'purple', '#ff8800')
+
+WORDS = ('camera clean rig export alembic render light shader curve joint skin weight cache scene layer texture uv '
+         'mesh bake anim key constraint pose mirror rename select group align snap reset playblast publish').split()
+
+PYTHON_BODY = '''import os
+
+
+def {name}():
+    """
+    {description}
+    """
+    return [os.path.basename(path) for path in os.listdir('.')]
+'''
+
+MEL_BODY = '''global proc {name}()
+{{
+    string $selection[] = `ls -sl`;
+    print $selection;
+}}
+'''
+
+
+def tab_names(count):
+    """
+    :param count: int, how many tabs the library has
+    :return: list(str), that many tab names, numbered once the usual names run out
+    """
+    return [TAB_NAMES[i] if i < len(TAB_NAMES) else 'Tab%d' % i for i in range(count)]
+
+
+def script_header(generator, name, tabs, comment):
+    """
+    :param generator: random.Random, the random numbers of the library
+    :param name: str, the command of the script
+    :param tabs: list(str), the tabs the library has
+    :param comment: str, '#' for python, '//' for mel
+    :return: str, a dsl header putting the script on one or two tabs
+    """
+    lines = ['dsl_button: %s' % ' '.join(generator.sample(WORDS, 2)).title()]
+    for tab in generator.sample(tabs, min(len(tabs), generator.randint(1, 2))):
+        lines.append('dsl_tab: %s:%d:%s()' % (tab, generator.randint(1, 20), name))
+    lines.append('dsl_color: %s' % generator.choice(COLORS))
+    lines.append('dsl_description: %s' % ' '.join(generator.sample(WORDS, 6)))
+    lines.extend('dsl_help: %s' % ' '.join(generator.sample(WORDS, 8)) for _ in range(generator.randint(1, 4)))
+
+    return ''.join('%s %s\n' % (comment, line) for line in lines)
+
+
+def generate_library(root, script_count=1000, tab_count=6, folder_count=10, depth=2, mel_share=0.2,
+                     headerless_share=0.1, seed=1):
+    """
+    write a library of scripts spread over folders, only the top level folders hold buttons like in a real library,
+    deeper folders are packages of helper modules
+    :param root: str, the folder to write the library in, created if needed
+    :param script_count: int, how many scripts to write
+    :param tab_count: int, how many tabs the buttons are spread over
+    :param folder_count: int, how many top level folders the scripts are spread over
+    :param depth: int, how deep the helper packages of each folder go
+    :param mel_share: float, the share of scripts written in mel
+    :param headerless_share: float, the share of scripts without a dsl header
+    :param seed: int, the same seed always writes the same library
+    :return: dict, how many files of each kind were written
+    """
+    generator = random.Random(seed)
+    tabs = tab_names(tab_count)
+    folders = [root] + [os.path.join(root, 'folder_%02d' % i) for i in range(folder_count)]
+    for folder in folders:
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    counts = {'python': 0, 'mel': 0, 'headerless': 0, 'helpers': 0, 'folders': len(folders)}
+    for i in range(script_count):
+        folder = folders[i % len(folders)]
+        name = 'tool_%05d' % i
+        is_mel = generator.random() < mel_share
+        has_header = generator.random() >= headerless_share
+
+        comment = '//' if is_mel else '#'
+        header = script_header(generator, name, tabs, comment) if has_header else ''
+        body = (MEL_BODY if is_mel else PYTHON_BODY).format(name=name, description=' '.join(generator.sample(WORDS, 5)))
+
+        with open(os.path.join(folder, name + ('.mel' if is_mel else '.py')), 'w') as write_file:
+            write_file.write(header + body)
+
+        counts['mel' if is_mel else 'python'] += 1
+        counts['headerless'] += not has_header
+
+    # helper packages nested under every folder, they hold modules without buttons
+    for folder in folders[1:]:
+        package = folder
+        for level in range(depth):
+            package = os.path.join(package, 'helpers_%d' % level)
+            if not os.path.isdir(package):
+                os.makedirs(package)
+            for module_name in ('__init__', 'utils'):
+                with open(os.path.join(package, module_name + '.py'), 'w') as write_file:
+                    write_file.write(PYTHON_BODY.format(name=module_name.strip('_'), description='helper'))
+                counts['helpers'] += 1
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a made up dsl library')
+    parser.add_argument('root', help='folder to write the library in')
+    parser.add_argument('--scripts', type=int, default=1000, help='number of scripts')
+    parser.add_argument('--tabs', type=int, default=6, help='number of tabs')
+    parser.add_argument('--folders', type=int, default=10, help='number of top level folders')
+    parser.add_argument('--depth', type=int, default=2, help='depth of the helper packages')
+    parser.add_argument('--mel', type=float, default=0.2, help='share of mel scripts')
+    parser.add_argument('--headerless', type=float, default=0.1, help='share of scripts without a header')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    args = parser.parse_args(argv)
+
+    counts = generate_library(args.root, args.scripts, args.tabs, args.folders, args.depth, args.mel,
+                              args.headerless, args.seed)
+    print('wrote %s' % ', '.join('%s %s' % (count, kind) for kind, count in sorted(counts.items())))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
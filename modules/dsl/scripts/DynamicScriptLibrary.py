@@ -1,11 +1,13 @@
-"""Welcome to the dynamic script loader!"""
+"""Welcome to the dynamic script loader!
+
+this is the qt front-end, the scanning, header parsing and preferences live in dsl_core which imports without maya
+"""
 
 import os
 import sys
-import json
-import re
+import atexit
 import subprocess
-from itertools import islice
+import time
 from functools import partial
 
 from PySide2 import QtCore
@@ -15,128 +17,313 @@ from PySide2 import QtGui
 from shiboken2 import wrapInstance
 
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
-import pymel.core as pm
+from maya import cmds
+from maya import mel
+from maya import utils as maya_utils
 import maya.OpenMayaUI as mui
 
+from dsl_core import (ScriptIndex, LRUCache, SearchIndex, SlotClaims, SessionManager, LibraryScanner, MergedScanner,
+                      LibraryMirror, UsageStats, Prewarmer, BatchRunner, CHUNK_NAME, macro_steps, tracer, run_profiled,
+                      group_scripts, report_broken_headers, diff_scripts, list_script_files, stat_script,
+                      PreferenceStore, DEFAULT_PREFERENCES, pref_path, SCRIPT_INDEX_FILE)
+
 
-class Script(object):
+def maya_main_window():
     """
-    A python or mel script object
+    creates a pointer to maya's main window
+    :return: instance, containing maya's main window as a Qt widget
     """
+    pointer = mui.MQtUtil.mainWindow()
+    return wrapInstance(long(pointer), QtWidgets.QWidget)
 
-    def __init__(self, file_path):
-        self.valid = False
-        self.file_path = file_path
-        self.header = self.read_header()
-        self.script_name, self.script_extension = os.path.splitext(os.path.basename(file_path))
-        self.button_color = 'yellow'
-        self.button_name = 'new button'
-        self.button_description = 'no description'
-        self.button_help = 'no help :('
-        self.button_tabs = None
-        self.valid = False
 
-        self.split_header()
+# the modules and import hooks of the library that is loaded, they are all taken out again when switching libraries
+library_sessions = SessionManager(mel.eval)
 
-    @property
-    def is_valid(self):
-        return self.valid
+# the local copies of the libraries on the file server, by library folder
+library_mirrors = {}
+
+# how often every button is clicked, the most used ones are imported ahead of their first click, clicks are saved
+# in the background
+usage_stats = UsageStats()
+atexit.register(usage_stats.flush)
+
+# the preferences are read once per maya session and shared by every window, changes are saved in the background
+preference_store = PreferenceStore()
+atexit.register(preference_store.flush)
+
+
+def source_path(path):
+    """
+    :param path: str, a file or folder, possibly inside the local mirror of a library
+    :return: str, the same file or folder in the library itself
+    """
+    for mirror in library_mirrors.values():
+        if mirror.owns(path):
+            return mirror.source_path(path)
+
+    return path
+
+
+def undo_chunk(open_chunk):
+    """
+    :param open_chunk: bool, True to open an undo chunk, False to close it
+    """
+    if open_chunk:
+        cmds.undoInfo(openChunk=True, chunkName=CHUNK_NAME)
+    else:
+        cmds.undoInfo(closeChunk=True)
+
+
+def suspend_refresh(suspend):
+    """
+    :param suspend: bool, True to stop the viewport from redrawing, False to let it redraw again
+    """
+    cmds.refresh(suspend=suspend)
+    if not suspend:
+        # draw what happened while it was suspended in one go
+        cmds.refresh(force=True)
+
+
+# runs several buttons as one undo step with the viewport held until they are done
+batch_runner = BatchRunner(undo_chunk, suspend_refresh)
+
+
+def run_script(script_name, command, script_path, hold_refresh=False):
+    """
+    runs a script's command, python scripts are imported and reloaded when they change,
+    mel scripts are sourced the same way
+    :param script_name: str, the module name of the script
+    :param command: str, the command to run, python scripts without a command are just imported
+    :param script_path: str, path to the script
+    :param hold_refresh: bool, suspend the viewport refresh until the script is done, for scripts with
+                         dsl_suspend_refresh in their header
+    """
+    if hold_refresh:
+        with batch_runner.batch(undo=False):
+            return run_script(script_name, command, script_path)
+
+    start_time = time.time()
+    try:
+        with tracer.span('run_script', script=script_path):
+            if script_path.endswith('.py'):
+                # python modules stay loaded between clicks and are only reloaded once their file changes
+                library_sessions.current.run(script_name, command, script_path)
+            else:
+                library_sessions.current.run_mel(command, script_path)
+    finally:
+        usage_stats.record(source_path(script_path), time.time() - start_time)
+        usage_stats.schedule_save()
+
+
+def run_sequence(label, steps):
+    """
+    runs buttons back to back in one undo chunk, the viewport is only redrawn once the last one is done
+    :param label: str, what is being run, for the messages
+    :param steps: list(tuple(Script, ButtonTab)), the script and button of every step
+    :return: bool, True if every step ran
+    """
+    failed = batch_runner.run([(script.button_name, partial(run_script, script.script_name, button.command,
+                                                            script.file_path))
+                               for script, button in steps])
+    if failed is not None:
+        name, error = failed
+        print(error)
+        print('%s stopped at %s, undo once to take back the steps that ran' % (label, name))
+        return False
+
+    print('Ran %s: %s' % (label, ', '.join(script.button_name for script, _ in steps)))
+    return True
+
+
+def show_script_help(label, help_text):
+    """
+    shows the help of a script in a dialog
+    :param label: str, the button label of the script
+    :param help_text: str, the help text
+    """
+    # create a window instance
+    help_win = QtWidgets.QDialog()
+    help_win.setWindowTitle('Help for %s' % label)
+    help_win.setMinimumSize(600, 100)
+    help_win.setMaximumSize(600, 100)
+
+    # create a layout
+    main_layout = QtWidgets.QVBoxLayout()
+
+    # add the help text to the layout
+    help_text = QtWidgets.QLabel(help_text)
+    help_text.setMaximumSize(600, 100)
+    main_layout.addWidget(help_text)
+
+    # add the layout to the window
+    help_win.setLayout(main_layout)
+
+    # show window
+    help_win.exec_()
+
+
+def run_script_profiled(label, script_name, command, script_path):
+    """
+    runs a script's command under the profiler and shows where the time went, mel scripts are only timed
+    :param label: str, the button label of the script
+    :param script_name: str, the module name of the script
+    :param command: str, the command to run
+    :param script_path: str, path to the script
+    """
+    report = run_profiled(script_name, partial(run_script, script_name, command, script_path),
+                          use_profiler=script_path.endswith('.py'))
+    if report.error:
+        print(report.error)
+    print('Saved the profile of %s to %s' % (label, report.stats_file or report.summary_file))
+    show_profile_report(label, report)
+
+
+def show_profile_report(label, report):
+    """
+    shows how long a profiled run took and the functions it spent the most time in
+    :param label: str, the button label of the script
+    :param report: ProfileReport, the report of the run
+    """
+    report_win = QtWidgets.QDialog()
+    report_win.setWindowTitle('Profile of %s' % label)
+    report_win.setMinimumSize(700, 400)
+    main_layout = QtWidgets.QVBoxLayout(report_win)
+
+    summary = '%s ran in %.3fs%s\nReport saved to %s' % (label, report.wall_time, ' and failed' if report.error else '',
+                                                        report.stats_file or report.summary_file)
+    summary_label = QtWidgets.QLabel(summary)
+    summary_label.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+    main_layout.addWidget(summary_label)
+
+    # the functions that took the most time by themselves, mel runs are only timed so they have none
+    if report.hotspots:
+        hotspot_table = QtWidgets.QTableWidget(len(report.hotspots), 4)
+        hotspot_table.setHorizontalHeaderLabels(['Function', 'Calls', 'Own s', 'Total s'])
+        for row, (function, call_count, own_time, total_time) in enumerate(report.hotspots):
+            for column, value in enumerate([function, str(call_count), '%.4f' % own_time, '%.4f' % total_time]):
+                hotspot_table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+        hotspot_table.resizeColumnsToContents()
+        hotspot_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        main_layout.addWidget(hotspot_table)
+
+    report_win.exec_()
+
+
+def resource_script(script_path):
+    """
+    source a mel script again on request, for when it changed in ways its file doesn't show, such as a sourced
+    dependency
+    :param script_path: str, path to the script
+    """
+    library_sessions.current.mel.source(script_path, force=True)
+    print('Sourced %s' % script_path)
+
+
+def edit_script(script_path):
+    """
+    opens a script in the default editor of the system, scripts run from a mirror are edited in the library
+    :param script_path: str, path to the script
+    """
+    script_path = source_path(script_path)
+    if sys.platform == 'win32':
+        os.startfile(script_path)
+    else:
+        opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+        subprocess.call([opener, script_path])
+
+
+class ButtonPalette(object):
+    """
+    Resolves dsl_color values into button colors once, and builds the one style sheet that covers them all
+    """
 
-    def read_header(self):
+    named_colors = {'yellow': ('#fdfd96', '#fcfc4b', '#fefee1'),
+                    'red': ('#ff6961', '#ff2015', '#ffb2ae'),
+                    'green': ('#77dd77', '#3ace3a', '#b4ecb4'),
+                    'purple': ('#b39eb5', '#917394', '#d5c9d6'),
+                    'blue': ('#aec6cf', '#8eafbc', '#dee8eb')}
+
+    default_color = 'yellow'
+
+    def __init__(self):
+        self.colors = {}
+
+        # bumped whenever a new color is resolved, so windows know their style sheet is out of date
+        self.version = 0
+
+    def resolve(self, color):
         """
-        reads the first 20 lines of a script and returns them
-        :return: str, the first 20 lines of the file
+        :param color: str, one of the named colors, a hex value such as #ff6961 or any color name qt knows
+        :return: tuple(str, str, str), the main, dark and light colors of the button as hex values
         """
+        colors = self.colors.get(color)
+        if colors is None:
+            colors = self.colors[color] = self.parse_color(color)
+            self.version += 1
 
-        if os.path.isfile(self.file_path):
-            # we only care about python and mel files
-            if self.file_path.endswith('.py') or self.file_path.endswith('.mel'):
-                with open(self.file_path) as target_script:
-                    header = list(islice(target_script, 20))
-                    header = '\n'.join(header)
-                    self.valid = True
-                    return header
+        return colors
 
-    def split_header(self):
+    def color_key(self, color):
         """
-        Analyze the header test, and if a DSL header is found collect the script info into the class
+        :param color: str, the color of a script
+        :return: str, the value buttons of that color carry in their dslColor property
         """
-        if self.script_extension == '.py' or self.script_extension == '.mel':
-            try:
-                self.button_name = re.search('dsl_button:\s*(.*)', self.header).group(1)
-                self.button_color = re.search('dsl_color:\s*(\w*)', self.header).group(1)
-                self.button_description = re.search('dsl_description:\s*(.*)', self.header).group(1)
-                self.button_help = '\n'.join(re.findall('dsl_help:\s*(.*)', self.header))
+        return self.resolve(color)[0][1:]
 
-                # a button can appear in multiple tabs and preform multiple actions
-                self.button_tabs = {}
-                tabs = re.findall("dsl_tab:\s*(.*):(\d*):(.*)", self.header)
-                for tab in tabs:
-                    button_tab = tab[0]
-                    button_line = tab[1]
-                    button_command = tab[2].strip()
-                    self.button_tabs[button_tab] = {'button_line': button_line, 'button_command': button_command}
+    @classmethod
+    def parse_color(cls, color):
+        name = (color or '').strip().lower()
+        if name in cls.named_colors:
+            return cls.named_colors[name]
 
-                # mark the script as valid
-                self.valid = True
-            except (IndexError, AttributeError) as e:
-                # print 'error loading script', self.script_name
-                # print e
-                pass
+        main = QtGui.QColor(name)
+        if not main.isValid():
+            # hex values are also accepted without the #
+            main = QtGui.QColor('#' + name)
 
-    def find_in_header(self, text):
+        if not main.isValid():
+            print('I am not sure what %s should look like, it will be %s' % (color, cls.default_color))
+            return cls.named_colors[cls.default_color]
+
+        # pressed buttons get darker and hovered buttons lighter, like the named colors do
+        channels = (main.red(), main.green(), main.blue())
+        dark = '#%02x%02x%02x' % tuple(int(channel * 0.8) for channel in channels)
+        light = '#%02x%02x%02x' % tuple(int(channel + (255 - channel) * 0.6) for channel in channels)
+
+        return main.name(), dark, light
+
+    def style_sheet(self):
         """
-        locates the line containing a text, removes the text from the line, and returns the new line
-        :param text: str, text to find
-        :return: the line containing the found text, with the found text removed
+        :return: str, a style sheet with a rule for every color resolved so far
         """
-        found_text = [s for s in self.header if text in s]
-        clean_text = [s[len(text) + 2:].strip() for s in found_text]
+        rules = ['QPushButton[dslColor] { color: black; font-weight: bold; background-image: None; '
+                 'border-image: None; border-radius: 5px; }']
+        for main, dark, light in sorted(set(self.colors.values())):
+            key = main[1:]
+            rules.append('QPushButton[dslColor="%s"] { background-color: %s; border: 1px solid %s; }' % (
+                key, main, main))
+            rules.append('QPushButton[dslColor="%s"]:hover { background-color: %s; }' % (key, light))
+            rules.append('QPushButton[dslColor="%s"]:pressed { background-color: %s; }' % (key, dark))
 
-        return clean_text
+        return '\n'.join(rules)
 
 
-def maya_main_window():
-    """
-    creates a pointer to maya's main window
-    :return: instance, containing maya's main window as a Qt widget
-    """
-    pointer = mui.MQtUtil.mainWindow()
-    return wrapInstance(long(pointer), QtWidgets.QWidget)
+button_palette = ButtonPalette()
 
 
 class DSLButton(QtWidgets.QPushButton):
 
-    def __init__(self, label, color, command, script, help, script_path):
+    def __init__(self, label, color, command, script, help, script_path, suspend_refresh=False):
         super(DSLButton, self).__init__(label)
 
         # add help variable
         self.help = help
         self.script_path = script_path
         self.label = label
-        # create font
-        button_font = QtGui.QFont()
-        button_font.setBold(True)
-
-        # set button appearance
-        self.setFont(button_font)
-
-        main, dark, light = self.set_colors(color)
-        self.setStyleSheet('''QPushButton {         color: black;
-                                                    background-image: None;
-                                                    border-image: None;
-                                                    background-color: %s; 
-                                                    border-radius: 5px;
-                                                    border: 1px solid %s;
-                                            }
-                                            QPushButton:hover{
-                                                    background-color: %s;
-                                            }
-                                            QPushButton:pressed{
-                                                    background-color: %s;
-                                            }
-                                        ''' % (main, main, light, dark))
-        # self.setStyleSheet("background-color: %s; color: black;" % self.set_colors(color))
+        self.suspend_refresh = suspend_refresh
+        # the window's style sheet styles the button through its color property
+        self.setProperty('dslColor', button_palette.color_key(color))
         self.setMinimumSize(200, 30)
         self.setMinimumSize(200, 30)
 
@@ -150,6 +337,17 @@ class DSLButton(QtWidgets.QPushButton):
         help_option.triggered.connect(self.show_help)
         self.addAction(help_option)
 
+        profile_option = QtWidgets.QAction(self)
+        profile_option.setText('Run With Profiler')
+        profile_option.triggered.connect(partial(self.profile_callback, script, command))
+        self.addAction(profile_option)
+
+        if script_path.endswith('.mel'):
+            resource_option = QtWidgets.QAction(self)
+            resource_option.setText('Force Re-source')
+            resource_option.triggered.connect(partial(resource_script, script_path))
+            self.addAction(resource_option)
+
         separator = QtWidgets.QAction(self)
         separator.setSeparator(True)
         self.addAction(separator)
@@ -160,83 +358,752 @@ class DSLButton(QtWidgets.QPushButton):
         self.addAction(edit_file)
 
     def button_callback(self, script_name, command):
+        run_script(script_name, command, self.script_path, self.suspend_refresh)
 
-        if self.script_path.endswith('.py'):
-            if command == '':
-                if script_name not in sys.modules:
-                    command_string = 'import %s' % (script_name)
-                else:
-                    command_string = 'reload(%s)' % (script_name)
-                exec command_string
-                # print(self.script_path)
+    def profile_callback(self, script_name, command, *args):
+        run_script_profiled(self.label, script_name, command, self.script_path)
 
-            else:
-                command_string = 'import %s\nreload(%s)\n%s.%s' % (
-                    script_name, script_name, script_name, command)
-                # print(command_string)
-                exec (command_string)
-        else:
-            pm.mel.source(self.script_path)
-            pm.mel.eval(command)
+    def show_help(self):
+        show_script_help(self.label, self.help)
+
+    def edit_script(self):
+        edit_script(self.script_path)
+
+
+class DSLTab(QtWidgets.QWidget):
+    """
+    A tab of buttons, every script gets its own row.
+    The rows and buttons are only created the first time the tab is shown
+    """
+
+    def __init__(self, name):
+        super(DSLTab, self).__init__()
+
+        self.name = name
+        self.vertical_layout = None
+        self.tab_rows = {}
+
+        # the script placed on each row, and the scripts waiting for a taken row to free up
+        self.row_scripts = {}
+        self.waiting_scripts = []
+
+        # scripts added before the tab was built
+        self.pending_scripts = []
+
+    @property
+    def is_built(self):
+        return self.vertical_layout is not None
+
+    def build(self):
+        """
+        create the rows of the tab and the buttons of every script added so far
+        """
+        if self.is_built:
+            return
+
+        self.vertical_layout = QtWidgets.QVBoxLayout(self)
+        self.tab_rows = self.create_tab_rows()
+
+        pending_scripts, self.pending_scripts = self.pending_scripts, []
+        for script in pending_scripts:
+            self.add_script(script)
+
+        self.fill_empty_rows()
+
+    def create_tab_rows(self):
+        tab_rows = {}
+
+        for i in range(1, 21):
+            tab_rows[self.name + str(i)] = QtWidgets.QHBoxLayout()
+            self.vertical_layout.addLayout(tab_rows[self.name + str(i)])
+
+        return tab_rows
+
+    def row_key(self, script):
+        line = script.button_tab(self.name).line
+        return self.name + ('' if line is None else str(line))
+
+    def add_script(self, script):
+        """
+        add a button and its description to the script's row
+        :param script: Script, the script to add
+        :return: bool, True if the button was placed, or will be once the tab is built
+        """
+        if not self.is_built:
+            self.pending_scripts.append(script)
+            return True
+
+        row_key = self.row_key(script)
+        if row_key not in self.tab_rows:
+            print('Unable to add %s to %s there is no such row' % (script.button_name, row_key))
+            return False
+
+        # check if we already have a button in this location, the window reports the conflict
+        if row_key in self.row_scripts:
+            self.waiting_scripts.append(script)
+            return False
+
+        row = self.tab_rows[row_key]
+        self.clear_row(row)
+
+        button = DSLButton(label=script.button_name,
+                           color=script.button_color,
+                           command=script.button_tab(self.name).command,
+                           script=script.script_name,
+                           help=script.button_help,
+                           script_path=script.file_path,
+                           suspend_refresh=script.suspend_refresh)
+        row.addWidget(button)
+
+        # add the description to the tab
+        button_description = QtWidgets.QLabel(script.button_description)
+        button_description.setMinimumSize(200, 30)
+        button_description.setMaximumSize(200, 30)
+        button_description.setContentsMargins(10, 1, 1, 1)
+        row.addWidget(button_description)
+
+        self.row_scripts[row_key] = script
+        return True
+
+    def remove_script(self, file_path):
+        """
+        remove the button of a script, a script waiting for its row takes its place
+        :param file_path: str, path of the script to remove
+        """
+        self.pending_scripts = [script for script in self.pending_scripts if script.file_path != file_path]
+        self.waiting_scripts = [script for script in self.waiting_scripts if script.file_path != file_path]
+
+        for row_key, script in list(self.row_scripts.items()):
+            if script.file_path != file_path:
+                continue
+
+            del self.row_scripts[row_key]
+            self.clear_row(self.tab_rows[row_key])
+            for waiting_script in self.waiting_scripts:
+                if self.row_key(waiting_script) == row_key:
+                    self.waiting_scripts.remove(waiting_script)
+                    self.add_script(waiting_script)
+                    break
+
+    def is_empty(self):
+        return not (self.row_scripts or self.waiting_scripts or self.pending_scripts)
+
+    def fill_empty_rows(self):
+        """
+        fill out empty spaces so the buttons keep their position
+        """
+        if not self.is_built:
+            return
+
+        for horizontal_layout in range(self.vertical_layout.count()):
+            found_layout = self.vertical_layout.itemAt(horizontal_layout)
+            if found_layout.count() == 0:
+                frame = QtWidgets.QFrame()
+                frame.setMinimumSize(200, 30)
+                frame.setMaximumSize(200, 30)
+                found_layout.addWidget(frame)
 
     @staticmethod
-    def set_colors(color='yellow'):
-        main_color = color
-        dark_color = color
-        light_color = color
-
-        if color.lower() == 'yellow':
-            main_color = '#fdfd96'
-            dark_color = '#fcfc4b'
-            light_color = '#fefee1'
-        elif color.lower() == 'red':
-            main_color = '#ff6961'
-            dark_color = '#ff2015'
-            light_color = '#ffb2ae'
-        elif color.lower() == 'green':
-            main_color = '#77dd77'
-            dark_color = '#3ace3a'
-            light_color = '#b4ecb4'
-        elif color.lower() == 'purple':
-            main_color = '#b39eb5'
-            dark_color = '#917394'
-            light_color = '#d5c9d6'
-        elif color.lower() == 'blue':
-            main_color = '#aec6cf'
-            dark_color = '#8eafbc'
-            light_color = '#dee8eb'
+    def clear_row(row):
+        while row.count():
+            widget = row.takeAt(0).widget()
+            if widget is not None:
+                widget.setParent(None)
+                widget.deleteLater()
+
+
+class ScriptGridModel(QtCore.QAbstractTableModel):
+    """
+    The scripts of a tab laid out by line, every line is a row holding a button column and a description column
+    """
+
+    ScriptRole = QtCore.Qt.UserRole + 1
+
+    # tabs always show at least as many lines as the widget layout does
+    minimum_lines = 20
+
+    def __init__(self, tab_name, parent=None):
+        super(ScriptGridModel, self).__init__(parent)
+
+        self.tab_name = tab_name
+        self.line_count = self.minimum_lines
+
+        # the script placed on each line, and the scripts waiting for a taken line to free up
+        self.line_scripts = {}
+        self.waiting_scripts = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.line_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def flags(self, index):
+        return QtCore.Qt.ItemIsEnabled
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        script = self.line_scripts.get(index.row() + 1)
+        if script is None:
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            return script.button_name if index.column() == 0 else script.button_description
+        elif role == QtCore.Qt.ToolTipRole:
+            return script.button_help
+        elif role == self.ScriptRole:
+            return script
+
+        return None
+
+    def script_line(self, script):
+        button_line = script.button_tab(self.tab_name).line
+        return button_line if button_line is not None and button_line > 0 else None
+
+    def command(self, script):
+        return script.button_tab(self.tab_name).command
+
+    def add_script(self, script):
+        """
+        place a script on its line, growing the tab if the line is past the last row
+        :param script: Script, the script to add
+        :return: bool, True if the script was placed
+        """
+        line = self.script_line(script)
+        if line is None:
+            print('Unable to add %s to %s line %s there is no such row' % (
+                script.button_name, self.tab_name, script.button_tab(self.tab_name).line))
+            return False
+
+        # check if we already have a button in this location, the window reports the conflict
+        if line in self.line_scripts:
+            self.waiting_scripts.append(script)
+            return False
+
+        if line > self.line_count:
+            self.beginInsertRows(QtCore.QModelIndex(), self.line_count, line - 1)
+            self.line_count = line
+            self.endInsertRows()
+
+        self.line_scripts[line] = script
+        self.dataChanged.emit(self.index(line - 1, 0), self.index(line - 1, 1))
+        return True
+
+    def remove_script(self, file_path):
+        """
+        remove a script from its line, a script waiting for the line takes its place
+        :param file_path: str, path of the script to remove
+        """
+        self.waiting_scripts = [script for script in self.waiting_scripts if script.file_path != file_path]
+
+        for line, script in list(self.line_scripts.items()):
+            if script.file_path != file_path:
+                continue
+
+            del self.line_scripts[line]
+            self.dataChanged.emit(self.index(line - 1, 0), self.index(line - 1, 1))
+            for waiting_script in self.waiting_scripts:
+                if self.script_line(waiting_script) == line:
+                    self.waiting_scripts.remove(waiting_script)
+                    self.add_script(waiting_script)
+                    break
+
+        # drop the rows past the last script
+        line_count = max([self.minimum_lines] + list(self.line_scripts.keys()))
+        if line_count < self.line_count:
+            self.beginRemoveRows(QtCore.QModelIndex(), line_count, self.line_count - 1)
+            self.line_count = line_count
+            self.endRemoveRows()
+
+    def is_empty(self):
+        return not self.line_scripts and not self.waiting_scripts
+
+
+class ButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints the button column of a ScriptGridView as a rounded button in the script's color
+    """
+
+    def __init__(self, parent=None):
+        super(ButtonDelegate, self).__init__(parent)
+
+        self.button_font = QtGui.QFont()
+        self.button_font.setBold(True)
+        self.colors = {}
+
+    def button_colors(self, color):
+        """
+        :param color: str, the color of a script
+        :return: tuple(QColor, QColor, QColor), the main, dark and light colors of the button
+        """
+        if color not in self.colors:
+            self.colors[color] = tuple(QtGui.QColor(c) for c in button_palette.resolve(color))
+
+        return self.colors[color]
+
+    def paint(self, painter, option, index):
+        script = index.data(ScriptGridModel.ScriptRole)
+        if script is None:
+            return
+
+        painter.save()
+        if index.column() == 0:
+            main, dark, light = self.button_colors(script.button_color)
+            if self.parent().pressed_index == index:
+                background = dark
+            elif option.state & QtWidgets.QStyle.State_MouseOver:
+                background = light
+            else:
+                background = main
+
+            rect = option.rect.adjusted(2, 3, -2, -3)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(main)
+            painter.setBrush(background)
+            painter.drawRoundedRect(rect, 5, 5)
+
+            painter.setPen(QtCore.Qt.black)
+            painter.setFont(self.button_font)
+            label = QtGui.QFontMetrics(self.button_font).elidedText(script.button_name, QtCore.Qt.ElideRight,
+                                                                    rect.width() - 8)
+            painter.drawText(rect, QtCore.Qt.AlignCenter, label)
         else:
-            print 'I am not sure what %s should look like but I will do my best!' % color
+            rect = option.rect.adjusted(10, 1, -1, -1)
+            description = option.fontMetrics.elidedText(script.button_description, QtCore.Qt.ElideRight, rect.width())
+            painter.setPen(option.palette.color(QtGui.QPalette.Text))
+            painter.drawText(rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft, description)
+        painter.restore()
 
-        return main_color, dark_color, light_color
+    def sizeHint(self, option, index):
+        return QtCore.QSize(200, 30)
 
-    def show_help(self):
-        # create a window instance
-        help_win = QtWidgets.QDialog()
-        help_win.setWindowTitle('Help for %s' % self.label)
-        help_win.setMinimumSize(600, 100)
-        help_win.setMaximumSize(600, 100)
 
-        # create a layout
-        main_layout = QtWidgets.QVBoxLayout()
+class ScriptGridView(QtWidgets.QTableView):
+    """
+    Shows a ScriptGridModel as buttons, only the rows that are visible get painted
+    """
+
+    def __init__(self, model, parent=None):
+        super(ScriptGridView, self).__init__(parent)
+
+        self.setModel(model)
+        self.setItemDelegate(ButtonDelegate(self))
+        self.pressed_index = QtCore.QPersistentModelIndex()
+
+        # look like the widget layout, rows of 30 pixel buttons with a description next to them
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.horizontalHeader().setDefaultSectionSize(210)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(36)
+        self.setShowGrid(False)
+        self.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+
+        self.clicked.connect(self.run_index)
+        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+
+    def script_at(self, index):
+        """
+        :param index: QModelIndex, an index of the view
+        :return: Script, the script of the button at the index, None if the index isn't a button
+        """
+        if not index.isValid() or index.column() != 0:
+            return None
+
+        return index.data(ScriptGridModel.ScriptRole)
 
-        # add the help text to the layout
-        help_text = QtWidgets.QLabel(self.help)
-        help_text.setMaximumSize(600, 100)
-        main_layout.addWidget(help_text)
+    def mousePressEvent(self, event):
+        self.pressed_index = QtCore.QPersistentModelIndex(self.indexAt(event.pos()))
+        self.viewport().update()
+        super(ScriptGridView, self).mousePressEvent(event)
 
-        # add the layout to the window
-        help_win.setLayout(main_layout)
+    def mouseReleaseEvent(self, event):
+        super(ScriptGridView, self).mouseReleaseEvent(event)
+        self.pressed_index = QtCore.QPersistentModelIndex()
+        self.viewport().update()
 
-        # show window
-        help_win.exec_()
+    def run_index(self, index):
+        script = self.script_at(index)
+        if script is not None:
+            run_script(script.script_name, self.model().command(script), script.file_path, script.suspend_refresh)
 
-    def edit_script(self):
-        if sys.platform == 'win32':
-            os.startfile(self.script_path)
+    def show_context_menu(self, position):
+        script = self.script_at(self.indexAt(position))
+        if script is None:
+            return
+
+        context_menu = QtWidgets.QMenu(self)
+        context_menu.addAction('Help', partial(show_script_help, script.button_name, script.button_help))
+        context_menu.addAction('Run With Profiler', partial(run_script_profiled, script.button_name, script.script_name,
+                                                            self.model().command(script), script.file_path))
+        if script.file_path.endswith('.mel'):
+            context_menu.addAction('Force Re-source', partial(resource_script, script.file_path))
+        context_menu.addSeparator()
+        context_menu.addAction('Edit Script', partial(edit_script, script.file_path))
+        context_menu.exec_(self.viewport().mapToGlobal(position))
+
+
+class DSLGridTab(QtWidgets.QWidget):
+    """
+    A tab drawing its buttons through a model and a delegate instead of a widget per button,
+    so tabs can hold hundreds of lines
+    """
+
+    def __init__(self, name):
+        super(DSLGridTab, self).__init__()
+
+        self.name = name
+        self.model = ScriptGridModel(name, self)
+        self.view = None
+
+    @property
+    def is_built(self):
+        return self.view is not None
+
+    def build(self):
+        """
+        create the view of the tab, called the first time the tab is shown
+        """
+        if self.is_built:
+            return
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.view = ScriptGridView(self.model)
+        layout.addWidget(self.view)
+
+    def add_script(self, script):
+        return self.model.add_script(script)
+
+    def remove_script(self, file_path):
+        self.model.remove_script(file_path)
+
+    def is_empty(self):
+        return self.model.is_empty()
+
+    def fill_empty_rows(self):
+        # empty lines are just rows the delegate doesn't paint
+        pass
+
+
+class SearchField(QtWidgets.QLineEdit):
+    """
+    A line edit that hands the arrow keys to the results below it, so a button can be picked without the mouse
+    """
+
+    navigate = QtCore.Signal(int)
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_Down:
+            self.navigate.emit(1)
+        elif event.key() == QtCore.Qt.Key_Up:
+            self.navigate.emit(-1)
+        elif event.key() == QtCore.Qt.Key_Escape:
+            self.clear()
         else:
-            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
-            subprocess.call([opener, self.script_path])
+            super(SearchField, self).keyPressEvent(event)
+
+
+class SearchPalette(QtWidgets.QWidget):
+    """
+    Finds buttons across every tab as you type, Enter runs the selected one
+    """
+
+    max_results = 50
+
+    def __init__(self, search_index, parent=None):
+        super(SearchPalette, self).__init__(parent)
+
+        self.search_index = search_index
+        self.results = []
+
+        self.search_field = SearchField()
+        self.search_field.setPlaceholderText('Search buttons (Ctrl+P)')
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.textChanged.connect(self.refresh)
+        self.search_field.navigate.connect(self.navigate)
+        self.search_field.returnPressed.connect(self.run_selected)
+
+        self.result_list = QtWidgets.QListWidget()
+        self.result_list.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.result_list.itemActivated.connect(self.run_selected)
+        self.result_list.itemClicked.connect(self.run_selected)
+        self.result_list.hide()
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(self.search_field)
+        main_layout.addWidget(self.result_list)
+
+    def set_index(self, search_index):
+        self.search_index = search_index
+        self.refresh()
+
+    def focus(self):
+        self.search_field.setFocus()
+        self.search_field.selectAll()
+
+    def refresh(self, *args):
+        """
+        search again for what is in the field, the list is hidden while the field is empty
+        """
+        text = self.search_field.text()
+        self.results = self.search_index.search(text, self.max_results) if text.strip() else []
+
+        self.result_list.clear()
+        for script, tab in self.results:
+            item = QtWidgets.QListWidgetItem('%s  [%s]' % (script.button_name, tab))
+            item.setToolTip(script.button_description)
+            self.result_list.addItem(item)
+
+        self.result_list.setVisible(bool(text.strip()))
+        if self.results:
+            self.result_list.setCurrentRow(0)
+
+    def navigate(self, step):
+        if self.results:
+            row = max(0, min(len(self.results) - 1, self.result_list.currentRow() + step))
+            self.result_list.setCurrentRow(row)
+
+    def run_selected(self, *args):
+        row = self.result_list.currentRow()
+        if not 0 <= row < len(self.results):
+            return
+
+        script, tab = self.results[row]
+        self.search_field.clear()
+        run_script(script.script_name, script.button_tab(tab).command, script.file_path, script.suspend_refresh)
+
+
+def take_snapshot(folders):
+    """
+    :param folders: list(str), the folders of a library
+    :return: dict, the mtime and size of every folder and script in the library
+    """
+    snapshot = {}
+    for folder in folders:
+        try:
+            snapshot[folder] = os.stat(folder).st_mtime
+            for script_file in map(stat_script, list_script_files(folder)):
+                if script_file:
+                    snapshot[script_file[0]] = script_file[1:]
+        except OSError:
+            continue
+
+    return snapshot
+
+
+def start_worker(worker, parent, *done_signals):
+    """
+    run a worker on a thread of its own, the thread and the worker are deleted once the worker is done
+    :param worker: QObject, the worker, its signals should already be connected
+    :param parent: QObject, the owner of the thread
+    :param done_signals: Signal, the signals the worker ends its run with
+    :return: QThread, the running thread
+    """
+    thread = QtCore.QThread(parent)
+    worker.moveToThread(thread)
+
+    thread.started.connect(worker.run)
+    for signal in done_signals:
+        signal.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
+
+
+class PollWorker(QtCore.QObject):
+    """
+    Takes a snapshot of a polled library on a background thread, stating every script of a large library
+    on a file server takes too long for the ui thread
+    """
+
+    snapshot_taken = QtCore.Signal(int, object)
+
+    def __init__(self, folders, poll_id):
+        super(PollWorker, self).__init__()
+
+        self.folders = folders
+        self.poll_id = poll_id
+
+    def run(self):
+        self.snapshot_taken.emit(self.poll_id, take_snapshot(self.folders))
+
+
+class LibraryWatcher(QtCore.QObject):
+    """
+    Watches the folders and scripts of a library and reports when any of them changed,
+    either through file system notifications or by polling
+    """
+
+    changed = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        super(LibraryWatcher, self).__init__(parent)
+
+        self.folders = []
+        self.snapshot = None
+
+        # polls are numbered so a snapshot taken for a library that is no longer watched is ignored
+        self.poll_id = 0
+        self.poll_thread = None
+        self.poll_worker = None
+
+        self.file_watcher = QtCore.QFileSystemWatcher(self)
+        self.file_watcher.directoryChanged.connect(self.schedule_change)
+        self.file_watcher.fileChanged.connect(self.schedule_change)
+
+        # editors touch a file several times when saving, so changes are collected for a moment before reporting
+        self.change_timer = QtCore.QTimer(self)
+        self.change_timer.setSingleShot(True)
+        self.change_timer.setInterval(300)
+        self.change_timer.timeout.connect(self.changed.emit)
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def watch(self, folders, file_paths, mode='notify', poll_interval=2000):
+        """
+        start watching a library, anything watched before is dropped
+        :param folders: list(str), the folders of the library
+        :param file_paths: list(str), the scripts to watch for edits
+        :param mode: str, 'notify' for file system notifications, 'poll' to check the files on a timer
+        :param poll_interval: int, milliseconds between two polls
+        """
+        self.stop()
+        self.folders = folders
+
+        if mode == 'notify':
+            # network shares often refuse to be watched, in that case we fall back on polling
+            failed_paths = self.file_watcher.addPaths(folders + file_paths)
+            if not failed_paths:
+                return
+            print('Unable to watch %s paths, polling the library instead' % len(failed_paths))
+            self.stop()
+
+        # the first snapshot is what later ones are compared against
+        self.poll()
+        self.poll_timer.start(poll_interval)
+
+    def stop(self):
+        self.change_timer.stop()
+        self.poll_timer.stop()
+        watched_paths = self.file_watcher.files() + self.file_watcher.directories()
+        if watched_paths:
+            self.file_watcher.removePaths(watched_paths)
+        self.snapshot = None
+        self.poll_id += 1
+
+    def close(self):
+        """
+        stop watching and wait for a poll that is still running
+        """
+        self.stop()
+        if self.poll_thread is not None:
+            self.poll_thread.quit()
+            self.poll_thread.wait()
+            self.poll_thread = None
+            self.poll_worker = None
+
+    def poll(self):
+        # the previous poll is still going through the library
+        if self.poll_thread is not None:
+            return
+
+        self.poll_worker = PollWorker(list(self.folders), self.poll_id)
+        self.poll_worker.snapshot_taken.connect(self.snapshot_taken)
+        self.poll_thread = start_worker(self.poll_worker, self, self.poll_worker.snapshot_taken)
+
+    def snapshot_taken(self, poll_id, snapshot):
+        self.poll_thread = None
+        self.poll_worker = None
+        if poll_id != self.poll_id:
+            return
+
+        if self.snapshot is None:
+            self.snapshot = snapshot
+        elif snapshot != self.snapshot:
+            self.snapshot = snapshot
+            self.changed.emit()
+
+    def schedule_change(self, path=None):
+        self.change_timer.start()
+
+
+class ScanWorker(QtCore.QObject):
+    """
+    Runs a LibraryScanner on a background thread and streams the scripts it finds back in batches
+    """
+
+    files_found = QtCore.Signal(int, int)
+    batch_ready = QtCore.Signal(int, object)
+    scan_finished = QtCore.Signal(int, bool)
+    scan_failed = QtCore.Signal(int, str)
+
+    batch_size = 50
+
+    def __init__(self, scanner, scan_id):
+        super(ScanWorker, self).__init__()
+
+        self.scanner = scanner
+        self.scan_id = scan_id
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            self.scanner.list_files()
+            self.files_found.emit(self.scan_id, len(self.scanner.script_files))
+
+            for batch in self.scanner.iter_scripts(self.batch_size):
+                if self.cancelled:
+                    break
+                self.batch_ready.emit(self.scan_id, batch)
+
+            self.scanner.finish(complete=not self.cancelled)
+            self.scan_finished.emit(self.scan_id, self.cancelled)
+        except Exception as e:
+            self.scan_failed.emit(self.scan_id, str(e))
+        finally:
+            self.scanner.close()
+
+
+class SyncWorker(QtCore.QObject):
+    """
+    Brings the local mirrors of a library up to date on a background thread
+    """
+
+    sync_finished = QtCore.Signal(int, int)
+    sync_failed = QtCore.Signal(str)
+
+    def __init__(self, mirrors, force=False):
+        super(SyncWorker, self).__init__()
+
+        self.mirrors = mirrors
+        self.force = force
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        copied = removed = 0
+        try:
+            for mirror in self.mirrors:
+                mirror_copied, mirror_removed = mirror.sync(self.force, lambda: self.cancelled)
+                copied += mirror_copied
+                removed += mirror_removed
+            self.sync_finished.emit(copied, removed)
+        except (IOError, OSError) as e:
+            self.sync_failed.emit(str(e))
 
 
 class PreferencesWindow(QtWidgets.QDialog):
@@ -249,6 +1116,10 @@ class PreferencesWindow(QtWidgets.QDialog):
 
         self.parent = parent
         self.data = parent.load_preferences()
+
+        # what the window opened with, only the preferences edited in it are written back so changes made from
+        # the menus meanwhile are kept
+        self.initial_data = parent.load_preferences()
         self.setWindowTitle('DSL Preferences')
         self.setMinimumWidth(500)
 
@@ -280,6 +1151,73 @@ class PreferencesWindow(QtWidgets.QDialog):
         self.docking_position_options.setCurrentText(docking_position)
         self.docking_position_options.currentTextChanged.connect(self.set_docking_position)
         position_preference_layout.addRow('Docking Position', self.docking_position_options)
+        self.scan_threads_spinner = QtWidgets.QSpinBox()
+        self.scan_threads_spinner.setRange(0, 64)
+        self.scan_threads_spinner.setValue(self.data.get('scan_threads', 0))
+        self.scan_threads_spinner.setToolTip('Threads used to list folders and read headers, 0 scans sequentially')
+        self.scan_threads_spinner.valueChanged.connect(self.set_scan_threads)
+        position_preference_layout.addRow('Scan Threads', self.scan_threads_spinner)
+        self.view_cache_spinner = QtWidgets.QSpinBox()
+        self.view_cache_spinner.setRange(0, 20)
+        self.view_cache_spinner.setValue(self.data.get('view_cache_size', 3))
+        self.view_cache_spinner.setToolTip('Libraries kept built in memory for instant switching, '
+                                           '0 rebuilds every time')
+        self.view_cache_spinner.valueChanged.connect(self.set_view_cache_size)
+        position_preference_layout.addRow('Cached Libraries', self.view_cache_spinner)
+        self.scan_processes_checkbox = QtWidgets.QCheckBox()
+        self.scan_processes_checkbox.setChecked(bool(self.data.get('scan_processes')))
+        self.scan_processes_checkbox.setToolTip('Parse changed script headers in a pool of processes')
+        self.scan_processes_checkbox.toggled.connect(self.set_scan_processes)
+        position_preference_layout.addRow('Parse In Processes', self.scan_processes_checkbox)
+
+        self.background_scan_checkbox = QtWidgets.QCheckBox()
+        self.background_scan_checkbox.setChecked(bool(self.data.get('background_scan', True)))
+        self.background_scan_checkbox.setToolTip('Scan the library in the background and add buttons as they are found')
+        self.background_scan_checkbox.toggled.connect(self.set_background_scan)
+        position_preference_layout.addRow('Background Scan', self.background_scan_checkbox)
+
+        self.use_manifest_checkbox = QtWidgets.QCheckBox()
+        self.use_manifest_checkbox.setChecked(bool(self.data.get('use_manifest', True)))
+        self.use_manifest_checkbox.setToolTip('Read libraries from their manifest when it is up to date '
+                                              'instead of scanning them')
+        self.use_manifest_checkbox.toggled.connect(self.set_use_manifest)
+        position_preference_layout.addRow('Use Manifests', self.use_manifest_checkbox)
+
+        self.mirror_checkbox = QtWidgets.QCheckBox()
+        self.mirror_checkbox.setChecked(bool(self.data.get('mirror_libraries')))
+        self.mirror_checkbox.setToolTip('Copy libraries to a local folder and run the scripts from there, '
+                                        'the copy is synced in the background')
+        self.mirror_checkbox.toggled.connect(self.set_mirror_libraries)
+        position_preference_layout.addRow('Mirror Locally', self.mirror_checkbox)
+
+        self.prewarm_checkbox = QtWidgets.QCheckBox()
+        self.prewarm_checkbox.setChecked(bool(self.data.get('prewarm_scripts', True)))
+        self.prewarm_checkbox.setToolTip('Import the most used python scripts while maya is idle '
+                                         'so their first click is quick')
+        self.prewarm_checkbox.toggled.connect(self.set_prewarm_scripts)
+        position_preference_layout.addRow('Prewarm Favorites', self.prewarm_checkbox)
+        self.prewarm_count_spinner = QtWidgets.QSpinBox()
+        self.prewarm_count_spinner.setRange(0, 50)
+        self.prewarm_count_spinner.setValue(self.data.get('prewarm_count', 5))
+        self.prewarm_count_spinner.setToolTip('How many of the most used scripts are imported ahead of time')
+        self.prewarm_count_spinner.valueChanged.connect(self.set_prewarm_count)
+        position_preference_layout.addRow('Prewarm Scripts', self.prewarm_count_spinner)
+        self.prewarm_budget_spinner = QtWidgets.QSpinBox()
+        self.prewarm_budget_spinner.setRange(0, 60000)
+        self.prewarm_budget_spinner.setSingleStep(500)
+        self.prewarm_budget_spinner.setSuffix(' ms')
+        self.prewarm_budget_spinner.setValue(self.data.get('prewarm_budget', 2000))
+        self.prewarm_budget_spinner.setToolTip('Time the imports may take together, '
+                                               'no more scripts are imported once it is used up')
+        self.prewarm_budget_spinner.valueChanged.connect(self.set_prewarm_budget)
+        position_preference_layout.addRow('Prewarm Budget', self.prewarm_budget_spinner)
+        self.button_engine_options = QtWidgets.QComboBox()
+        self.button_engine_options.addItems(['Widgets', 'Grid'])
+        self.button_engine_options.setCurrentText(self.data.get('button_engine', 'widgets').title())
+        self.button_engine_options.setToolTip('Grid paints buttons in a view and supports tabs with hundreds of rows,\n'
+                                              'it is used the next time the library is loaded')
+        self.button_engine_options.currentTextChanged.connect(self.set_button_engine)
+        position_preference_layout.addRow('Button Engine', self.button_engine_options)
         self.main_layout.addWidget(position_preferences_widget)
 
         # folders layout
@@ -364,8 +1302,39 @@ class PreferencesWindow(QtWidgets.QDialog):
             docking_position = None
         self.data['docking_position'] = docking_position
 
+    def set_scan_threads(self):
+        self.data['scan_threads'] = self.scan_threads_spinner.value()
+
+    def set_view_cache_size(self):
+        self.data['view_cache_size'] = self.view_cache_spinner.value()
+
+    def set_scan_processes(self):
+        self.data['scan_processes'] = self.scan_processes_checkbox.isChecked()
+
+    def set_background_scan(self):
+        self.data['background_scan'] = self.background_scan_checkbox.isChecked()
+
+    def set_use_manifest(self):
+        self.data['use_manifest'] = self.use_manifest_checkbox.isChecked()
+
+    def set_mirror_libraries(self):
+        self.data['mirror_libraries'] = self.mirror_checkbox.isChecked()
+
+    def set_prewarm_scripts(self):
+        self.data['prewarm_scripts'] = self.prewarm_checkbox.isChecked()
+
+    def set_prewarm_count(self):
+        self.data['prewarm_count'] = self.prewarm_count_spinner.value()
+
+    def set_prewarm_budget(self):
+        self.data['prewarm_budget'] = self.prewarm_budget_spinner.value()
+
+    def set_button_engine(self):
+        self.data['button_engine'] = self.button_engine_options.currentText().lower()
+
     def save_preferences(self):
-        self.parent.save_preferences(self.data)
+        self.parent.save_preferences(dict((key, value) for key, value in self.data.items()
+                                          if key not in self.initial_data or self.initial_data[key] != value))
         self.close()
 
     def close_preferences(self):
@@ -375,7 +1344,7 @@ class PreferencesWindow(QtWidgets.QDialog):
         """
         Add folder to list
         """
-        target_dir = pm.fileDialog2(dir=os.path.expanduser('~'), ff='*.json', ds=2, fm=3, okc='Select')
+        target_dir = cmds.fileDialog2(dir=os.path.expanduser('~'), ff='*.json', ds=2, fm=3, okc='Select')
         try:
             target_dir = str(target_dir[0])
             if self.data['folders']:
@@ -443,7 +1412,7 @@ class PreferencesWindow(QtWidgets.QDialog):
                     self.list_of_folders.addItem(item)
                     self.list_of_folders.setItemWidget(item, widget)
         except TypeError:
-            print 'no preferences found'
+            print('no preferences found')
 
     def activate_directory(self):
         """
@@ -460,24 +1429,258 @@ class PreferencesWindow(QtWidgets.QDialog):
         self.parent.load_scripts(folder)
 
 
+class SequenceWindow(QtWidgets.QDialog):
+    """
+    Picks buttons to run one after the other as a single undo step, sequences can be saved as macros
+    """
+
+    StepRole = QtCore.Qt.UserRole
+
+    def __init__(self, parent):
+        super(SequenceWindow, self).__init__(parent)
+
+        self.parent = parent
+        self.setWindowTitle('Run Sequence')
+        self.setMinimumSize(600, 400)
+        main_layout = QtWidgets.QVBoxLayout(self)
+
+        # every button of the library on the left, the sequence on the right
+        lists_layout = QtWidgets.QHBoxLayout()
+        self.button_list = QtWidgets.QListWidget()
+        self.button_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.button_list.itemDoubleClicked.connect(self.add_steps)
+        self.sequence_list = QtWidgets.QListWidget()
+        self.sequence_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.sequence_list.itemDoubleClicked.connect(self.remove_steps)
+
+        step_buttons_layout = QtWidgets.QVBoxLayout()
+        for label, callback in [('Add >', self.add_steps), ('< Remove', self.remove_steps),
+                                ('Up', partial(self.move_step, -1)), ('Down', partial(self.move_step, 1))]:
+            step_button = QtWidgets.QPushButton(label)
+            step_button.clicked.connect(callback)
+            step_buttons_layout.addWidget(step_button)
+        step_buttons_layout.addStretch()
+
+        lists_layout.addWidget(self.button_list)
+        lists_layout.addLayout(step_buttons_layout)
+        lists_layout.addWidget(self.sequence_list)
+        main_layout.addLayout(lists_layout)
+
+        # saved macros
+        macro_layout = QtWidgets.QHBoxLayout()
+        self.macro_options = QtWidgets.QComboBox()
+        macro_layout.addWidget(QtWidgets.QLabel('Macro'))
+        macro_layout.addWidget(self.macro_options, 1)
+        for label, callback in [('Load', self.load_macro), ('Save As...', self.save_macro),
+                                ('Delete', self.delete_macro)]:
+            macro_button = QtWidgets.QPushButton(label)
+            macro_button.clicked.connect(callback)
+            macro_layout.addWidget(macro_button)
+        main_layout.addLayout(macro_layout)
+
+        self.run_btn = QtWidgets.QPushButton('Run Sequence')
+        self.run_btn.setMinimumHeight(30)
+        self.run_btn.clicked.connect(self.run)
+        main_layout.addWidget(self.run_btn)
+
+        self.build_button_list()
+        self.build_macro_options()
+        self.show()
+
+    @staticmethod
+    def step_item(script, tab):
+        """
+        :param script: Script, the script of the button
+        :param tab: str, the tab of the button
+        :return: QListWidgetItem, an item holding the library path of the script and the tab
+        """
+        item = QtWidgets.QListWidgetItem('%s (%s)' % (script.button_name, tab))
+        item.setToolTip(script.button_description)
+        item.setData(SequenceWindow.StepRole, [source_path(script.file_path), tab])
+        return item
+
+    def build_button_list(self):
+        self.button_list.clear()
+        buttons = [(script.button_name.lower(), tab, script) for script in self.parent.loaded_scripts.values()
+                   for tab in script.tab_names]
+        for _, tab, script in sorted(buttons, key=lambda button: button[:2]):
+            self.button_list.addItem(self.step_item(script, tab))
+
+    def build_macro_options(self, current=None):
+        self.macro_options.clear()
+        self.macro_options.addItems(sorted(self.parent.preferences.get('macros') or {}))
+        if current:
+            self.macro_options.setCurrentText(current)
+
+    def macro(self):
+        """
+        :return: list(list(str, str)), the library path and tab of every step in the sequence
+        """
+        return [self.sequence_list.item(row).data(self.StepRole) for row in range(self.sequence_list.count())]
+
+    def add_steps(self, *args):
+        for item in self.button_list.selectedItems():
+            self.sequence_list.addItem(item.clone())
+
+    def remove_steps(self, *args):
+        for item in self.sequence_list.selectedItems():
+            self.sequence_list.takeItem(self.sequence_list.row(item))
+
+    def move_step(self, offset, *args):
+        row = self.sequence_list.currentRow()
+        if not 0 <= row + offset < self.sequence_list.count() or row < 0:
+            return
+
+        item = self.sequence_list.takeItem(row)
+        self.sequence_list.insertItem(row + offset, item)
+        self.sequence_list.setCurrentRow(row + offset)
+
+    def load_macro(self, *args):
+        name = self.macro_options.currentText()
+        steps, missing = macro_steps((self.parent.preferences.get('macros') or {}).get(name, []),
+                                     self.parent.scripts_by_source())
+        for script_path in missing:
+            print('%s: %s is not in the library' % (name, script_path))
+
+        self.sequence_list.clear()
+        for script, button in steps:
+            self.sequence_list.addItem(self.step_item(script, button.tab))
+
+    def save_macro(self, *args):
+        if not self.sequence_list.count():
+            return
+
+        name, accepted = QtWidgets.QInputDialog.getText(self, 'Save Macro', 'Macro name',
+                                                        text=self.macro_options.currentText())
+        if not accepted or not name:
+            return
+
+        macros = self.parent.preferences.get('macros') or {}
+        macros[name] = self.macro()
+        self.parent.preferences.set('macros', macros)
+        self.build_macro_options(name)
+
+    def delete_macro(self, *args):
+        macros = self.parent.preferences.get('macros') or {}
+        if macros.pop(self.macro_options.currentText(), None) is not None:
+            self.parent.preferences.set('macros', macros)
+            self.build_macro_options()
+
+    def run(self, *args):
+        steps, _ = macro_steps(self.macro(), self.parent.scripts_by_source())
+        if steps:
+            run_sequence('sequence', steps)
+
+
+class LibraryView(object):
+    """
+    A built library, the widget holding its tabs and everything the window needs to pick it up again later
+    """
+
+    def __init__(self, root, widget, tab_widget, tabs, loaded_scripts, script_folders, script_paths,
+                 button_engine, search_index, slot_claims, modules, module_clashes, shadowed_scripts):
+        self.root = root
+        self.widget = widget
+        self.tab_widget = tab_widget
+        self.tabs = tabs
+        self.loaded_scripts = loaded_scripts
+        self.script_folders = script_folders
+        self.script_paths = script_paths
+        self.button_engine = button_engine
+        self.search_index = search_index
+        self.slot_claims = slot_claims
+
+        # the buttons keep working while the library is checked for changes
+        self.modules = modules
+        self.module_clashes = module_clashes
+        self.shadowed_scripts = shadowed_scripts
+
+    def delete(self):
+        self.widget.setParent(None)
+        self.widget.deleteLater()
+
+
 class DSL(MayaQWidgetDockableMixin, QtWidgets.QDialog):
     """
     create a window with a list of buttons representing scripts in the selected folder
     """
 
     # noinspection PyArgumentList
-    def __init__(self, parent=maya_main_window()):
-        # call the parent class and pass in the parent object
-        super(DSL, self).__init__(parent)
-
-        # we have possible root paths saved in a json file
-        self.preferences_file = pm.internalVar(userPrefDir=True) + '/dsl_preferences.json'
+    def __init__(self, parent=None):
+        # call the parent class and pass in the parent object, maya's main window is only looked up now
+        # so importing this module doesn't need a running ui
+        super(DSL, self).__init__(parent or maya_main_window())
+
+        # libraries that were switched away from stay built, so switching back to them is instant
+        self.library_views = LRUCache(DEFAULT_PREFERENCES['view_cache_size'])
+        self.library_widget = None
+
+        # we have possible root paths saved in a json file, it is read once and served from memory
+        self.preferences = preference_store
+        self.preferences_file = self.preferences.file_path()
         if not os.path.isfile(self.preferences_file):
             # if we don't have a preference file save one
-            self.save_preferences({'folders': '', 'default_folder': '', 'position': '',
-                                   'dockable': False, 'docking_position': ''})
+            self.save_preferences(dict(DEFAULT_PREFERENCES))
+            self.preferences.flush()
+
+        # parsed headers are cached on disk so a refresh only reads the scripts that changed
+        self.script_index = ScriptIndex(pref_path(SCRIPT_INDEX_FILE))
 
         self.current_dir = None
+        self.current_library = None
+        self.library_views.set_limit(self.preferences.get('view_cache_size', DEFAULT_PREFERENCES['view_cache_size']))
+        self.script_folders = []
+        self.script_paths = []
+        self.from_manifest = False
+
+        # the tabs that are shown and the scripts on them, so changes can be patched in without a rebuild
+        self.tab_widget = None
+        self.button_engine = 'widgets'
+        self.style_version = None
+        self.tabs = {}
+        self.loaded_scripts = {}
+
+        # every button of the library can be found by name, description, help or tab
+        self.search_index = SearchIndex()
+        self.search_palette = None
+        self.sequence_window = None
+
+        # who got each tab line, and who is waiting for it
+        self.slot_claims = SlotClaims()
+        self.conflicts_btn = None
+
+        # the importable names of the library, and the scripts sharing a module name, only the first one can be
+        # imported so the others get no button
+        self.library_modules = {}
+        self.module_clashes = {}
+        self.shadowed_scripts = {}
+
+        self.watcher = LibraryWatcher(self)
+        self.watcher.changed.connect(self.library_changed)
+
+        # the background sync of the local mirrors
+        self.sync_thread = None
+        self.sync_worker = None
+
+        # the library changed while it was being scanned, it is looked at again once the scan is done
+        self.rescan_pending = False
+
+        # the favorite scripts are imported one at a time whenever maya is idle
+        self.prewarmer = Prewarmer(maya_utils.executeDeferred)
+
+        # the background scan filling the tabs, scans are numbered so batches of an old scan are ignored
+        self.scan_id = 0
+        self.scan_thread = None
+        self.scan_worker = None
+        self.scan_start_time = None
+        self.stopped_scans = {}
+
+        # an update scan keeps the scripts it finds until it is done, then only what changed is patched in
+        self.scan_update = False
+        self.updated_scripts = []
+        self.status_label = None
+        self.scan_progress = None
+        self.cancel_scan_btn = None
 
         # general window setup
         self.setWindowTitle('DSL Version 3.0')
@@ -508,17 +1711,103 @@ class DSL(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                                          statusTip='Refresh script list',
                                          triggered=self.load_scripts)
 
+        self.search_action = QtWidgets.QAction('Search Buttons',
+                                               self,
+                                               statusTip='Find and run a button from any tab',
+                                               shortcut=QtGui.QKeySequence('Ctrl+P'),
+                                               triggered=self.focus_search)
+        self.addAction(self.search_action)
+
+        self.merge_action = QtWidgets.QAction('Merge All Libraries',
+                                              self,
+                                              statusTip='Show the buttons of every library folder together',
+                                              checkable=True)
+        self.merge_action.setChecked(bool(self.preferences.get('merged_view')))
+        self.merge_action.toggled.connect(self.set_merged_view)
+
+        self.resync_action = QtWidgets.QAction('Resync Mirror',
+                                               self,
+                                               statusTip='Compare every file of the library with its local mirror',
+                                               triggered=self.force_resync)
+
         self.file_menu.addAction(self.preferences_action)
         self.file_menu.addAction(self.refresh)
+        self.file_menu.addAction(self.search_action)
+        self.file_menu.addAction(self.merge_action)
+        self.file_menu.addAction(self.resync_action)
+
+        # buttons run back to back as one undo step, and the sequences saved for later
+        self.sequence_action = QtWidgets.QAction('Run Sequence...',
+                                                 self,
+                                                 statusTip='Run several buttons in one go as a single undo step',
+                                                 triggered=self.show_sequence_window)
+        self.file_menu.addAction(self.sequence_action)
+        self.macros_menu = self.file_menu.addMenu('Macros')
+        self.macros_menu.aboutToShow.connect(self.build_macros_menu)
+
+        # watching the library patches in changed scripts as soon as they are saved
+        self.watch_menu = self.file_menu.addMenu('Watch Library')
+        self.watch_actions = QtWidgets.QActionGroup(self)
+        watch_mode = self.preferences.get('watch_mode', 'off')
+        for mode, label in [('off', 'Off'), ('notify', 'File Notifications'), ('poll', 'Polling')]:
+            watch_action = QtWidgets.QAction(label, self.watch_actions, checkable=True)
+            watch_action.setChecked(mode == watch_mode)
+            watch_action.triggered.connect(partial(self.set_watch_mode, mode))
+            self.watch_menu.addAction(watch_action)
+
+        # how long every phase takes, to find out what is slow on a given workstation
+        tracer.set_enabled(bool(self.preferences.get('record_timings')))
+        self.timings_menu = self.file_menu.addMenu('Timings')
+        self.record_timings_action = QtWidgets.QAction('Record Timings',
+                                                       self,
+                                                       statusTip='Time loading, scanning and running scripts',
+                                                       checkable=True)
+        self.record_timings_action.setChecked(tracer.enabled)
+        self.record_timings_action.toggled.connect(self.set_record_timings)
+        self.timings_menu.addAction(self.record_timings_action)
+        self.timings_menu.addAction('Print Summary', self.print_timings)
+        self.timings_menu.addAction('Export Chrome Trace...', partial(self.export_timings, 'chrome'))
+        self.timings_menu.addAction('Export Json...', partial(self.export_timings, 'json'))
+        self.timings_menu.addAction('Clear', tracer.clear)
+
+        # changes made from other windows or to the file itself are applied as they come in
+        self.preferences.add_listener(self.preferences_changed)
 
         # load the scripts from the root dir
         self.load_scripts()
 
         # self.reposition()
 
-    def save_preferences(self, preferences):
-        with open(self.preferences_file, "w") as write_file:
-            json.dump(preferences, write_file, indent=2)
+    def closeEvent(self, event):
+        self.stop_scan(wait=True)
+        self.stop_sync()
+        self.watcher.close()
+        self.prewarmer.stop()
+        self.preferences.remove_listener(self.preferences_changed)
+        self.preferences.flush()
+        super(DSL, self).closeEvent(event)
+
+    def save_preferences(self, data):
+        """
+        :param data: dict, the preferences to change, the others are left as they are, they are written to disk
+                     a moment later
+        """
+        self.preferences.update(data)
+
+    def preferences_changed(self, changed):
+        """
+        apply preferences that were changed from the preferences window, a menu or by editing the file
+        :param changed: dict, the changed preferences and their new values
+        """
+        if 'view_cache_size' in changed:
+            view_cache_size = changed['view_cache_size']
+            if view_cache_size is None:
+                view_cache_size = DEFAULT_PREFERENCES['view_cache_size']
+            for view in self.library_views.set_limit(view_cache_size):
+                view.delete()
+
+        if 'record_timings' in changed and bool(changed['record_timings']) != tracer.enabled:
+            self.record_timings_action.setChecked(bool(changed['record_timings']))
 
     def reposition(self):
         try:
@@ -543,50 +1832,372 @@ class DSL(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 return
 
         except TypeError:
-            print 'preferences not found'
+            print('preferences not found')
 
+    @tracer.timed('load_scripts')
     def load_scripts(self, active_dir=None):
         """
         Find the root dir and load all of the scripts from it
         :return:
         """
         try:
+            previous_library = self.current_library
+            data = self.load_preferences()
             if active_dir is None:
-                data = self.load_preferences()
                 self.current_dir = data['default_folder']
             else:
                 self.current_dir = active_dir
-            self.clear_layout()
 
-            if self.current_dir:
+            # a refresh rebuilds the library, switching to another one keeps it around for later
+            self.prewarmer.stop()
+            self.clear_layout(keep_view=self.library_key() != previous_library)
+
+            # the previous library's modules and import hooks go away with it
+            library_sessions.switch(self.scan_roots() if self.current_dir else None)
+
+            cached_view = self.library_views.pop(self.library_key()) if self.current_dir else None
+            if cached_view is not None and cached_view.button_engine != (data or {}).get('button_engine', 'widgets'):
+                # the buttons were built for another engine
+                cached_view.delete()
+                cached_view = None
+
+            if cached_view is not None:
+                self.restore_layout(cached_view)
+            elif self.current_dir:
                 self.create_layout()
             else:
                 self.create_empty_layout()
+
+            # pick up what changed on the file server since the mirror was last synced
+            self.sync_mirrors()
         except TypeError:
-            print 'preferences not found'
+            print('preferences not found')
 
-    def load_preferences(self):
+    def library_roots(self):
+        """
+        :return: list(str), the folders that make up the library, every configured folder in merged mode
+        """
+        data = self.load_preferences() or {}
+        folders = [folder for folder in data.get('folders') or [] if folder]
+        if data.get('merged_view') and folders:
+            return folders
+
+        return [self.current_dir]
+
+    def mirror_libraries(self):
+        return bool(self.preferences.get('mirror_libraries'))
+
+    def get_mirror(self, root):
         """
-        Load the yaml with a list of possible script folders
-        :return: list(str), str, list of possible script folders and a default folder
+        :param root: str, a library folder
+        :return: LibraryMirror, the local mirror of the library, None until its first sync is done
         """
-        if os.path.isfile(self.preferences_file):
-            try:
+        mirror = library_mirrors.get(root)
+        if mirror is None:
+            mirror = library_mirrors[root] = LibraryMirror(root)
 
-                with open(self.preferences_file, "r") as read_file:
-                    data = json.load(read_file)
+        # the first copy is made by the background sync, the library runs from the file server until it is done
+        return mirror if mirror.is_synced() else None
 
-                return data
-            except Exception as e:
-                print e
+    def scan_roots(self):
+        """
+        :return: list(str), the folders the library is scanned and run from, its local mirrors when mirroring
+        """
+        roots = self.library_roots()
+        if not self.mirror_libraries():
+            return roots
+
+        mirrors = [self.get_mirror(root) for root in roots]
+        return [mirror.local_root if mirror is not None else root for root, mirror in zip(roots, mirrors)]
+
+    def sync_mirrors(self, force=False):
+        """
+        sync the mirrors of the current library on a background thread
+        :param force: bool, compare every file instead of trusting the mtimes and sizes
+        """
+        if self.sync_thread is not None or not self.current_dir or not self.mirror_libraries():
+            return
+
+        mirrors = [library_mirrors[root] for root in self.library_roots() if root in library_mirrors]
+        if not mirrors:
+            return
+
+        for mirror in mirrors:
+            if not mirror.is_synced():
+                print('Mirroring %s to %s' % (mirror.root, mirror.local_root))
+
+        self.sync_worker = SyncWorker(mirrors, force)
+        self.sync_worker.sync_finished.connect(self.sync_finished)
+        self.sync_worker.sync_failed.connect(self.sync_failed)
+        self.sync_thread = start_worker(self.sync_worker, self, self.sync_worker.sync_finished,
+                                        self.sync_worker.sync_failed)
+
+    def stop_sync(self):
+        if self.sync_thread is None:
+            return
+
+        self.sync_worker.cancel()
+        self.sync_thread.quit()
+        self.sync_thread.wait()
+        self.sync_thread = None
+        self.sync_worker = None
+
+    def force_resync(self, *args):
+        if not self.mirror_libraries():
+            print('Mirroring is turned off in the preferences')
+            return
+
+        self.stop_sync()
+        self.sync_mirrors(force=True)
+        if self.status_label is not None:
+            self.status_label.setText('Resyncing the local mirror...')
+
+    def sync_finished(self, copied, removed):
+        self.sync_thread = None
+        self.sync_worker = None
+        if self.status_label is not None:
+            self.status_label.setText('Mirror synced, %s files copied, %s removed' % (copied, removed))
+
+        if self.current_dir and not library_sessions.is_current(self.scan_roots()):
+            # a first sync is done, the library moves from the file server to its mirror
+            self.load_scripts(self.current_dir)
+            return
+
+        if any(not mirror.is_synced() for root, mirror in library_mirrors.items() if root in self.library_roots()):
+            # the library was switched while another one was syncing
+            self.sync_mirrors()
+            return
+
+        if copied or removed:
+            self.update_scripts()
+
+    def sync_failed(self, message):
+        self.sync_thread = None
+        self.sync_worker = None
+        print('Unable to sync the mirror: %s' % message)
+        if self.status_label is None:
+            return
+
+        if self.current_dir and library_sessions.is_current(self.library_roots()):
+            self.status_label.setText('Unable to mirror the library, running from the file server')
+        else:
+            self.status_label.setText('Library unreachable, running from the local mirror')
+
+    def set_record_timings(self, enabled):
+        """
+        :param enabled: bool, True to start recording timings, they stay on for the next sessions
+        """
+        tracer.set_enabled(enabled)
+        self.preferences.set('record_timings', enabled)
+
+    def scripts_by_source(self):
+        """
+        :return: dict, the library path of every loaded script to the script, mirrored scripts included
+        """
+        return dict((source_path(file_path), script) for file_path, script in self.loaded_scripts.items())
+
+    def show_sequence_window(self, *args):
+        self.sequence_window = SequenceWindow(self)
+
+    def build_macros_menu(self):
+        self.macros_menu.clear()
+        macros = self.preferences.get('macros') or {}
+        for name in sorted(macros):
+            self.macros_menu.addAction(name, partial(self.run_macro, name))
+        if not macros:
+            self.macros_menu.addAction('No Macros Saved').setEnabled(False)
+
+    def run_macro(self, name, *args):
+        """
+        run a saved macro, it doesn't run at all if one of its buttons is missing from the library
+        :param name: str, name of the macro
+        """
+        steps, missing = macro_steps((self.preferences.get('macros') or {}).get(name, []), self.scripts_by_source())
+        if missing:
+            print('Unable to run %s, the library is missing %s' % (name, ', '.join(missing)))
+            return
+
+        run_sequence(name, steps)
+
+    def print_timings(self, *args):
+        print(tracer.format_summary())
+
+    def export_timings(self, trace_format, *args):
+        """
+        save the recorded timings to a file picked by the user
+        :param trace_format: str, 'chrome' for chrome://tracing or ui.perfetto.dev, 'json' for the summary and runs
+        """
+        file_paths = cmds.fileDialog2(dir=os.path.expanduser('~'), ff='Json (*.json)', ds=2, fm=0, okc='Export')
+        if not file_paths:
+            return
+
+        tracer.save(file_paths[0], trace_format)
+        print('Saved the dsl timings to %s' % file_paths[0])
+
+    def library_changed(self):
+        """
+        the watcher saw the library change, a mirrored library is synced first and patched once that is done
+        """
+        if self.mirror_libraries():
+            self.sync_mirrors()
+        else:
+            self.update_scripts()
+
+    def library_key(self):
+        """
+        :return: str, what the library is cached under, merged libraries are keyed by all of their folders
+        """
+        return '|'.join(self.library_roots()) if self.current_dir else None
+
+    def make_scanner(self, use_manifest=True):
+        """
+        :param use_manifest: bool, False to always scan, even if the preferences allow reading manifests
+        :return: LibraryScanner or MergedScanner, a scanner for the current library
+        """
+        data = self.load_preferences() or {}
+        roots = self.scan_roots()
+        use_manifest = use_manifest and data.get('use_manifest', True)
+        if len(roots) > 1:
+            return MergedScanner(roots, self.script_index, data.get('scan_threads', 0),
+                                 data.get('scan_processes', False), use_manifest)
+
+        return LibraryScanner(roots[0], self.script_index, data.get('scan_threads', 0),
+                              data.get('scan_processes', False), use_manifest)
+
+    def set_merged_view(self, merged):
+        """
+        switch between showing the default folder and showing every folder together
+        :param merged: bool, True to merge the libraries
+        """
+        self.preferences.set('merged_view', merged)
+        self.load_scripts()
+
+    def set_watch_mode(self, mode, *args):
+        """
+        store how the library should be watched and start watching it that way
+        :param mode: str, 'off', 'notify' or 'poll'
+        """
+        self.preferences.set('watch_mode', mode)
+        self.watch_library()
+
+    def watch_library(self):
+        """
+        (re)start watching the folders and scripts of the current library according to the preferences
+        """
+        data = self.load_preferences() or {}
+        mode = data.get('watch_mode', 'off')
+        if mode == 'off' or self.tab_widget is None:
+            self.watcher.stop()
+            return
+
+        # a mirrored library is watched on the file server, its mirror only changes when it is synced
+        self.watcher.watch([source_path(folder) for folder in self.script_folders],
+                           [source_path(script_path) for script_path in self.script_paths],
+                           mode, data.get('watch_interval', 2000))
+
+    def update_scripts(self):
+        """
+        rescan the library on a background thread, the buttons of scripts that were added, modified or deleted
+        are patched in once the scan is done
+        """
+        if not self.current_dir or self.tab_widget is None:
+            return
+
+        if self.scan_thread is not None:
+            self.rescan_pending = True
+            return
+
+        self.start_scan(update=True)
+
+    @tracer.timed('apply_update')
+    def apply_update(self, scripts):
+        """
+        patch in only the buttons of scripts that were added, modified or deleted
+        :param scripts: list(Script), every script of the library, in the order it was found
+        :return: int, how many scripts were added, modified or deleted
+        """
+        new_scripts = self.collect_scripts(group_scripts(scripts))
+        for file_path in self.shadowed_scripts:
+            new_scripts.pop(file_path, None)
+        added, modified, removed = diff_scripts(self.loaded_scripts, new_scripts)
+
+        changed_tabs = set()
+        for file_path in removed + modified:
+            self.search_index.remove(file_path)
+            self.slot_claims.release(file_path)
+            for tab in self.loaded_scripts[file_path].tab_names:
+                self.tabs[tab].remove_script(file_path)
+                changed_tabs.add(tab)
+
+        self.apply_button_styles(new_scripts[file_path] for file_path in modified + added)
+        for file_path in modified + added:
+            script = new_scripts[file_path]
+            self.search_index.add(script)
+            self.report_taken_slots(script, self.slot_claims.claim(script))
+            for tab in script.tab_names:
+                self.get_tab(tab).add_script(script)
+                changed_tabs.add(tab)
+
+        for tab in changed_tabs:
+            if self.tabs[tab].is_empty():
+                self.tab_widget.removeTab(self.tab_widget.indexOf(self.tabs[tab]))
+                self.tabs.pop(tab).deleteLater()
+            else:
+                self.tabs[tab].fill_empty_rows()
+
+        self.loaded_scripts = new_scripts
+        if self.search_palette is not None and (added or modified or removed):
+            self.search_palette.refresh()
+        self.update_conflicts()
+
+        # editors often save by replacing the file, which drops it from the watched paths
+        self.watch_library()
+
+        return len(added) + len(modified) + len(removed)
+
+    @tracer.timed('load_preferences')
+    def load_preferences(self):
+        """
+        the preferences with a list of possible script folders, from memory, the file is only read again
+        once it changed on disk
+        :return: dict, a copy of the preferences, None if they could not be read
+        """
+        return self.preferences.copy()
 
     def show_folder_list(self):
         self.preferences_action = PreferencesWindow(self)
 
-    def clear_layout(self):
+    def clear_layout(self, keep_view=False):
         """
         Delete all buttons form the layout
+        :param keep_view: bool, cache the library that is shown so it can be restored without a rebuild
         """
+        # a library that didn't finish loading isn't worth keeping
+        keep_view = keep_view and self.scan_thread is None and self.library_widget is not None
+        self.stop_scan()
+        self.watcher.stop()
+
+        if keep_view and self.library_views.limit > 0:
+            self.library_widget.setParent(None)
+            view = LibraryView(self.current_library, self.library_widget, self.tab_widget, self.tabs,
+                               self.loaded_scripts, self.script_folders, self.script_paths, self.button_engine,
+                               self.search_index, self.slot_claims, self.library_modules, self.module_clashes,
+                               self.shadowed_scripts)
+            for evicted_view in self.library_views.put(view.root, view):
+                evicted_view.delete()
+
+        self.current_library = None
+        self.library_widget = None
+        self.tab_widget = None
+        self.tabs = {}
+        self.loaded_scripts = {}
+        self.search_index = SearchIndex()
+        self.search_palette = None
+        self.slot_claims = SlotClaims()
+        self.library_modules = {}
+        self.module_clashes = {}
+        self.shadowed_scripts = {}
+
         for i in reversed(range(self.main_layout.count())):
             self.main_layout.itemAt(i).widget().setParent(None)
 
@@ -610,132 +2221,424 @@ class DSL(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
         self.setLayout(self.main_layout)
 
+    @tracer.timed('create_layout')
     def create_layout(self):
         """
         Add buttons to the window representing all of the scripts
         """
+        # the title and tabs of a library live in one widget so they can be cached as a whole
+        self.current_library = self.library_key()
+        self.library_widget = QtWidgets.QWidget()
+        library_layout = QtWidgets.QVBoxLayout(self.library_widget)
+        library_layout.setContentsMargins(0, 0, 0, 0)
+
         # create the window's main layout
-        title = QtWidgets.QLabel(os.path.basename(self.current_dir).title())
+        title = QtWidgets.QLabel(' + '.join(os.path.basename(root.rstrip('/\\')).title()
+                                            for root in self.library_roots()))
         title.setAlignment(QtCore.Qt.AlignCenter | QtCore.Qt.AlignCenter)
         title.setContentsMargins(1, 1, 1, 20)
         title.setFont(self.title_font)
 
-        self.main_layout.addWidget(title)
+        library_layout.addWidget(title)
 
         # create the tab system
-        tab_widget = QtWidgets.QTabWidget()
-        created_tabs = {}
-        scripts = self.build_script_list()
+        self.tab_widget = QtWidgets.QTabWidget()
+        data = self.load_preferences() or {}
+        self.button_engine = data.get('button_engine', 'widgets')
 
         # style tabs
-        tab_widget.setStyleSheet(
+        self.tab_widget.setStyleSheet(
             '''QTabBar::tab { background: #red; height: 25px; width: 75px; border-top-left-radius: 5px; border-top-right-radius: 5px; border: 1px solid}
                QTabBar:tab:selected{background: #4b4b4b;}''')
+
+        # only the tab on screen is built, the others wait until they are first opened
+        self.tab_widget.currentChanged.connect(self.build_current_tab)
+        library_layout.addWidget(self.tab_widget)
+        self.create_search_palette()
+        self.main_layout.addWidget(self.library_widget)
+        self.create_status_bar()
+
+        self.setLayout(self.main_layout)
+
+        if data.get('background_scan', True):
+            # buttons show up as they are found instead of freezing maya until the whole library is read
+            self.start_scan()
+            return
+
         # create all the tabs
-        for tab, sc in scripts.iteritems():
+        self.add_scripts([script for script in self.scan_library() if script.is_valid])
+        self.tab_widget.setCurrentIndex(0)
+        self.build_current_tab()
+        self.watch_library()
+        self.prewarm_scripts()
+
+    @tracer.timed('restore_layout')
+    def restore_layout(self, view):
+        """
+        show a cached library again, a background scan patches in whatever changed meanwhile
+        :param view: LibraryView, the cached library
+        """
+        self.current_library = view.root
+        self.library_widget = view.widget
+        self.tab_widget = view.tab_widget
+        self.tabs = view.tabs
+        self.loaded_scripts = view.loaded_scripts
+        self.script_folders = view.script_folders
+        self.script_paths = view.script_paths
+        self.button_engine = view.button_engine
+        self.search_index = view.search_index
+        self.slot_claims = view.slot_claims
+        self.library_modules = view.modules
+        self.module_clashes = view.module_clashes
+        self.shadowed_scripts = view.shadowed_scripts
+
+        # the session of the library was closed when switching away from it
+        library_sessions.current.set_modules(self.library_modules)
+
+        self.create_search_palette()
+        self.main_layout.addWidget(self.library_widget)
+        self.create_status_bar()
+        self.setLayout(self.main_layout)
+
+        self.status_label.setText('%s buttons restored, looking for changes...' % len(self.loaded_scripts))
+        self.update_scripts()
+        self.prewarm_scripts()
+
+    def create_search_palette(self):
+        self.search_palette = SearchPalette(self.search_index)
+        self.main_layout.addWidget(self.search_palette)
+
+    def focus_search(self, *args):
+        if self.search_palette is not None:
+            self.search_palette.focus()
+
+    def create_status_bar(self):
+        status_widget = QtWidgets.QWidget()
+        status_layout = QtWidgets.QHBoxLayout(status_widget)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.status_label = QtWidgets.QLabel()
+        self.scan_progress = QtWidgets.QProgressBar()
+        self.scan_progress.setFormat('%v / %m')
+        self.scan_progress.setMaximumHeight(16)
+        self.cancel_scan_btn = QtWidgets.QPushButton('Cancel')
+        self.cancel_scan_btn.setMaximumHeight(16)
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        self.conflicts_btn = QtWidgets.QPushButton()
+        self.conflicts_btn.setMaximumHeight(16)
+        self.conflicts_btn.setToolTip('Buttons that claim a tab line another button already has, '
+                                      'or scripts whose module name another script has')
+        self.conflicts_btn.clicked.connect(self.show_conflicts)
+        self.scan_progress.hide()
+        self.cancel_scan_btn.hide()
+        self.conflicts_btn.hide()
+
+        status_layout.addWidget(self.status_label, 1)
+        status_layout.addWidget(self.conflicts_btn)
+        status_layout.addWidget(self.scan_progress)
+        status_layout.addWidget(self.cancel_scan_btn)
+        self.main_layout.addWidget(status_widget)
+
+    def start_scan(self, update=False):
+        """
+        scan the current library on a background thread, the tabs fill up as the scripts come in
+        :param update: bool, look for changes to the buttons that are shown, they are patched in once the scan is done
+        """
+        self.stop_scan()
+        self.rescan_pending = False
+        # scripts edited in place don't make a manifest stale, so changes are always looked for on disk
+        scanner = self.make_scanner(use_manifest=not update)
+
+        self.scan_id += 1
+        self.scan_start_time = time.time()
+        self.scan_update = update
+        self.updated_scripts = []
+        self.scan_worker = ScanWorker(scanner, self.scan_id)
+        self.scan_worker.files_found.connect(self.scan_files_found)
+        self.scan_worker.batch_ready.connect(self.scan_batch_ready)
+        self.scan_worker.scan_finished.connect(self.scan_finished)
+        self.scan_worker.scan_failed.connect(self.scan_failed)
+
+        if not update:
+            self.status_label.setText('Scanning %s...' % ', '.join(self.library_roots()))
+            self.scan_progress.setRange(0, 0)
+            self.scan_progress.show()
+            self.cancel_scan_btn.show()
+        self.scan_thread = start_worker(self.scan_worker, self, self.scan_worker.scan_finished,
+                                        self.scan_worker.scan_failed)
+
+    def cancel_scan(self, *args):
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+
+    def stop_scan(self, wait=False):
+        """
+        cancel the running scan, it wraps up on its own thread and whatever it still sends is ignored
+        :param wait: bool, block until every cancelled scan is done, for when the window closes
+        """
+        if self.scan_thread is not None:
+            self.scan_worker.cancel()
+            # held on to until the scan reports back, its thread and worker can't be collected while they run
+            self.stopped_scans[self.scan_id] = (self.scan_thread, self.scan_worker)
+            self.scan_id += 1
+            self.scan_thread = None
+            self.scan_worker = None
+
+        if wait:
+            for scan_thread, _ in self.stopped_scans.values():
+                scan_thread.quit()
+                scan_thread.wait()
+            self.stopped_scans.clear()
+
+    def set_library_files(self, scanner):
+        """
+        take over the folders and files a scanner found, and make the library's modules importable
+        :param scanner: LibraryScanner, a scanner that listed the current library
+        """
+        self.script_folders = scanner.script_folders
+        self.script_paths = scanner.script_paths
+        self.from_manifest = scanner.manifest is not None
+        self.library_modules = scanner.modules
+        library_sessions.current.set_modules(self.library_modules)
+
+        for root, error in getattr(scanner, 'failed_roots', []):
+            print('Unable to load the library %s: %s' % (root, error))
+
+        reported = self.shadowed_scripts
+        self.module_clashes = scanner.module_clashes
+        self.shadowed_scripts = dict((path, paths[0]) for paths in self.module_clashes.values() for path in paths[1:]
+                                     if path.endswith('.py'))
+        for script_path, owner in sorted(self.shadowed_scripts.items()):
+            if script_path not in reported:
+                print('%s gets no button, its module name is taken by %s' % (script_path, owner))
+
+    def scan_files_found(self, scan_id, file_count):
+        if scan_id != self.scan_id:
+            return
+
+        self.set_library_files(self.scan_worker.scanner)
+        self.scan_progress.setRange(0, file_count)
+        self.scan_progress.setValue(0)
 
-            if tab not in created_tabs.keys():
-                created_tabs[tab] = QtWidgets.QWidget()
-                created_tabs[tab].vertical_layout = QtWidgets.QVBoxLayout(created_tabs[tab])
-                created_tabs[tab].tab_rows = self.create_tab_rows(created_tabs[tab].vertical_layout, tab)
-                tab_index = tab_widget.addTab(created_tabs[tab], tab)
+    def scan_batch_ready(self, scan_id, scripts):
+        if scan_id != self.scan_id:
+            return
+
+        report_broken_headers(scripts)
+        if self.scan_update:
+            self.updated_scripts.extend(scripts)
+        else:
+            self.add_scripts([script for script in scripts if script.is_valid])
+        self.scan_progress.setValue(self.scan_progress.value() + len(scripts))
 
-                # move the Main tab to the start of the tab list
-                if tab == 'Main':
-                    tab_widget.tabBar().moveTab(tab_index, 0)
+    def scan_finished(self, scan_id, cancelled):
+        self.stopped_scans.pop(scan_id, None)
+        if scan_id != self.scan_id:
+            return
 
-            for script in sc:
+        self.scan_progress.hide()
+        self.cancel_scan_btn.hide()
+        self.scan_thread = None
+        self.scan_worker = None
+
+        if cancelled:
+            self.status_label.setText('Scan cancelled, %s buttons loaded' % len(self.loaded_scripts))
+            return
+
+        if self.scan_update:
+            scripts, self.updated_scripts = self.updated_scripts, []
+            changes = self.apply_update(scripts)
+            self.status_label.setText('%s buttons loaded, %s changed on disk' % (len(self.loaded_scripts), changes))
+        else:
+            self.status_label.setText('%s buttons loaded from %s scripts in %.1fs%s' % (
+                len(self.loaded_scripts), len(self.script_paths), time.time() - self.scan_start_time,
+                ' (manifest)' if self.from_manifest else ''))
+            self.watch_library()
+            self.prewarm_scripts()
+
+        if self.rescan_pending:
+            self.rescan_pending = False
+            self.update_scripts()
+
+    def scan_failed(self, scan_id, message):
+        self.stopped_scans.pop(scan_id, None)
+        if scan_id != self.scan_id:
+            return
+
+        self.scan_progress.hide()
+        self.cancel_scan_btn.hide()
+        self.scan_thread = None
+        self.scan_worker = None
+        self.status_label.setText('Scan failed: %s' % message)
+
+    def add_scripts(self, scripts):
+        """
+        give freshly scanned scripts their buttons
+        :param scripts: list(Script), valid scripts in the order they were found
+        """
+        scripts = [script for script in scripts if script.file_path not in self.shadowed_scripts]
+        self.apply_button_styles(scripts)
+
+        changed_tabs = set()
+        for script in scripts:
+            self.loaded_scripts[script.file_path] = script
+            self.search_index.add(script)
+            self.report_taken_slots(script, self.slot_claims.claim(script))
+            for tab in script.tab_names:
                 # add a button to the tab
-                button = DSLButton(label=script.button_name,
-                                   color=script.button_color,
-                                   command=script.button_tabs[tab].get('button_command'),
-                                   script=script.script_name,
-                                   help=script.button_help,
-                                   script_path=script.file_path)
-
-                # check if we already have a button in this location
-                if created_tabs[tab].tab_rows[tab + script.button_tabs[tab].get('button_line')].count() == 0:
-                    created_tabs[tab].tab_rows[tab + script.button_tabs[tab].get('button_line')].addWidget(button)
-
-                    # add the description to the tab
-                    button_description = QtWidgets.QLabel(script.button_description)
-                    button_description.setMinimumSize(200, 30)
-                    button_description.setMaximumSize(200, 30)
-                    button_description.setContentsMargins(10, 1, 1, 1)
-                    created_tabs[tab].tab_rows[tab + script.button_tabs[tab].get('button_line')].addWidget(
-                        button_description)
-
-                else:
-                    print('Unable to add %s to %s there is already a button at this location' % (
-                        script.button_name, tab + script.button_tabs[tab].get('button_line')))
-                    continue
-
-                    # fill out empty spaces
-
-            for horizontal_layout in range(created_tabs[tab].vertical_layout.count()):
-                found_layout = created_tabs[tab].vertical_layout.itemAt(horizontal_layout)
-                if found_layout.count() == 0:
-                    frame = QtWidgets.QFrame()
-                    frame.setMinimumSize(200, 30)
-                    frame.setMaximumSize(200, 30)
-                    found_layout.addWidget(frame)
-
-        tab_widget.setCurrentIndex(0)
-
-        self.main_layout.addWidget(tab_widget)
+                self.get_tab(tab).add_script(script)
+                changed_tabs.add(tab)
 
-        self.setLayout(self.main_layout)
+        for tab in changed_tabs:
+            self.tabs[tab].fill_empty_rows()
 
-    def create_tab_rows(self, tab_layout, tab_name):
-        tab_rows = {}
+        if self.search_palette is not None:
+            self.search_palette.refresh()
+        self.update_conflicts()
 
-        for i in range(1, 21):
-            tab_rows[tab_name + str(i)] = QtWidgets.QHBoxLayout()
-            tab_layout.addLayout(tab_rows[tab_name + str(i)])
+    def report_taken_slots(self, script, taken_slots):
+        """
+        :param script: Script, a script that was just added
+        :param taken_slots: list(tuple(str, str)), the tab and line of every slot the script didn't get
+        """
+        for tab, line in taken_slots:
+            owner = self.slot_claims.claims[(tab, line)][0]
+            print('%s (%s) waits for %s line %s, %s (%s) already has it' % (
+                script.button_name, script.file_path, tab, line, owner.button_name, owner.file_path))
 
-        return tab_rows
+    def prewarm_scripts(self):
+        """
+        import the python scripts that were used the most lately while maya is idle, so their first click is quick
+        """
+        data = self.load_preferences() or {}
+        if not data.get('prewarm_scripts', True) or library_sessions.current is None:
+            self.prewarmer.stop()
+            return
+
+        # scripts without a command run when they are imported, those can't be warmed up
+        scripts = dict((source_path(file_path), script) for file_path, script in self.loaded_scripts.items()
+                       if script.script_extension == '.py' and all(button.command for button in script.button_tabs))
+        favorites = usage_stats.most_frecent(scripts, data.get('prewarm_count', DEFAULT_PREFERENCES['prewarm_count']))
+
+        session = library_sessions.current
+        tasks = [(scripts[script_path].button_name,
+                  partial(session.prewarm, scripts[script_path].script_name, scripts[script_path].file_path))
+                 for script_path in favorites]
+        self.prewarmer.start(tasks, data.get('prewarm_budget', DEFAULT_PREFERENCES['prewarm_budget']) / 1000.0)
+
+    def update_conflicts(self):
+        if self.conflicts_btn is None:
+            return
+
+        conflict_count = len(self.slot_claims.conflicts()) + len(self.module_clashes)
+        self.conflicts_btn.setText('%s conflicts' % conflict_count)
+        self.conflicts_btn.setVisible(bool(conflict_count))
 
+    def show_conflicts(self, *args):
+        """
+        list every tab line that more than one button claims, and which one got it, and every module name
+        more than one script has
+        """
+        conflicts_win = QtWidgets.QDialog(self)
+        conflicts_win.setWindowTitle('Button Conflicts')
+        conflicts_win.setMinimumSize(600, 300)
+
+        conflicts_tree = QtWidgets.QTreeWidget()
+        conflicts_tree.setHeaderLabels(['Slot', 'Button', 'Script'])
+        for tab, line, scripts in self.slot_claims.conflicts():
+            slot_item = QtWidgets.QTreeWidgetItem(['%s line %s' % (tab, line)])
+            for i, script in enumerate(scripts):
+                state = 'shown' if i == 0 else 'hidden'
+                slot_item.addChild(QtWidgets.QTreeWidgetItem([state, script.button_name, script.file_path]))
+            conflicts_tree.addTopLevelItem(slot_item)
+        for name, paths in sorted(self.module_clashes.items()):
+            module_item = QtWidgets.QTreeWidgetItem(['module %s' % name])
+            for i, path in enumerate(paths):
+                state = 'imported' if i == 0 else 'hidden' if path in self.shadowed_scripts else 'not imported'
+                script = self.loaded_scripts.get(path)
+                module_item.addChild(QtWidgets.QTreeWidgetItem([state, script.button_name if script else '', path]))
+            conflicts_tree.addTopLevelItem(module_item)
+        conflicts_tree.expandAll()
+        conflicts_tree.resizeColumnToContents(0)
+
+        main_layout = QtWidgets.QVBoxLayout(conflicts_win)
+        main_layout.addWidget(conflicts_tree)
+        conflicts_win.show()
+
+    def apply_button_styles(self, scripts):
+        """
+        resolve the colors of the scripts, the window's style sheet is only rebuilt when a new color shows up
+        :param scripts: iterable(Script), the scripts about to get buttons
+        """
+        for script in scripts:
+            button_palette.resolve(script.button_color)
+
+        if button_palette.version != self.style_version:
+            self.style_version = button_palette.version
+            self.setStyleSheet(button_palette.style_sheet())
+
+    def build_current_tab(self, *args):
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab is not None:
+            current_tab.build()
+
+    def get_tab(self, tab):
+        """
+        returns a tab by name, creating it if it doesn't exist yet
+        :param tab: str, name of the tab
+        :return: DSLTab, the tab
+        """
+        if tab not in self.tabs:
+            if self.button_engine == 'grid':
+                self.tabs[tab] = DSLGridTab(tab)
+            else:
+                self.tabs[tab] = DSLTab(tab)
+            tab_index = self.tab_widget.addTab(self.tabs[tab], tab)
+
+            # move the Main tab to the start of the tab list
+            if tab == 'Main':
+                self.tab_widget.tabBar().moveTab(tab_index, 0)
+                self.tab_widget.setCurrentIndex(0)
+
+        return self.tabs[tab]
+
+    @staticmethod
+    def collect_scripts(scripts):
+        """
+        :param scripts: dict, tab name to the list of scripts in it, as returned by build_script_list
+        :return: dict, file path to Script for every script in the library
+        """
+        return dict((script.file_path, script) for tab_scripts in scripts.values() for script in tab_scripts)
+
+    @tracer.timed('build_script_list')
     def build_script_list(self):
         """
         builds a list of script to load into the interface
         :return: list(Script), a list of Script objects containing
                  the script info, such as its name, location in the UI and the command to run it
         """
-        # get list of files
-        script_folders = [folder for folder in os.listdir(self.current_dir) if
-                          os.path.isdir(os.path.join(self.current_dir, folder))]
-        script_folders.append(self.current_dir)
-
-        for folder in script_folders:
-            if folder not in sys.path and folder != self.current_dir:
-                sys.path.append(os.path.join(self.current_dir, folder))
-
-        # make sure we add to original directory too, as it may contain scrips as well
-        if self.current_dir not in sys.path:
-            sys.path.append(self.current_dir)
-
-        # search all of our directories for scripts and use their headers to determine their info
-        found_scripts = {}
-
-        for folder in script_folders:
-            path = os.path.join(self.current_dir, folder)
-
-            for f in os.listdir(path):
-                script_path = os.path.join(path, f).replace('\\', '/')
-                script = Script(file_path=script_path)
-                if script.is_valid:
-                    for location in script.button_tabs.keys():
-                        try:
-                            if location in found_scripts.keys():
-                                location_scripts = found_scripts[location]
-                                location_scripts.append(script)
-                                found_scripts[location] = location_scripts
-                            else:
-                                found_scripts[location] = [script]
-                        except AttributeError:
-                            print 'failed to add script', script_path
-
-        return found_scripts
+        return group_scripts(self.scan_library())
+
+    @tracer.timed('scan_library')
+    def scan_library(self, use_manifest=True):
+        """
+        scan the current library in one go
+        :param use_manifest: bool, False to ignore the library's manifest
+        :return: list(Script), every script in the library, in the order it was found
+        """
+        scanner = self.make_scanner(use_manifest)
+        try:
+            scanner.list_files()
+            # the pools keep the original order so the tabs are filled exactly like a sequential scan would
+            scripts = [script for batch in scanner.iter_scripts() for script in batch]
+        finally:
+            scanner.close()
+
+        self.set_library_files(scanner)
+        report_broken_headers(scripts)
+        scanner.finish()
+
+        return scripts
 
 
 if __name__ == "__main__":
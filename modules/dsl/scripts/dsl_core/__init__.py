@@ -0,0 +1,25 @@
+"""The parts of dsl that don't need maya or qt: reading headers, scanning libraries, the script index and preferences
+
+everything in here imports in plain python, the qt front-end lives in DynamicScriptLibrary and builds on top of it
+"""
+
+from .header import Header, HeaderError, parse_header, read_header
+from .script import Script, read_script_record
+from .index import ScriptIndex
+from .manifest import Manifest, MANIFEST_FILE
+from .files import replace_file, write_json, write_bytes
+from .mirror import LibraryMirror, mirror_folder
+from .timing import Tracer, tracer
+from .profiling import ProfileReport, run_profiled
+from .usage import UsageStats, Prewarmer, USAGE_FILE
+from .batch import BatchRunner, CHUNK_NAME, macro_steps
+from .cache import LRUCache
+from .search import SearchIndex
+from .conflicts import SlotClaims
+from .loader import ModuleLoader, MelSourcer
+from .importer import LibraryFinder
+from .session import LibrarySession, SessionManager
+from .scan import (LibraryScanner, MergedScanner, ProcessPool, list_script_files, list_packages, stat_script,
+                   parse_in_processes, group_scripts, report_broken_headers, diff_scripts)
+from .preferences import (DEFAULT_PREFERENCES, PREFERENCES_FILE, SCRIPT_INDEX_FILE, PreferenceStore, load_preferences,
+                          save_preferences, user_pref_dir, user_app_dir, pref_path)
@@ -0,0 +1,93 @@
+"""Runs several buttons back to back as a single step: one undo chunk, with the viewport held until they are done
+
+sequences of buttons can be saved as macros, a macro step names the script by its library path and the tab of the
+button so it keeps working when the library is mirrored or the command in the header changes
+"""
+
+import traceback
+from contextlib import contextmanager
+
+# the undo chunk of a sequence shows up under this name in maya's undo queue
+CHUNK_NAME = 'dsl_sequence'
+
+
+class BatchRunner(object):
+    """
+    Opens an undo chunk and suspends the viewport refresh around runs, a batch started inside another one
+    leaves both to the outer batch
+    """
+
+    def __init__(self, undo_chunk, suspend_refresh):
+        """
+        :param undo_chunk: callable, opens an undo chunk when called with True and closes it when called with False,
+                           maya.cmds.undoInfo in maya
+        :param suspend_refresh: callable, suspends the viewport refresh when called with True and resumes it when
+                                called with False, maya.cmds.refresh in maya
+        """
+        self.undo_chunk = undo_chunk
+        self.suspend_refresh = suspend_refresh
+        self.depth = 0
+        self.suspended = False
+
+    @contextmanager
+    def batch(self, undo=True, hold_refresh=True):
+        """
+        :param undo: bool, collect everything run inside the batch into one undo chunk
+        :param hold_refresh: bool, suspend the viewport refresh until the batch is done
+        """
+        outer = self.depth == 0
+        self.depth += 1
+        chunk_open = refresh_held = False
+        try:
+            if outer and undo:
+                self.undo_chunk(True)
+                chunk_open = True
+            if hold_refresh and not self.suspended:
+                self.suspend_refresh(True)
+                self.suspended = refresh_held = True
+            yield self
+        finally:
+            self.depth -= 1
+            if refresh_held:
+                self.suspended = False
+                self.suspend_refresh(False)
+            if chunk_open:
+                self.undo_chunk(False)
+
+    def run(self, steps, hold_refresh=True):
+        """
+        run steps one after the other inside a batch, the first step to fail stops the run since the steps after it
+        usually build on what it did
+        :param steps: list(tuple(str, callable)), a name and a function for every step
+        :param hold_refresh: bool, suspend the viewport refresh until every step ran
+        :return: tuple(str, str), the name and traceback of the step that failed, None if every step ran
+        """
+        with self.batch(hold_refresh=hold_refresh):
+            for name, step in steps:
+                try:
+                    step()
+                except Exception:
+                    return name, traceback.format_exc()
+
+        return None
+
+
+def macro_steps(macro, scripts):
+    """
+    finds the buttons the steps of a macro run
+    :param macro: list(list(str, str)), the library path of the script and the tab of the button of every step
+    :param scripts: dict, library path to the Script of every loaded script
+    :return: tuple(list(tuple(Script, ButtonTab)), list(str)), the script and button of every step that was found,
+             and a description of every step that wasn't
+    """
+    found = []
+    missing = []
+    for script_path, tab in macro:
+        script = scripts.get(script_path)
+        button = script.button_tab(tab) if script is not None else None
+        if button is None:
+            missing.append('%s on %s' % (script_path, tab))
+        else:
+            found.append((script, button))
+
+    return found, missing
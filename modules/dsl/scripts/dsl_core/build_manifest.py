@@ -0,0 +1,90 @@
+"""Writes the manifest of one or more libraries, meant to run on a schedule or after publishing scripts
+
+usage, from the dsl scripts folder or with it on the PYTHONPATH (no maya needed):
+    python -m dsl_core.build_manifest /studio/dsl/department /studio/dsl/show --threads 8
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from .index import ScriptIndex
+from .manifest import Manifest, list_entries
+from .scan import LibraryScanner, report_broken_headers
+
+
+def build_manifest(root, scan_threads=0, scan_processes=False):
+    """
+    scan a library and write its manifest, scripts that didn't change since the last manifest aren't read again
+    :param root: str, the library folder
+    :param scan_threads: int, threads used to list folders and read headers
+    :param scan_processes: bool, read headers in a pool of processes
+    :return: Manifest, the manifest that was written
+    """
+
+    # the previous manifest stands in for the script index so only changed scripts are opened
+    script_index = ScriptIndex(None)
+    script_index.entries = {}
+    previous = Manifest.load(root)
+    if previous is not None:
+        for file_path, mtime, size in previous.script_files:
+            script_index.entries[file_path] = {'mtime': mtime, 'size': size, 'script': previous.records[file_path]}
+
+    scanner = LibraryScanner(root, script_index, scan_threads, scan_processes)
+    try:
+        scanner.list_files()
+        scripts = [script for batch in scanner.iter_scripts() for script in batch]
+    finally:
+        scanner.close()
+    report_broken_headers(scripts)
+
+    scanned_paths = set(script.file_path for script in scripts)
+    folder_entries = []
+    for folder in scanner.script_folders:
+        entries = list_entries(folder)
+        folder_path = folder.replace('\\', '/').rstrip('/')
+        listed_paths = set('%s/%s' % (folder_path, entry) for entry in entries
+                           if entry.endswith('.py') or entry.endswith('.mel'))
+        if listed_paths != set(path for path in scanned_paths if os.path.dirname(path) == folder_path):
+            # the folder changed while it was being scanned, let the next load see the manifest as stale
+            print('%s changed during the build, it will be scanned until the next build' % folder)
+            entries = None
+        folder_entries.append(entries)
+
+    manifest = Manifest.from_scanner(scanner, scripts, folder_entries)
+    manifest.save()
+
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write the dsl manifest of script libraries')
+    parser.add_argument('roots', nargs='+', help='library folders to index')
+    parser.add_argument('--threads', type=int, default=8, help='threads used to list folders and read headers')
+    parser.add_argument('--processes', action='store_true', help='read headers in a pool of processes')
+    parser.add_argument('--check', action='store_true', help="only report whether the manifests are up to date")
+    args = parser.parse_args(argv)
+
+    exit_code = 0
+    for root in args.roots:
+        if args.check:
+            manifest = Manifest.load(root)
+            stale = manifest is None or manifest.is_stale()
+            print('%s %s' % (root, 'is stale' if stale else 'is up to date'))
+            if manifest is not None:
+                for path in manifest.edited_scripts():
+                    print('    edited: %s' % path)
+            exit_code = exit_code or int(stale)
+            continue
+
+        start_time = time.time()
+        manifest = build_manifest(root, args.threads, args.processes)
+        print('%s: %s scripts in %s folders, %.2fs' % (root, len(manifest.scripts), len(manifest.folders),
+                                                      time.time() - start_time))
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
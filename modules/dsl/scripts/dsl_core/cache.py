@@ -0,0 +1,63 @@
+"""A small least recently used cache"""
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Keeps the most recently used values up to a limit, the oldest values are evicted first
+    """
+
+    def __init__(self, limit):
+        self.entries = OrderedDict()
+        self.limit = limit
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+
+        value = self.entries.pop(key)
+        self.entries[key] = value
+        return value
+
+    def pop(self, key, default=None):
+        return self.entries.pop(key, default)
+
+    def put(self, key, value):
+        """
+        :param key: the key to store the value under
+        :param value: the value, it becomes the most recently used one
+        :return: list, the values that were evicted to make room
+        """
+        self.entries.pop(key, None)
+        self.entries[key] = value
+        return self.trim()
+
+    def set_limit(self, limit):
+        """
+        :param limit: int, how many values to keep, 0 keeps none
+        :return: list, the values that were evicted by the new limit
+        """
+        self.limit = limit
+        return self.trim()
+
+    def trim(self):
+        evicted = []
+        while len(self.entries) > max(self.limit, 0):
+            evicted.append(self.entries.popitem(last=False)[1])
+
+        return evicted
+
+    def clear(self):
+        """
+        :return: list, every value that was in the cache
+        """
+        values = list(self.entries.values())
+        self.entries.clear()
+        return values
@@ -0,0 +1,43 @@
+"""Keeps track of the buttons that claim the same tab and line"""
+
+
+class SlotClaims(object):
+    """
+    Every script claims a line on each of its tabs, the first script to claim a line gets it
+    and the others wait for it to free up
+    """
+
+    def __init__(self):
+        self.claims = {}
+
+    def claim(self, script):
+        """
+        :param script: Script, a script that is getting its buttons
+        :return: list(tuple(str, int)), the tab and line of every slot the script couldn't get
+        """
+        taken = []
+        for button in script.button_tabs:
+            slot = (button.tab, button.line)
+            claims = self.claims.setdefault(slot, [])
+            if claims:
+                taken.append(slot)
+            claims.append(script)
+
+        return taken
+
+    def release(self, file_path):
+        """
+        :param file_path: str, path of a script whose buttons were removed
+        """
+        for slot, claims in list(self.claims.items()):
+            claims[:] = [script for script in claims if script.file_path != file_path]
+            if not claims:
+                del self.claims[slot]
+
+    def conflicts(self):
+        """
+        :return: list(tuple(str, int, list(Script))), the tab, line and scripts of every slot claimed more than
+                 once, the first script is the one that got it
+        """
+        conflicts = [(tab, line, scripts) for (tab, line), scripts in self.claims.items() if len(scripts) > 1]
+        return sorted(conflicts, key=lambda conflict: (conflict[0], conflict[1] or 0))
@@ -0,0 +1,58 @@
+"""File helpers shared by the parts of dsl that write to disk"""
+
+import os
+import sys
+import json
+import tempfile
+
+
+def replace_file(source, destination):
+    """
+    moves a file over another one in a single step, readers see either the old file or the new one
+    :param source: str, the file to move
+    :param destination: str, the file to replace
+    """
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+        return
+
+    # python 2 can't rename over an existing file on windows
+    if sys.platform == 'win32' and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
+
+
+def write_atomic(file_path, write_function, mode='w'):
+    """
+    writes to a temporary file next to the target and moves it into place once it is complete
+    :param file_path: str, the file to write
+    :param write_function: callable, takes the open temporary file and writes the contents
+    :param mode: str, 'w' for text, 'wb' for bytes
+    """
+    folder = os.path.dirname(os.path.abspath(file_path))
+    handle, temp_path = tempfile.mkstemp(prefix='%s.' % os.path.basename(file_path), suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(handle, mode) as write_file:
+            write_function(write_file)
+        replace_file(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_json(file_path, data, indent=None):
+    """
+    :param file_path: str, the file to write
+    :param data: the data to write
+    :param indent: int, indentation of the json, None writes it compactly
+    """
+    write_atomic(file_path, lambda write_file: json.dump(data, write_file, indent=indent))
+
+
+def write_bytes(file_path, data):
+    """
+    :param file_path: str, the file to write
+    :param data: bytes, the contents of the file
+    """
+    write_atomic(file_path, lambda write_file: write_file.write(data), 'wb')
@@ -0,0 +1,156 @@
+"""Reads the dsl comment block at the top of python and mel scripts"""
+
+import io
+import re
+from collections import namedtuple
+from itertools import islice
+
+# how far into a file we look for the start of a dsl block
+MAX_HEADER_LINES = 20
+
+# a runaway block stops being read here
+MAX_READ_LINES = 1000
+
+KEYS = 'button|tab|color|description|help|suspend_refresh'
+KEY_PATTERN = re.compile(r'dsl_(%s):[ \t]*(.*)' % KEYS)
+TAB_PATTERN = re.compile(r'(.*):(\d*):(.*)')
+COLOR_PATTERN = re.compile(r'#?\w*')
+
+# notes such as "# author: me" can sit between the keys, any other line ends the block
+COMMENT_PREFIXES = ('#', '//')
+
+REQUIRED_KEYS = ('button', 'color', 'description')
+
+# what dsl_suspend_refresh takes for yes
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+HeaderError = namedtuple('HeaderError', ['line', 'key', 'message'])
+
+# where a button sits on one of its tabs, line is None when the header left it out
+ButtonTab = namedtuple('ButtonTab', ['tab', 'line', 'command'])
+
+
+class Header(object):
+    """
+    The info collected from a dsl block
+    """
+
+    def __init__(self):
+        self.button_name = None
+        self.button_color = None
+        self.button_description = None
+        self.help_lines = []
+        self.button_tabs = []
+        self.suspend_refresh = False
+        self.errors = []
+        self.has_header = False
+
+    @property
+    def button_help(self):
+        return '\n'.join(self.help_lines)
+
+    @property
+    def is_valid(self):
+        return None not in (self.button_name, self.button_color, self.button_description)
+
+    def add_error(self, line, key, message):
+        self.errors.append(HeaderError(line, key, message))
+
+
+def parse_lines(lines, max_lines=MAX_HEADER_LINES):
+    """
+    collect every dsl key in a single pass, stopping at the first line after the dsl block
+    :param lines: iterable(str), the lines of a script with their line endings
+    :param max_lines: int, how many lines to search for the start of the block
+    :return: Header, the parsed header
+    """
+    header = Header()
+    in_block = False
+    tab_positions = {}
+    for line_number, line in enumerate(islice(lines, MAX_READ_LINES), 1):
+        if in_block:
+            stripped = line.lstrip()
+            if stripped.startswith(COMMENT_PREFIXES):
+                key = KEY_PATTERN.search(stripped) if 'dsl_' in stripped else None
+            elif stripped:
+                key = KEY_PATTERN.match(stripped)
+                if key is None:
+                    break
+            else:
+                key = None
+        elif line_number > max_lines:
+            break
+        else:
+            key = KEY_PATTERN.search(line) if 'dsl_' in line else None
+            in_block = key is not None
+
+        if key is None:
+            continue
+
+        key, value = key.groups()
+        if key == 'help':
+            header.help_lines.append(value)
+        elif key == 'tab':
+            # a button can appear in multiple tabs and preform multiple actions
+            tab = TAB_PATTERN.match(value)
+            if tab is None:
+                header.add_error(line_number, 'tab', 'expected tab:line:command, got "%s"' % value.strip())
+                continue
+
+            tab_name, tab_line, command = tab.groups()
+            button_tab = ButtonTab(tab_name, int(tab_line) if tab_line else None, command.strip())
+            if tab_name in tab_positions:
+                # the last line naming a tab wins, at the place of the first one
+                header.button_tabs[tab_positions[tab_name]] = button_tab
+            else:
+                tab_positions[tab_name] = len(header.button_tabs)
+                header.button_tabs.append(button_tab)
+        elif key == 'button':
+            if header.button_name is None:
+                header.button_name = value
+        elif key == 'color':
+            if header.button_color is None:
+                header.button_color = COLOR_PATTERN.match(value).group(0)
+        elif key == 'suspend_refresh':
+            # heavy tools can ask for the viewport to stay still while they run
+            header.suspend_refresh = value.strip().lower() in TRUE_VALUES
+        elif header.button_description is None:
+            header.button_description = value
+
+    header.has_header = in_block
+    if not in_block:
+        header.add_error(None, None, 'no dsl header found')
+        return header
+
+    for key, value in zip(REQUIRED_KEYS, (header.button_name, header.button_color, header.button_description)):
+        if value is None:
+            header.add_error(None, key, 'missing dsl_%s' % key)
+
+    return header
+
+
+def parse_header(text, max_lines=MAX_HEADER_LINES):
+    """
+    :param text: str, the start of a script, anything after the dsl block is ignored
+    :param max_lines: int, how many lines to search for the start of the block
+    :return: Header, the parsed header
+    """
+    # lines are split off as they are needed, the block usually ends long before the text does
+    return parse_lines((io.StringIO if isinstance(text, type(u'')) else io.BytesIO)(text), max_lines)
+
+
+def read_header(file_path, max_lines=MAX_HEADER_LINES):
+    """
+    reads and parses the dsl block of a script, the file is only read until the block ends
+    :param file_path: str, path to the script
+    :param max_lines: int, how many lines to search for the start of the block
+    :return: Header, the parsed header, with an error when the script can't be read or decoded
+    """
+    try:
+        with open(file_path) as target_script:
+            return parse_lines(target_script, max_lines)
+    except (IOError, ValueError) as e:
+        # a script saved in another encoding only loses its own button, not the whole scan
+        header = Header()
+        header.add_error(None, None, 'unable to read the script: %s' % e)
+        return header
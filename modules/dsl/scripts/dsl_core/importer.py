@@ -0,0 +1,185 @@
+"""A sys.meta_path finder that imports library scripts straight from the folders the scanner found them in"""
+
+import os
+import sys
+import sysconfig
+
+try:
+    from importlib.machinery import PathFinder, all_suffixes
+    MODULE_SUFFIXES = set(all_suffixes())
+except ImportError:
+    # python 2 uses the older find_module/load_module protocol
+    import imp
+    import zipimport
+    PathFinder = None
+    MODULE_SUFFIXES = set(suffix for suffix, _, _ in imp.get_suffixes())
+
+
+def normalize_folder(folder):
+    return os.path.normcase(os.path.abspath(folder or '.'))
+
+
+def stdlib_names():
+    """
+    :return: set(str), the modules that ship with python, a library script must never shadow these
+    """
+    names = set(sys.builtin_module_names)
+    stdlib = sysconfig.get_paths()['stdlib']
+    for folder in (stdlib, os.path.join(stdlib, 'lib-dynload')):
+        try:
+            entries = os.listdir(folder)
+        except OSError:
+            continue
+        names.update(entry.split('.')[0] for entry in entries)
+
+    return names
+
+
+def module_folder(module):
+    """
+    :param module: module, a loaded module
+    :return: str, the normalized folder the module was imported from, None for modules without a file
+    """
+    module_file = getattr(module, '__file__', None)
+    if not module_file:
+        return None
+
+    folder = os.path.dirname(module_file)
+    if os.path.basename(module_file).startswith('__init__.'):
+        folder = os.path.dirname(folder)
+
+    return normalize_folder(folder)
+
+
+# the names importable from each sys.path entry, only the listing of the current sys.path is kept so the folders
+# aren't listed again on every scan
+path_listings = {}
+
+
+def list_path():
+    """
+    :return: list(tuple(str, str, set(str))), the normalized folder, the entry and the importable names of every
+             sys.path entry, the names are None for zipped libraries
+    """
+    path = tuple(sys.path)
+    listings = path_listings.get(path)
+    if listings is not None:
+        return listings
+
+    listings = []
+    for entry in path:
+        folder = normalize_folder(entry)
+        if os.path.isdir(folder):
+            try:
+                entries = os.listdir(folder)
+            except OSError:
+                continue
+            # modules, packages and namespace folders
+            listings.append((folder, entry, set(name.split('.')[0] for name in entries
+                                                if '.' not in name or os.path.splitext(name)[1] in MODULE_SUFFIXES)))
+        elif os.path.isfile(folder):
+            listings.append((folder, entry, None))
+
+    path_listings.clear()
+    path_listings[path] = listings
+    return listings
+
+
+def found_outside(modules):
+    """
+    the library's finder runs before the one for sys.path, so a script named after a site-packages or maya module
+    would take its place. Those names are left to sys.path, as if the library folders came last on it
+    :param modules: dict, module name to the folder holding it, as found by the scanner
+    :return: set(str), the names that are already loaded, or importable from a folder that isn't the library's
+    """
+    names = set(modules)
+    library_folders = set(normalize_folder(folder) for folder in modules.values())
+    found = set()
+
+    # loaded modules, leaving out the ones the library loaded itself
+    for name in names:
+        if name in sys.modules and module_folder(sys.modules[name]) != normalize_folder(modules[name]):
+            found.add(name)
+
+    for folder, entry, folder_names in list_path():
+        if folder in library_folders:
+            continue
+
+        if folder_names is not None:
+            found.update(names.intersection(folder_names))
+        else:
+            # zipped libraries, such as the python27.zip some maya versions ship with
+            for name in names - found:
+                if find_in_archive(name, entry):
+                    found.add(name)
+
+    return found
+
+
+def find_in_archive(name, archive):
+    """
+    :param name: str, a top level module name
+    :param archive: str, a zip file on sys.path
+    :return: bool, True if the module can be imported from the archive
+    """
+    try:
+        if PathFinder is not None:
+            return PathFinder.find_spec(name, [archive]) is not None
+        return zipimport.zipimporter(archive).find_module(name) is not None
+    except (ImportError, OSError):
+        return False
+
+
+class LibraryFinder(object):
+    """
+    Maps the module names of a library to the folders they live in,
+    an import of a library script is a dict lookup instead of a walk over every folder on sys.path
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.protected_names = None
+
+    def install(self):
+        # library scripts are looked up before anything on sys.path, what sys.path has is protected from shadowing
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def set_modules(self, modules):
+        """
+        :param modules: dict, module name to the folder holding its .py file or package
+        """
+        if self.protected_names is None:
+            self.protected_names = stdlib_names()
+
+        # sys.path and sys.modules change along the session, they are checked again on every update
+        protected_names = self.protected_names | found_outside(modules)
+        self.modules = dict((name, folder) for name, folder in modules.items() if name not in protected_names)
+
+    def find_spec(self, fullname, path=None, target=None):
+        # only top level names belong to us, submodules of library packages are found through the package
+        folder = self.modules.get(fullname) if path is None else None
+        if folder is None:
+            return None
+
+        return PathFinder.find_spec(fullname, [folder], target)
+
+    def find_module(self, fullname, path=None):
+        if PathFinder is not None or path is not None or fullname not in self.modules:
+            return None
+
+        return self
+
+    def load_module(self, fullname):
+        import imp
+
+        found = imp.find_module(fullname, [self.modules[fullname]])
+        try:
+            return imp.load_module(fullname, *found)
+        finally:
+            if found[0]:
+                found[0].close()
@@ -0,0 +1,108 @@
+"""A persistent cache of parsed script headers"""
+
+import os
+import json
+import threading
+from functools import partial
+
+from .files import write_json
+from .script import Script, read_script_record
+
+
+class ScriptIndex(object):
+    """
+    A persistent cache of parsed script headers, keyed by path and validated by the file's mtime and size
+    """
+
+    version = 6
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.entries = None
+        self.dirty = False
+
+        # a cancelled scan wraps up on its own thread while the next one already reads the index
+        self.lock = threading.RLock()
+
+    def load(self):
+        """
+        read the index from disk, an unreadable or outdated index is treated as empty
+        """
+        with self.lock:
+            self.entries = {}
+            self.dirty = False
+            if os.path.isfile(self.index_file):
+                try:
+                    with open(self.index_file, 'r') as read_file:
+                        data = json.load(read_file)
+
+                    if data.get('version') == self.version:
+                        self.entries = data.get('scripts', {})
+                except (IOError, ValueError) as e:
+                    print('unable to read the script index %s' % e)
+
+    def save(self):
+        """
+        write the index to disk if anything changed since it was loaded
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+
+            try:
+                # written aside and moved into place, two maya sessions saving at once can't leave half an index
+                write_json(self.index_file, {'version': self.version, 'scripts': self.entries})
+                self.dirty = False
+            except (IOError, OSError) as e:
+                print('unable to save the script index %s' % e)
+
+    def get_scripts(self, script_files, parse_function=None):
+        """
+        returns the scripts for the given files, only reading the headers of files that changed since they were indexed
+        :param script_files: list(tuple(str, float, int)), the path, mtime and size of every script file
+        :param parse_function: callable, takes a list of paths and returns their records, lets the caller
+                               spread the header reads over a pool
+        :return: list(Script), the script objects in the same order as the files
+        """
+        with self.lock:
+            if self.entries is None:
+                self.load()
+
+            records = {}
+            stale_files = []
+            for file_path, mtime, size in script_files:
+                entry = self.entries.get(file_path)
+                if entry is None or entry['mtime'] != mtime or entry['size'] != size:
+                    stale_files.append((file_path, mtime, size))
+                else:
+                    records[file_path] = entry['script']
+
+        if stale_files:
+            # the headers are read outside of the lock, another scan can use the index meanwhile
+            if parse_function is None:
+                parse_function = partial(map, read_script_record)
+            stale_records = parse_function([file_path for file_path, _, _ in stale_files])
+            with self.lock:
+                for (file_path, mtime, size), record in zip(stale_files, stale_records):
+                    self.entries[file_path] = {'mtime': mtime, 'size': size, 'script': record}
+                    records[file_path] = record
+                self.dirty = True
+
+        return [Script.from_record(file_path, records[file_path], (mtime, size))
+                for file_path, mtime, size in script_files]
+
+    def prune(self, root, found_paths):
+        """
+        drop the entries of a library root that no longer exist on disk
+        :param root: str, the library folder that was scanned
+        :param found_paths: set(str), all of the script paths found in the last scan of the root
+        """
+        with self.lock:
+            if self.entries is None:
+                self.load()
+
+            root = root.replace('\\', '/').rstrip('/') + '/'
+            for file_path in list(self.entries.keys()):
+                if file_path.startswith(root) and file_path not in found_paths:
+                    del self.entries[file_path]
+                    self.dirty = True
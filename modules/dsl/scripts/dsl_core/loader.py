@@ -0,0 +1,296 @@
+"""Imports library scripts and runs their commands, a module is only reloaded when its file changed on disk
+
+mel scripts get the same treatment, a file is only sourced again once it changed
+"""
+
+import os
+import re
+import ast
+import sys
+import hashlib
+import importlib
+
+try:
+    from importlib import reload as reload_module
+except ImportError:
+    # python 2
+    reload_module = reload
+
+
+def file_hash(file_path):
+    """
+    :param file_path: str, path to a file
+    :return: str, the md5 of the file's contents
+    """
+    with open(file_path, 'rb') as read_file:
+        return hashlib.md5(read_file.read()).hexdigest()
+
+
+class LoadedModule(object):
+    """
+    A module loaded by the loader and the state of its file when it was loaded
+    """
+
+    def __init__(self, module, file_path, mtime, size, source_hash):
+        self.module = module
+        self.file_path = file_path
+        self.mtime = mtime
+        self.size = size
+        self.source_hash = source_hash
+
+        # commands parsed for this version of the module
+        self.commands = {}
+
+
+class ModuleLoader(object):
+    """
+    Caches the modules of library scripts along with the callables their buttons run
+    """
+
+    def __init__(self):
+        self.modules = {}
+
+    def load(self, module_name, file_path):
+        """
+        returns the module of a script, importing it the first time and reloading it once its file changed
+        :param module_name: str, the module name of the script
+        :param file_path: str, path to the script
+        :return: tuple(LoadedModule, bool), the loaded module and whether it was (re)executed by this call
+        """
+        file_stat = os.stat(file_path)
+        loaded = self.modules.get(module_name)
+
+        if loaded is not None and sys.modules.get(module_name) is loaded.module:
+            if (loaded.mtime, loaded.size) == (file_stat.st_mtime, file_stat.st_size):
+                return loaded, False
+
+            # a save without changes, or a checkout that only touched the mtime, doesn't need a reload
+            source_hash = file_hash(file_path)
+            if source_hash == loaded.source_hash:
+                loaded.mtime, loaded.size = file_stat.st_mtime, file_stat.st_size
+                return loaded, False
+        else:
+            source_hash = file_hash(file_path)
+
+        if module_name in sys.modules:
+            # imported outside of the loader, or an outdated copy we have to refresh
+            module = reload_module(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
+
+        loaded = LoadedModule(module, file_path, file_stat.st_mtime, file_stat.st_size, source_hash)
+        self.modules[module_name] = loaded
+
+        return loaded, True
+
+    def reload(self, module_name, file_path):
+        """
+        executes a script's module no matter if it changed, for scripts whose import is the action
+        :param module_name: str, the module name of the script
+        :param file_path: str, path to the script
+        :return: LoadedModule, the loaded module
+        """
+        loaded, executed = self.load(module_name, file_path)
+        if not executed:
+            loaded.module = reload_module(loaded.module)
+            loaded.commands = {}
+
+        return loaded
+
+    def run(self, module_name, command, file_path):
+        """
+        runs the command of a python script
+        :param module_name: str, the module name of the script
+        :param command: str, the command to run such as main() or ui.show('x'), scripts without a command are
+                        executed from scratch every time just like an import would
+        :param file_path: str, path to the script
+        :return: the value the command returned
+        """
+        if not command:
+            self.reload(module_name, file_path)
+            return None
+
+        loaded, _ = self.load(module_name, file_path)
+
+        resolved = loaded.commands.get(command)
+        if resolved is None:
+            resolved = loaded.commands[command] = resolve_command(loaded.module, command)
+
+        return resolved()
+
+    def forget(self, module_name):
+        self.modules.pop(module_name, None)
+
+
+# global proc string[] name( with an optional return type
+MEL_PROC = re.compile(r'global\s+proc\s+(?:[\w\[\]]+\s+)?(\w+)\s*\(')
+
+
+class SourcedFile(object):
+    """
+    A mel file sourced by the sourcer, the state of the file when it was sourced and the procedures it declares
+    """
+
+    def __init__(self, file_path, mtime, size, source_hash, procedures):
+        self.file_path = file_path
+        self.mtime = mtime
+        self.size = size
+        self.source_hash = source_hash
+        self.procedures = procedures
+
+
+class MelSourcer(object):
+    """
+    Sources mel scripts and runs their commands, maya keeps the procedures of a sourced file around so a file is
+    only sourced again when it changed or when another file redefined one of its procedures
+    """
+
+    def __init__(self, evaluate):
+        """
+        :param evaluate: callable, runs a string of mel and returns its result, maya.mel.eval in maya
+        """
+        self.evaluate = evaluate
+        self.sourced = {}
+
+        # the file that last defined each global procedure
+        self.procedure_owners = {}
+
+    def is_current(self, file_path):
+        """
+        :param file_path: str, path to a mel script
+        :return: bool, True if the procedures maya has for the file are the ones it holds now
+        """
+        sourced = self.sourced.get(file_path)
+        if sourced is None:
+            return False
+
+        if any(self.procedure_owners.get(procedure) != file_path for procedure in sourced.procedures):
+            return False
+
+        file_stat = os.stat(file_path)
+        if (sourced.mtime, sourced.size) == (file_stat.st_mtime, file_stat.st_size):
+            return True
+
+        # a save without changes doesn't need sourcing again
+        if file_hash(file_path) == sourced.source_hash:
+            sourced.mtime, sourced.size = file_stat.st_mtime, file_stat.st_size
+            return True
+
+        return False
+
+    def source(self, file_path, force=False):
+        """
+        source a mel script unless maya already has its current version
+        :param file_path: str, path to the script
+        :param force: bool, source it no matter what
+        :return: bool, True if the file was sourced by this call
+        """
+        if not force and self.is_current(file_path):
+            return False
+
+        file_stat = os.stat(file_path)
+        with open(file_path, 'rb') as read_file:
+            data = read_file.read()
+        procedures = MEL_PROC.findall(data.decode('utf-8', 'replace'))
+
+        self.evaluate('source "%s"' % file_path.replace('\\', '/'))
+
+        self.sourced[file_path] = SourcedFile(file_path, file_stat.st_mtime, file_stat.st_size,
+                                              hashlib.md5(data).hexdigest(), procedures)
+        for procedure in procedures:
+            self.procedure_owners[procedure] = file_path
+
+        return True
+
+    def run(self, command, file_path):
+        """
+        runs the command of a mel script, sourcing the script first if needed
+        :param command: str, the mel to run, scripts without a command are sourced every time
+        :param file_path: str, path to the script
+        :return: the value the command returned
+        """
+        if not command:
+            self.source(file_path, force=True)
+            return None
+
+        self.source(file_path)
+        return self.evaluate(command)
+
+    def forget(self, file_path=None):
+        """
+        :param file_path: str, a script to source again on its next run, every script if None
+        """
+        if file_path is None:
+            self.sourced.clear()
+            self.procedure_owners.clear()
+        else:
+            self.sourced.pop(file_path, None)
+
+
+def resolve_command(module, command):
+    """
+    turns a command into a callable bound to the module, plain calls with literal arguments are parsed once and
+    call the function directly, anything fancier is compiled once and evaluated in the module's namespace. The
+    function is looked up on every call so a name the module rebinds later is picked up, like exec would
+    :param module: module, the module the command belongs to
+    :param command: str, the command as written in the dsl header
+    :return: callable, runs the command and returns its result
+    """
+    try:
+        expression = ast.parse(command.strip(), mode='eval').body
+    except SyntaxError:
+        expression = None
+
+    # python 2 keeps *args and **kwargs apart from the other arguments
+    if isinstance(expression, ast.Call) and not (getattr(expression, 'starargs', None) or
+                                                 getattr(expression, 'kwargs', None)):
+        attributes = attribute_chain(expression.func)
+        arguments = expression.args + [keyword.value for keyword in expression.keywords]
+        names = [keyword.arg for keyword in expression.keywords]
+        if attributes and None not in names and all(is_literal(node) for node in arguments):
+            positional = len(expression.args)
+
+            def call():
+                function = module
+                for attribute in attributes:
+                    function = getattr(function, attribute)
+
+                # literals are rebuilt on every call so a command can't see a list changed by the previous click
+                values = [ast.literal_eval(node) for node in arguments]
+                return function(*values[:positional], **dict(zip(names, values[positional:])))
+
+            return call
+
+    # the command used to be executed as module.command, keep supporting whatever that allowed
+    code = compile('%s.%s' % (module.__name__, command.strip()), '<dsl command>', 'exec')
+    return lambda: execute(code, {module.__name__: module})
+
+
+def is_literal(node):
+    try:
+        ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return False
+
+    return True
+
+
+def attribute_chain(node):
+    """
+    :param node: ast.AST, a name or a chain of attributes such as ui.show
+    :return: list(str), the names to look up one after the other starting from the module, None if the node
+             isn't a plain name lookup
+    """
+    if isinstance(node, ast.Name):
+        return [node.id]
+
+    if isinstance(node, ast.Attribute):
+        owner = attribute_chain(node.value)
+        if owner is not None:
+            return owner + [node.attr]
+
+    return None
+
+
+def execute(code, namespace):
+    exec(code, namespace)
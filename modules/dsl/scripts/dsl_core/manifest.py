@@ -0,0 +1,168 @@
+"""A single file at the root of a library holding the parsed headers of all of its scripts
+
+reading it replaces listing every folder and opening every script, which is what hurts on a busy file server
+"""
+
+import os
+import json
+import time
+
+from .script import Script
+from .files import write_json
+
+MANIFEST_FILE = '.dsl_manifest.json'
+
+# file systems and platforms round mtimes differently, a folder only counts as changed past this many seconds
+MTIME_TOLERANCE = 1.0
+
+
+def relative_path(root, path):
+    relative = os.path.relpath(path, root).replace('\\', '/')
+    return '' if relative == '.' else relative
+
+
+# python writes bytecode next to the scripts the first time they are imported, it says nothing about the library
+BYTECODE_FOLDER = '__pycache__'
+BYTECODE_SUFFIXES = ('.pyc', '.pyo')
+
+
+def list_entries(folder):
+    """
+    :param folder: str, a folder of the library
+    :return: list(str), the sorted names in the folder, leaving out the manifest, its temporary files and bytecode
+    """
+    return sorted(entry for entry in os.listdir(folder) if not entry.startswith(MANIFEST_FILE)
+                  and entry != BYTECODE_FOLDER and not entry.endswith(BYTECODE_SUFFIXES))
+
+
+class Manifest(object):
+    """
+    The folders, scripts and packages of a library as they were when the manifest was built,
+    paths are stored relative to the library so one manifest serves every machine whatever the share is mounted as
+    """
+
+    version = 5
+
+    def __init__(self, root, folders, scripts, packages, generated=None):
+        """
+        :param root: str, the library folder
+        :param folders: list(tuple(str, list(str))), every script folder relative to the root and the names in it
+                        as listed by list_entries, None for a folder that changed while the manifest was built
+        :param scripts: list(tuple(str, float, int, dict)), every script relative to the root, its mtime, size
+                        and record
+        :param packages: list(str), the python packages relative to the root
+        :param generated: float, when the manifest was built
+        """
+        self.root = root.replace('\\', '/')
+        self.folders = folders
+        self.scripts = scripts
+        self.packages = packages
+        self.generated = generated or time.time()
+
+        self.records = dict((self.absolute(path), record) for path, _, _, record in scripts)
+
+    def absolute(self, path):
+        return '%s/%s' % (self.root.rstrip('/'), path) if path else self.root
+
+    @classmethod
+    def manifest_path(cls, root):
+        return os.path.join(root, MANIFEST_FILE)
+
+    @classmethod
+    def from_scanner(cls, scanner, scripts, folder_entries):
+        """
+        :param scanner: LibraryScanner, a scanner that listed the library
+        :param scripts: list(Script), the scripts the scanner read, in the order they were listed
+        :param folder_entries: list(list(str)), the names in each of the scanner's script folders
+        :return: Manifest, the manifest of the library
+        """
+        root = scanner.root
+        folders = [(relative_path(root, folder), entries)
+                   for folder, entries in zip(scanner.script_folders, folder_entries)]
+        records = [(relative_path(root, script.file_path), script.stamp[0], script.stamp[1], script.to_record())
+                   for script in scripts]
+        packages = [relative_path(root, package) for package in scanner.packages]
+
+        return cls(root, folders, records, packages)
+
+    @classmethod
+    def load(cls, root):
+        """
+        :param root: str, the library folder
+        :return: Manifest, the manifest of the library, None if there isn't a readable one of this version
+        """
+        manifest_path = cls.manifest_path(root)
+        if not os.path.isfile(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path, 'r') as read_file:
+                data = json.load(read_file)
+        except (IOError, ValueError) as e:
+            print('unable to read the manifest of %s %s' % (root, e))
+            return None
+
+        if data.get('version') != cls.version:
+            return None
+
+        return cls(root, data['folders'], data['scripts'], data['packages'], data.get('generated'))
+
+    def save(self):
+        write_json(self.manifest_path(self.root), {'version': self.version,
+                                                   'generated': self.generated,
+                                                   'folders': self.folders,
+                                                   'scripts': self.scripts,
+                                                   'packages': self.packages})
+
+    def is_stale(self):
+        """
+        one listing per folder tells if scripts or packages were added or removed since the manifest was built,
+        then every script is stat'ed to catch the ones edited in place. Listings are compared rather than folder
+        mtimes since importing a script writes bytecode into its folder
+        :return: bool, True if the manifest no longer matches the library
+        """
+        try:
+            for folder, entries in self.folders:
+                if entries is None or list_entries(self.absolute(folder)) != entries:
+                    return True
+        except OSError:
+            return True
+
+        return bool(self.edited_scripts())
+
+    def edited_scripts(self):
+        """
+        :return: list(str), relative paths of the scripts whose mtime or size changed since the manifest was built
+        """
+        edited = []
+        for path, mtime, size, _ in self.scripts:
+            try:
+                file_stat = os.stat(self.absolute(path))
+            except OSError:
+                edited.append(path)
+                continue
+
+            if abs(file_stat.st_mtime - mtime) > MTIME_TOLERANCE or file_stat.st_size != size:
+                edited.append(path)
+
+        return edited
+
+    @property
+    def script_folders(self):
+        return [self.absolute(folder) for folder, _ in self.folders]
+
+    @property
+    def script_files(self):
+        return [(self.absolute(path), mtime, size) for path, mtime, size, _ in self.scripts]
+
+    @property
+    def package_paths(self):
+        return [self.absolute(package) for package in self.packages]
+
+    def get_scripts(self, script_files):
+        """
+        :param script_files: list(tuple(str, float, int)), files as listed by the manifest
+        :return: list(Script), the scripts, rebuilt from the manifest without touching the files
+        """
+        return [Script.from_record(file_path, self.records[file_path], (mtime, size))
+                for file_path, mtime, size in script_files]
@@ -0,0 +1,203 @@
+"""A local copy of a library, so scanning and running its scripts doesn't wait on the file server"""
+
+import os
+import json
+import hashlib
+
+from .files import write_json, write_bytes
+from .manifest import MANIFEST_FILE
+from .preferences import user_app_dir
+from .session import normalize_path
+
+MIRROR_FOLDER = 'dsl_mirrors'
+MIRROR_STATE_FILE = '.dsl_mirror.json'
+
+
+def mirror_folder(root):
+    """
+    :param root: str, a library folder
+    :return: str, where the library is mirrored, named after the library and a hash of its full path
+    """
+    root_hash = hashlib.md5(normalize_path(root).encode('utf-8')).hexdigest()[:10]
+    name = os.path.basename(root.replace('\\', '/').rstrip('/')) or 'library'
+    return os.path.join(user_app_dir(), MIRROR_FOLDER, '%s_%s' % (name, root_hash)).replace('\\', '/')
+
+
+def is_mirrored(name):
+    """
+    :param name: str, a file or folder name in the library
+    :return: bool, False for compiled files, the manifest and hidden folders, which have no use in the mirror
+    """
+    return not (name.startswith('.') or name.endswith('.pyc') or name == '__pycache__')
+
+
+class LibraryMirror(object):
+    """
+    Keeps a local folder in sync with a library, files are only copied when their mtime or size changed and
+    their contents differ from what was copied last time
+    """
+
+    version = 1
+
+    def __init__(self, root, local_root=None):
+        """
+        :param root: str, the library folder
+        :param local_root: str, the mirror folder, by default one in the user app dir
+        """
+        self.root = root.replace('\\', '/').rstrip('/')
+        self.local_root = (local_root or mirror_folder(root)).replace('\\', '/').rstrip('/')
+        self.state_file = os.path.join(self.local_root, MIRROR_STATE_FILE)
+
+        # relative path to the mtime, size and md5 of every file when it was copied
+        self.files = None
+
+    def is_synced(self):
+        """
+        :return: bool, True if the mirror was synced at least once and can be used
+        """
+        return os.path.isfile(self.state_file)
+
+    def owns(self, path):
+        return bool(path) and (normalize_path(path) + '/').startswith(normalize_path(self.local_root) + '/')
+
+    def local_path(self, path):
+        """
+        :param path: str, a file or folder in the library
+        :return: str, the same file or folder in the mirror
+        """
+        relative = os.path.relpath(path, self.root).replace('\\', '/')
+        return self.local_root if relative == '.' else '%s/%s' % (self.local_root, relative)
+
+    def source_path(self, path):
+        """
+        :param path: str, a file or folder in the mirror
+        :return: str, the same file or folder in the library, paths outside of the mirror are returned as they are
+        """
+        if not self.owns(path):
+            return path
+
+        relative = os.path.relpath(path, self.local_root).replace('\\', '/')
+        return self.root if relative == '.' else '%s/%s' % (self.root, relative)
+
+    def load_state(self):
+        self.files = {}
+        if not os.path.isfile(self.state_file):
+            return
+
+        try:
+            with open(self.state_file, 'r') as read_file:
+                data = json.load(read_file)
+            if data.get('version') == self.version:
+                self.files = data['files']
+        except (IOError, ValueError) as e:
+            print('unable to read the mirror state of %s %s' % (self.root, e))
+
+    def save_state(self):
+        # an empty library or a first copy that failed leaves no local folder to write the state into
+        if not os.path.isdir(self.local_root):
+            try:
+                os.makedirs(self.local_root)
+            except OSError:
+                if not os.path.isdir(self.local_root):
+                    raise
+        write_json(self.state_file, {'version': self.version, 'root': self.root, 'files': self.files})
+
+    def list_source(self):
+        """
+        :return: dict, relative path to the stat of every file in the library that belongs in the mirror
+        """
+        source_files = {}
+        for folder, folder_names, file_names in os.walk(self.root):
+            folder_names[:] = [name for name in folder_names if is_mirrored(name)]
+            for name in file_names:
+                if not is_mirrored(name) or name.startswith(MANIFEST_FILE):
+                    continue
+                file_path = os.path.join(folder, name)
+                try:
+                    source_files[os.path.relpath(file_path, self.root).replace('\\', '/')] = os.stat(file_path)
+                except OSError:
+                    # deleted while walking
+                    continue
+
+        return source_files
+
+    def sync(self, force=False, cancelled=None):
+        """
+        bring the mirror up to date with the library
+        :param force: bool, read every file of the library again instead of trusting the mtimes and sizes
+        :param cancelled: callable, returns True when the sync should stop, what was copied so far is kept
+        :return: tuple(int, int), the number of files copied and removed
+        """
+        if not os.path.isdir(self.root):
+            # an unreachable share would look like an empty library and wipe the mirror
+            raise IOError('the library %s is not reachable' % self.root)
+
+        if self.files is None or force:
+            self.load_state()
+
+        copied = removed = 0
+        try:
+            source_files = self.list_source()
+
+            for relative, source_stat in sorted(source_files.items()):
+                if cancelled is not None and cancelled():
+                    return copied, removed
+
+                local_path = '%s/%s' % (self.local_root, relative)
+                known = self.files.get(relative)
+                if (not force and known is not None and known[:2] == [source_stat.st_mtime, source_stat.st_size]
+                        and os.path.isfile(local_path)):
+                    continue
+
+                if self.copy(relative, source_stat, force):
+                    copied += 1
+
+            for relative in set(self.files) - set(source_files):
+                local_path = '%s/%s' % (self.local_root, relative)
+                if os.path.isfile(local_path):
+                    os.remove(local_path)
+                    removed += 1
+                del self.files[relative]
+            self.remove_empty_folders()
+        finally:
+            self.save_state()
+
+        return copied, removed
+
+    def copy(self, relative, source_stat, force=False):
+        """
+        copy one file into the mirror, the local file keeps the mtime of the original
+        :param relative: str, path of the file relative to the library
+        :param source_stat: os.stat_result, the stat of the original file
+        :param force: bool, compare with the local file itself instead of what was recorded when it was copied
+        :return: bool, False if the contents hadn't changed and nothing was written
+        """
+        source_path = '%s/%s' % (self.root, relative)
+        local_path = '%s/%s' % (self.local_root, relative)
+        with open(source_path, 'rb') as read_file:
+            data = read_file.read()
+        data_hash = hashlib.md5(data).hexdigest()
+
+        if force and os.path.isfile(local_path):
+            with open(local_path, 'rb') as read_file:
+                local_hash = hashlib.md5(read_file.read()).hexdigest()
+        else:
+            known = self.files.get(relative)
+            local_hash = known[2] if known is not None and os.path.isfile(local_path) else None
+
+        self.files[relative] = [source_stat.st_mtime, source_stat.st_size, data_hash]
+        if data_hash == local_hash:
+            # touched but not changed
+            return False
+
+        local_folder = os.path.dirname(local_path)
+        if not os.path.isdir(local_folder):
+            os.makedirs(local_folder)
+        write_bytes(local_path, data)
+        os.utime(local_path, (source_stat.st_atime, source_stat.st_mtime))
+        return True
+
+    def remove_empty_folders(self):
+        for folder, folder_names, file_names in os.walk(self.local_root, topdown=False):
+            if folder != self.local_root and not os.listdir(folder):
+                os.rmdir(folder)
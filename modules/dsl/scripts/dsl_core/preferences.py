@@ -0,0 +1,286 @@
+"""Where dsl keeps its files and how its preferences are read and written"""
+
+import os
+import copy
+import json
+import time
+import threading
+
+from .files import write_json
+
+# every preference a fresh install starts with
+DEFAULT_PREFERENCES = {'folders': '', 'default_folder': '', 'position': '', 'dockable': False,
+                       'docking_position': '', 'scan_threads': 0, 'scan_processes': False, 'watch_mode': 'off',
+                       'watch_interval': 2000, 'button_engine': 'widgets', 'background_scan': True,
+                       'view_cache_size': 3, 'merged_view': False, 'use_manifest': True,
+                       'mirror_libraries': False, 'record_timings': False, 'prewarm_scripts': True,
+                       'prewarm_count': 5, 'prewarm_budget': 2000, 'macros': {}}
+
+PREFERENCES_FILE = 'dsl_preferences.json'
+SCRIPT_INDEX_FILE = 'dsl_script_index.json'
+
+
+def user_pref_dir():
+    """
+    the folder dsl stores its files in, maya's user prefs when running in maya
+    :return: str, path to the folder, DSL_PREF_DIR overrides it outside of maya
+    """
+    pref_dir = os.environ.get('DSL_PREF_DIR')
+    if pref_dir:
+        return pref_dir
+
+    try:
+        from maya import cmds
+        pref_dir = cmds.internalVar(userPrefDir=True)
+    except (ImportError, AttributeError):
+        # plain python, or maya.cmds before maya.standalone was initialized
+        pref_dir = None
+
+    return pref_dir or os.path.join(os.path.expanduser('~'), '.dsl')
+
+
+def user_app_dir():
+    """
+    the folder dsl keeps local copies of libraries in, maya's user app dir when running in maya
+    :return: str, path to the folder, DSL_APP_DIR overrides it outside of maya
+    """
+    app_dir = os.environ.get('DSL_APP_DIR')
+    if app_dir:
+        return app_dir
+
+    try:
+        from maya import cmds
+        app_dir = cmds.internalVar(userAppDir=True)
+    except (ImportError, AttributeError):
+        app_dir = None
+
+    return app_dir or os.path.join(os.path.expanduser('~'), '.dsl')
+
+
+def pref_path(file_name):
+    """
+    :param file_name: str, name of a file dsl keeps in its prefs folder
+    :return: str, the full path to the file
+    """
+    return os.path.join(user_pref_dir(), file_name).replace('\\', '/')
+
+
+def load_preferences(preferences_file):
+    """
+    Load the json with a list of possible script folders and the rest of the settings
+    :param preferences_file: str, path to the json file
+    :return: dict, the preferences, None if they could not be read
+    """
+    if os.path.isfile(preferences_file):
+        try:
+            with open(preferences_file, 'r') as read_file:
+                return json.load(read_file)
+        except Exception as e:
+            print(e)
+
+
+def save_preferences(preferences_file, preferences):
+    """
+    :param preferences_file: str, path to the json file
+    :param preferences: dict, the preferences to save
+    """
+    pref_dir = os.path.dirname(preferences_file)
+    if pref_dir and not os.path.isdir(pref_dir):
+        os.makedirs(pref_dir)
+
+    # written next to the file and moved over it, a crash mid save leaves the old preferences intact
+    write_json(preferences_file, preferences, indent=2)
+
+
+def file_stamp(file_path):
+    """
+    :param file_path: str, path to a file
+    :return: tuple(float, int), the mtime and size of the file, None if it doesn't exist
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return file_stat.st_mtime, file_stat.st_size
+
+
+# tells a preference that isn't set apart from one set to None
+MISSING = object()
+
+
+class PreferenceStore(object):
+    """
+    The preferences of the session, read from disk once and served from memory. Changes are saved in the background
+    a moment after the last one and every listener hears about them. Edits made to the file outside of the session
+    are noticed by its mtime and size
+    """
+
+    def __init__(self, preferences_file=None, save_delay=0.5, check_interval=1.0):
+        """
+        :param preferences_file: str, path to the json file, dsl_preferences.json in the user prefs by default
+        :param save_delay: float, seconds to wait for more changes before saving
+        :param check_interval: float, the file is stated at most this often to look for outside edits
+        """
+        self.preferences_file = preferences_file
+        self.save_delay = save_delay
+        self.check_interval = check_interval
+        self.data = None
+        self.loaded = False
+        self.stamp = None
+        self.check_time = 0.0
+
+        # keys changed in memory that aren't saved yet
+        self.pending_keys = set()
+        self.save_timer = None
+        self.listeners = []
+        self.lock = threading.RLock()
+
+    def file_path(self):
+        # looked up once, on the main thread, saves happen on a timer thread where maya.cmds can't be used
+        if self.preferences_file is None:
+            self.preferences_file = pref_path(PREFERENCES_FILE)
+
+        return self.preferences_file
+
+    def add_listener(self, listener):
+        """
+        :param listener: callable, called with a dict of every changed key and its new value, None for removed keys
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, changed):
+        for listener in list(self.listeners):
+            listener(changed)
+
+    def load(self):
+        """
+        read the preferences from disk, changes that are still waiting to be saved are kept on top of them
+        :return: dict, the keys whose values changed and their new values
+        """
+        file_path = self.file_path()
+        stamp = file_stamp(file_path)
+        data = load_preferences(file_path) if stamp is not None else None
+
+        with self.lock:
+            old_data = self.data or {}
+            if data is None and self.data is not None:
+                # the file went away or can't be read, the preferences in memory are the better copy
+                data = self.data
+            elif data is not None and self.data is not None:
+                for key in self.pending_keys:
+                    if key in self.data:
+                        data[key] = self.data[key]
+                    else:
+                        data.pop(key, None)
+
+            self.data = data
+            self.stamp = stamp
+            self.loaded = True
+            self.check_time = time.time()
+
+            new_data = data or {}
+            return dict((key, new_data.get(key)) for key in set(old_data) | set(new_data)
+                        if old_data.get(key, MISSING) != new_data.get(key, MISSING))
+
+    def check(self, force=False):
+        """
+        read the file again if it was edited outside of the session, listeners hear about what that changed
+        :param force: bool, look at the file even if it was looked at moments ago
+        """
+        if self.loaded:
+            if not force and time.time() - self.check_time < self.check_interval:
+                return
+            self.check_time = time.time()
+            if file_stamp(self.file_path()) == self.stamp:
+                return
+
+            changed = self.load()
+            if changed:
+                self.notify(changed)
+        else:
+            self.load()
+
+    def get(self, key, default=None):
+        """
+        :param key: str, name of a preference
+        :param default: what to return if the preference isn't set
+        :return: the value of the preference, a copy so changing it doesn't change the preferences
+        """
+        self.check()
+        with self.lock:
+            if self.data is None or key not in self.data:
+                return default
+            return copy.deepcopy(self.data[key])
+
+    def copy(self):
+        """
+        :return: dict, a copy of every preference, None if they could not be read
+        """
+        self.check()
+        with self.lock:
+            return copy.deepcopy(self.data)
+
+    def update(self, values, replace=False):
+        """
+        change preferences, they are saved once no more changes came in for a moment
+        :param values: dict, the preferences to change
+        :param replace: bool, True to also remove the preferences that aren't in values
+        :return: dict, the keys whose values changed and their new values
+        """
+        self.check()
+        with self.lock:
+            if self.data is None:
+                self.data = {}
+
+            changed = dict((key, copy.deepcopy(value)) for key, value in values.items()
+                           if self.data.get(key, MISSING) != value)
+            self.data.update(changed)
+            if replace:
+                for key in [key for key in self.data if key not in values]:
+                    del self.data[key]
+                    changed[key] = None
+            self.pending_keys.update(changed)
+
+        if changed:
+            self.schedule_save()
+            self.notify(changed)
+
+        return changed
+
+    def set(self, key, value):
+        return self.update({key: value})
+
+    def schedule_save(self):
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """
+        save the changes that are waiting right away
+        """
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.pending_keys:
+                return
+
+            file_path = self.file_path()
+            try:
+                save_preferences(file_path, self.data)
+            except (IOError, OSError) as e:
+                print('unable to save the preferences %s' % e)
+                return
+
+            self.pending_keys = set()
+            self.stamp = file_stamp(file_path)
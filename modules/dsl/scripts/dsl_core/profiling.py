@@ -0,0 +1,103 @@
+"""Runs a button under the profiler and keeps a report of every run"""
+
+import os
+import time
+import pstats
+import cProfile
+import traceback
+
+from .preferences import user_app_dir
+
+PROFILE_FOLDER = 'dsl_profiles'
+
+
+def profile_folder():
+    return os.path.join(user_app_dir(), PROFILE_FOLDER).replace('\\', '/')
+
+
+class ProfileReport(object):
+    """
+    The outcome of one profiled run: how long it took, where the time went and the files it was saved to
+    """
+
+    def __init__(self, name, wall_time, hotspots=None, stats_file=None, summary_file=None, error=None):
+        """
+        :param name: str, what was run
+        :param wall_time: float, how long the run took in seconds
+        :param hotspots: list(tuple(str, int, float, float)), the function, call count, own time and total time
+                         of the functions that took the most time by themselves, empty without the profiler
+        :param stats_file: str, the .pstats file of the run, None without the profiler
+        :param summary_file: str, the text report of the run
+        :param error: str, the traceback if the run failed
+        """
+        self.name = name
+        self.wall_time = wall_time
+        self.hotspots = hotspots or []
+        self.stats_file = stats_file
+        self.summary_file = summary_file
+        self.error = error
+
+
+def function_label(function_key):
+    """
+    :param function_key: tuple(str, int, str), the file, line and name pstats keys a function by
+    :return: str, a readable name for the function
+    """
+    file_name, line, name = function_key
+    if file_name == '~':
+        # built in functions
+        return name
+
+    return '%s (%s:%s)' % (name, os.path.basename(file_name), line)
+
+
+def run_profiled(name, function, use_profiler=True, report_dir=None, hotspot_count=15):
+    """
+    run a function and save a report of where the time went, a failing function still gets its report
+    :param name: str, what is being run, used to name the report files
+    :param function: callable, what to run
+    :param use_profiler: bool, False to only time the run, for mel which the python profiler can't see into
+    :param report_dir: str, where to save the report, the user app dir by default
+    :param hotspot_count: int, how many of the slowest functions the report lists
+    :return: ProfileReport, the report of the run
+    """
+    report_dir = report_dir or profile_folder()
+    if not os.path.isdir(report_dir):
+        os.makedirs(report_dir)
+    run_time = time.time()
+    run_name = '%s_%s_%03d' % (name, time.strftime('%Y%m%d_%H%M%S', time.localtime(run_time)), run_time % 1 * 1000)
+    base_path = os.path.join(report_dir, run_name).replace('\\', '/')
+
+    profile = cProfile.Profile() if use_profiler else None
+    error = None
+    start_time = time.time()
+    try:
+        if profile is not None:
+            profile.runcall(function)
+        else:
+            function()
+    except Exception:
+        error = traceback.format_exc()
+    wall_time = time.time() - start_time
+
+    stats_file = hotspots = None
+    summary_file = base_path + '.txt'
+    with open(summary_file, 'w') as write_file:
+        write_file.write('%s ran in %.3fs\n\n' % (name, wall_time))
+        if error:
+            write_file.write(error + '\n')
+
+        if profile is not None:
+            stats_file = base_path + '.pstats'
+            profile.dump_stats(stats_file)
+
+            stats = pstats.Stats(profile, stream=write_file)
+            stats.sort_stats('cumulative').print_stats(40)
+
+            # the functions that took the most time by themselves, leaving out the profiler switching itself off
+            function_stats = [item for item in stats.stats.items() if '_lsprof' not in item[0][2]]
+            slowest = sorted(function_stats, key=lambda item: item[1][2], reverse=True)[:hotspot_count]
+            hotspots = [(function_label(key), call_count, own_time, total_time)
+                        for key, (_, call_count, own_time, total_time, _) in slowest]
+
+    return ProfileReport(name, wall_time, hotspots, stats_file, summary_file, error)
@@ -0,0 +1,474 @@
+"""Finds the scripts of a library folder and reads them through the script index"""
+
+import os
+import sys
+import stat
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+from .script import read_script_record
+from .manifest import Manifest, BYTECODE_FOLDER
+from .timing import tracer
+
+
+def list_script_files(folder):
+    """
+    lists the python and mel files found in a folder
+    :param folder: str, the folder to look in
+    :return: list(str), the paths of the files in the order the file system returned them
+    """
+    return [os.path.join(folder, f).replace('\\', '/') for f in os.listdir(folder)
+            if f.endswith('.py') or f.endswith('.mel')]
+
+
+def list_packages(folder):
+    """
+    lists the python packages found in a folder
+    :param folder: str, the folder to look in
+    :return: list(str), the paths of the package folders
+    """
+    package_paths = [os.path.join(folder, f).replace('\\', '/') for f in os.listdir(folder) if '.' not in f]
+    return [package_path for package_path in package_paths
+            if os.path.isfile(os.path.join(package_path, '__init__.py'))]
+
+
+def stat_script(file_path):
+    """
+    collects the info the script index needs to know if a file changed
+    :param file_path: str, path to the script
+    :return: tuple(str, float, int), the path, mtime and size of the file, None if it's not a regular file
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+
+    return file_path, file_stat.st_mtime, file_stat.st_size
+
+
+def make_process_pool():
+    # on windows the pool would launch new maya sessions unless we point it at mayapy
+    if sys.platform == 'win32':
+        mayapy = os.path.join(os.path.dirname(sys.executable), 'mayapy.exe')
+        if os.path.isfile(mayapy):
+            multiprocessing.set_executable(mayapy)
+
+    return multiprocessing.Pool()
+
+
+def parse_in_processes(file_paths, process_pool=None):
+    """
+    parses script headers in a pool of processes
+    :param file_paths: list(str), paths to the scripts
+    :param process_pool: ProcessPool, the pool of the scan, a pool is started just for these files if None
+    :return: list(dict), the script records in the same order as the paths
+    """
+    if len(file_paths) < 2:
+        return [read_script_record(file_path) for file_path in file_paths]
+
+    if process_pool is not None:
+        return process_pool.map(read_script_record, file_paths)
+
+    pool = make_process_pool()
+    try:
+        return pool.map(read_script_record, file_paths)
+    finally:
+        pool.close()
+        pool.join()
+
+
+class ProcessPool(object):
+    """
+    A pool of processes started on first use and shared by every batch of a scan, starting processes
+    costs more than parsing a batch of headers
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def map(self, function, items):
+        # the chunks of a merged library are read from several threads at once
+        with self.lock:
+            if self.pool is None:
+                self.pool = make_process_pool()
+            pool = self.pool
+
+        return pool.map(function, items)
+
+    def close(self):
+        with self.lock:
+            pool, self.pool = self.pool, None
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+class LibraryScanner(object):
+    """
+    Finds the scripts of a library folder and reads their headers through the script index,
+    the work can be spread over a thread pool and the results are handed out in batches
+    """
+
+    def __init__(self, root, script_index, scan_threads=0, scan_processes=False, use_manifest=False,
+                 process_pool=None):
+        """
+        :param process_pool: ProcessPool, a pool shared with other scanners, the scanner starts its own if None
+        """
+        self.root = root
+        self.script_index = script_index
+        self.scan_threads = scan_threads
+        self.scan_processes = scan_processes
+        self.use_manifest = use_manifest
+        self.thread_pool = None
+        self.process_pool = (process_pool or ProcessPool()) if scan_processes else None
+
+        # the manifest the library was read from, None if it was scanned
+        self.manifest = None
+
+        self.script_folders = []
+        self.script_files = []
+        self.packages = []
+
+    @property
+    def script_paths(self):
+        return [script_file[0] for script_file in self.script_files]
+
+    def module_candidates(self):
+        """
+        :return: list(tuple(str, str, str)), the name, folder and path of every importable module of the library,
+                 in the order python would find them
+        """
+        names = [(os.path.dirname(package_path), os.path.basename(package_path), package_path)
+                 for package_path in self.packages]
+        names += [(os.path.dirname(file_path), os.path.basename(file_path)[:-3], file_path)
+                  for file_path in self.script_paths if file_path.endswith('.py')]
+
+        # folders are searched in the order they used to be added to sys.path, packages before modules like python does
+        folder_order = dict((folder.replace('\\', '/'), i) for i, folder in enumerate(self.script_folders))
+        return [(name, folder, path) for folder, name, path in
+                sorted(names, key=lambda entry: folder_order.get(entry[0], len(folder_order)))]
+
+    @property
+    def modules(self):
+        """
+        the importable names of the library, when two folders hold the same name the first one found wins
+        :return: dict, module name to the folder holding it
+        """
+        return first_modules(self.module_candidates())
+
+    @property
+    def module_clashes(self):
+        return find_module_clashes(self.module_candidates())
+
+    def map(self, function, items):
+        # without a thread pool everything is scanned one folder and one file at a time
+        if self.thread_pool:
+            return self.thread_pool.map(function, items)
+
+        return [function(item) for item in items]
+
+    def parse(self, file_paths):
+        if self.scan_processes:
+            return parse_in_processes(file_paths, self.process_pool)
+
+        return self.map(read_script_record, file_paths)
+
+    def list_files(self):
+        """
+        find the script folders of the library and every python and mel file in them
+        """
+        if self.use_manifest and self.load_manifest():
+            return
+
+        with tracer.span('list_files', root=self.root):
+            self.list_folders()
+
+    def list_folders(self):
+        """
+        list the folders and files on disk, what list_files does when there is no manifest to read
+        """
+        if self.scan_threads > 1 and self.thread_pool is None:
+            self.thread_pool = ThreadPool(self.scan_threads)
+
+        # get list of files
+        root_entries = os.listdir(self.root)
+        root_paths = [os.path.join(self.root, folder) for folder in root_entries]
+        script_folders = [folder for folder, is_dir in zip(root_entries, self.map(os.path.isdir, root_paths))
+                          if is_dir and folder != BYTECODE_FOLDER]
+        script_folders.append(self.root)
+        self.script_folders = [os.path.join(self.root, folder) for folder in script_folders]
+
+        # make sure we look in the original directory too, as it may contain scrips as well
+        script_paths = [script_path for folder_files in self.map(list_script_files, self.script_folders)
+                        for script_path in folder_files]
+        self.script_files = [script_file for script_file in self.map(stat_script, script_paths) if script_file]
+        self.packages = [package for folder_packages in self.map(list_packages, self.script_folders)
+                         for package in folder_packages]
+
+    def load_manifest(self):
+        """
+        take the folders and files from the library's manifest if it is still up to date
+        :return: bool, True if the manifest was used
+        """
+        with tracer.span('load_manifest', root=self.root):
+            manifest = Manifest.load(self.root)
+            stale = manifest is not None and manifest.is_stale()
+
+        if manifest is None:
+            return False
+
+        if stale:
+            print('the manifest of %s is out of date, scanning the library instead' % self.root)
+            return False
+
+        self.manifest = manifest
+        self.script_folders = manifest.script_folders
+        self.script_files = manifest.script_files
+        self.packages = manifest.package_paths
+        return True
+
+    def iter_scripts(self, batch_size=None):
+        """
+        read the scripts that were listed, in the order they were found
+        :param batch_size: int, how many scripts to hand out at a time, everything at once if None
+        :return: generator(list(Script)), batches of scripts
+        """
+        for chunk in self.chunks(batch_size):
+            yield self.read(chunk)
+
+    def chunks(self, batch_size=None):
+        """
+        :param batch_size: int, how many files go in a chunk, everything in one chunk if None
+        :return: list(list(tuple(str, float, int))), the listed files split into chunks
+        """
+        batch_size = batch_size or len(self.script_files) or 1
+        return [self.script_files[start:start + batch_size] for start in range(0, len(self.script_files), batch_size)]
+
+    def read(self, script_files):
+        with tracer.span('read_headers', files=len(script_files)):
+            if self.manifest is not None:
+                return self.manifest.get_scripts(script_files)
+
+            return self.script_index.get_scripts(script_files, self.parse)
+
+    def finish(self, complete=True):
+        """
+        store whatever changed in the index for the next scan
+        :param complete: bool, False if the scan stopped early, in which case missing files are kept in the index
+        """
+        if self.manifest is not None:
+            # nothing was read through the index
+            return
+
+        if complete:
+            # forget scripts that were deleted
+            self.script_index.prune(self.root, set(self.script_paths))
+        self.script_index.save()
+
+    def close(self):
+        if self.thread_pool:
+            self.thread_pool.close()
+            self.thread_pool.join()
+            self.thread_pool = None
+
+        if self.process_pool:
+            self.process_pool.close()
+
+
+class MergedScanner(object):
+    """
+    Scans several library folders as one library. The folders are listed and read at the same time,
+    the scripts still come out folder by folder in the order the folders were given so the first folder wins
+    any name or button conflict
+    """
+
+    def __init__(self, roots, script_index, scan_threads=0, scan_processes=False, use_manifest=False):
+        self.roots = list(roots)
+        self.script_index = script_index
+        # the libraries are read at the same time, they share one pool of processes
+        process_pool = ProcessPool() if scan_processes else None
+        self.scanners = [LibraryScanner(root, script_index, scan_threads, scan_processes, use_manifest, process_pool)
+                         for root in self.roots]
+        self.failed_roots = []
+        self.thread_pool = None
+
+    @property
+    def manifest(self):
+        # the first manifest used, enough to tell manifests were involved
+        return next((scanner.manifest for scanner in self.scanners if scanner.manifest is not None), None)
+
+    @property
+    def script_folders(self):
+        return [folder for scanner in self.scanners for folder in scanner.script_folders]
+
+    @property
+    def script_files(self):
+        return [script_file for scanner in self.scanners for script_file in scanner.script_files]
+
+    @property
+    def script_paths(self):
+        return [script_file[0] for script_file in self.script_files]
+
+    def module_candidates(self):
+        # the libraries are searched in the order they were given, the first one wins a name they share
+        return [candidate for scanner in self.scanners for candidate in scanner.module_candidates()]
+
+    @property
+    def modules(self):
+        return first_modules(self.module_candidates())
+
+    @property
+    def module_clashes(self):
+        return find_module_clashes(self.module_candidates())
+
+    def map(self, function, items):
+        if self.thread_pool:
+            return self.thread_pool.map(function, items)
+
+        return [function(item) for item in items]
+
+    def list_files(self):
+        """
+        list every library at once, a library that can't be reached is skipped instead of failing the whole scan
+        """
+        # the index is shared by every library, load it once before the threads start reading it
+        if self.script_index.entries is None:
+            self.script_index.load()
+
+        if len(self.scanners) > 1 and self.thread_pool is None:
+            self.thread_pool = ThreadPool(len(self.scanners))
+
+        errors = self.map(list_library_files, self.scanners)
+        self.failed_roots = [(scanner.root, error) for scanner, error in zip(self.scanners, errors) if error]
+        failed = set(root for root, _ in self.failed_roots)
+        self.scanners = [scanner for scanner in self.scanners if scanner.root not in failed]
+
+    def iter_scripts(self, batch_size=None):
+        """
+        read the scripts of every library, chunks of different libraries are read at the same time
+        :param batch_size: int, how many scripts to hand out at a time, a library at a time if None
+        :return: generator(list(Script)), batches of scripts, in folder order
+        """
+        chunks = [(scanner, chunk) for scanner in self.scanners for chunk in scanner.chunks(batch_size)]
+        if self.thread_pool:
+            batches = self.thread_pool.imap(read_library_chunk, chunks)
+        else:
+            batches = (read_library_chunk(chunk) for chunk in chunks)
+
+        for batch in batches:
+            yield batch
+
+    def finish(self, complete=True):
+        if complete:
+            for scanner in self.scanners:
+                if scanner.manifest is None:
+                    self.script_index.prune(scanner.root, set(scanner.script_paths))
+        self.script_index.save()
+
+    def close(self):
+        for scanner in self.scanners:
+            scanner.close()
+
+        if self.thread_pool:
+            self.thread_pool.close()
+            self.thread_pool.join()
+            self.thread_pool = None
+
+
+def first_modules(candidates):
+    """
+    :param candidates: list(tuple(str, str, str)), the name, folder and path of every module, in search order
+    :return: dict, module name to the folder of the module that gets imported under it
+    """
+    modules = {}
+    for name, folder, _ in candidates:
+        modules.setdefault(name, folder)
+
+    return modules
+
+
+def find_module_clashes(candidates):
+    """
+    scripts share one namespace once they are imported, only the first module found under a name can ever run
+    :param candidates: list(tuple(str, str, str)), the name, folder and path of every module, in search order
+    :return: dict, module name to the paths of every module found under it, for the names found more than once,
+             the first path is the module that gets imported
+    """
+    paths = {}
+    for name, _, path in candidates:
+        paths.setdefault(name, []).append(path)
+
+    return dict((name, name_paths) for name, name_paths in paths.items() if len(name_paths) > 1)
+
+
+def list_library_files(scanner):
+    """
+    :param scanner: LibraryScanner, the scanner of one library
+    :return: str, why the library couldn't be listed, None if it was
+    """
+    try:
+        scanner.list_files()
+    except OSError as e:
+        scanner.close()
+        return str(e)
+
+
+def read_library_chunk(scanner_chunk):
+    scanner, script_files = scanner_chunk
+    return scanner.read(script_files)
+
+
+def group_scripts(scripts):
+    """
+    sorts scripts by the tabs they appear in
+    :param scripts: list(Script), the scripts in the order they were found
+    :return: dict, tab name to the list of valid scripts in that tab
+    """
+    found_scripts = {}
+    for script in scripts:
+        if script.is_valid:
+            for location in script.tab_names:
+                try:
+                    if location in found_scripts.keys():
+                        location_scripts = found_scripts[location]
+                        location_scripts.append(script)
+                        found_scripts[location] = location_scripts
+                    else:
+                        found_scripts[location] = [script]
+                except AttributeError:
+                    print('failed to add script %s' % script.file_path)
+
+    return found_scripts
+
+
+def report_broken_headers(scripts):
+    """
+    print the header errors of scripts that tried to define a button but got something wrong
+    :param scripts: list(Script), scripts to check
+    """
+    for script in scripts:
+        if script.has_broken_header:
+            for error in script.parse_errors:
+                location = script.file_path if error.line is None else '%s:%s' % (script.file_path, error.line)
+                print('%s %s' % (location, error.message))
+
+
+def diff_scripts(old_scripts, new_scripts):
+    """
+    compares two scans of a library
+    :param old_scripts: dict, file path to Script of the previous scan
+    :param new_scripts: dict, file path to Script of the new scan
+    :return: tuple(list(str), list(str), list(str)), the paths that were added, modified and removed
+    """
+    added = [file_path for file_path in new_scripts if file_path not in old_scripts]
+    removed = [file_path for file_path in old_scripts if file_path not in new_scripts]
+    modified = [file_path for file_path in new_scripts if file_path in old_scripts and
+                new_scripts[file_path].stamp != old_scripts[file_path].stamp]
+
+    return added, modified, removed
@@ -0,0 +1,177 @@
+"""The scripts of a library and the button info read from their headers"""
+
+import os
+
+from .header import HeaderError, ButtonTab, read_header
+from .timing import tracer
+
+DEFAULT_NAME = 'new button'
+DEFAULT_COLOR = 'yellow'
+DEFAULT_DESCRIPTION = 'no description'
+DEFAULT_HELP = 'no help :('
+
+# scripts share one copy of every tab name and color instead of each holding its own
+shared_values = {}
+
+
+def share(value):
+    """
+    :param value: a hashable value many scripts hold, such as a tab name
+    :return: the one copy of the value every script uses
+    """
+    return shared_values.setdefault(value, value)
+
+
+def header_fields(parsed_header):
+    """
+    :param parsed_header: header.Header, the header read from a script, None if it isn't a python or mel file
+    :return: tuple, the name, color, description, help, tabs, refresh suspension, errors and validity of
+             the script's button
+    """
+    if parsed_header is None:
+        return DEFAULT_NAME, DEFAULT_COLOR, DEFAULT_DESCRIPTION, DEFAULT_HELP, (), False, (), False
+
+    errors = tuple(parsed_header.errors)
+    if not parsed_header.is_valid:
+        return DEFAULT_NAME, DEFAULT_COLOR, DEFAULT_DESCRIPTION, DEFAULT_HELP, (), False, errors, False
+
+    return (parsed_header.button_name, parsed_header.button_color, parsed_header.button_description,
+            parsed_header.button_help, tuple(parsed_header.button_tabs), parsed_header.suspend_refresh,
+            errors, True)
+
+
+def read_script_header(file_path):
+    """
+    reads the dsl block at the top of the script, the file is only read until the block ends
+    :param file_path: str, path to the script
+    :return: header.Header, the parsed header, None if this isn't a python or mel file
+    """
+    # we only care about python and mel files
+    if (file_path.endswith('.py') or file_path.endswith('.mel')) and os.path.isfile(file_path):
+        return read_header(file_path)
+
+
+def restore_script(*fields):
+    """
+    rebuilds a copied or unpickled script without reading its file again
+    :param fields: the file path, stamp and header fields of the script, in the order Script.assign takes them
+    :return: Script, the restored script
+    """
+    script = Script.__new__(Script)
+    script.assign(*fields)
+    return script
+
+
+class Script(object):
+    """
+    A python or mel script and the button its header describes.
+    Scripts are immutable and only keep what the buttons need, a changed file gets a new script
+    """
+
+    __slots__ = ('file_path', 'button_name', 'button_color', 'button_description', 'button_help', 'button_tabs',
+                 'suspend_refresh', 'parse_errors', 'stamp', 'valid')
+
+    def __init__(self, file_path, stamp=None):
+        """
+        :param file_path: str, path to the script, its header is read right away
+        :param stamp: tuple(float, int), the mtime and size of the file
+        """
+        self.assign(file_path, stamp, *header_fields(read_script_header(file_path)))
+
+    def assign(self, file_path, stamp, button_name, button_color, button_description, button_help, button_tabs,
+               suspend_refresh, parse_errors, valid):
+        for name, value in (('file_path', file_path),
+                            ('stamp', stamp),
+                            ('button_name', button_name),
+                            ('button_color', share(button_color)),
+                            ('button_description', button_description),
+                            ('button_help', button_help),
+                            ('button_tabs', tuple(ButtonTab(share(tab), line, command)
+                                                  for tab, line, command in button_tabs)),
+                            ('suspend_refresh', suspend_refresh),
+                            ('parse_errors', parse_errors),
+                            ('valid', valid)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('scripts are immutable, %s can not be set' % name)
+
+    def __reduce__(self):
+        # the default copy and pickle protocols set the slots one by one, which scripts refuse
+        return restore_script, (self.file_path, self.stamp, self.button_name, self.button_color,
+                                self.button_description, self.button_help, self.button_tabs, self.suspend_refresh,
+                                self.parse_errors, self.valid)
+
+    @classmethod
+    def from_record(cls, file_path, record, stamp=None):
+        """
+        rebuilds a script from an index record without touching the file on disk
+        :param file_path: str, the path of the script the record belongs to
+        :param record: dict, the parsed header info as returned by to_record
+        :param stamp: tuple(float, int), the mtime and size of the file the record was read from
+        :return: Script, the restored script
+        """
+        script = cls.__new__(cls)
+        script.assign(file_path, stamp, record['button_name'], record['button_color'], record['button_description'],
+                      record['button_help'], record['button_tabs'], record['suspend_refresh'],
+                      tuple(HeaderError(*error) for error in record['parse_errors']), record['valid'])
+
+        return script
+
+    @property
+    def script_name(self):
+        return os.path.splitext(os.path.basename(self.file_path))[0]
+
+    @property
+    def script_extension(self):
+        return os.path.splitext(self.file_path)[1]
+
+    @property
+    def tab_names(self):
+        return [button_tab.tab for button_tab in self.button_tabs]
+
+    def button_tab(self, tab):
+        """
+        :param tab: str, name of a tab
+        :return: ButtonTab, the line and command of the button on that tab, None if it isn't on it
+        """
+        for button_tab in self.button_tabs:
+            if button_tab.tab == tab:
+                return button_tab
+
+        return None
+
+    @property
+    def is_valid(self):
+        return self.valid
+
+    @property
+    def has_broken_header(self):
+        """
+        a script that tried to define a button but got something wrong, as opposed to a plain helper module
+        """
+        return not self.valid and any(error.key is not None for error in self.parse_errors)
+
+    def to_record(self):
+        """
+        collects the parsed header info into a json friendly dict
+        :return: dict, the script info
+        """
+        return {'valid': self.valid,
+                'button_color': self.button_color,
+                'button_name': self.button_name,
+                'button_description': self.button_description,
+                'button_help': self.button_help,
+                'button_tabs': [list(button_tab) for button_tab in self.button_tabs],
+                'suspend_refresh': self.suspend_refresh,
+                'parse_errors': [list(error) for error in self.parse_errors]}
+
+
+def read_script_record(file_path):
+    """
+    parses a script header into an index record, this lives at the module level so process pools can pickle it
+    :param file_path: str, path to the script
+    :return: dict, the script info
+    """
+    with tracer.span('parse_script', script=file_path):
+        return Script(file_path=file_path).to_record()
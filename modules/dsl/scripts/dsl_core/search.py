@@ -0,0 +1,176 @@
+"""An in-memory inverted index over the buttons of a library, for instant ranked search"""
+
+import re
+import heapq
+from bisect import bisect_left
+from operator import itemgetter
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# how much a hit in each field counts towards the rank of a button
+FIELD_WEIGHTS = (('button_name', 4.0), ('button_description', 2.0), ('button_help', 1.0))
+TAB_WEIGHT = 2.0
+
+# a name that starts with what was typed goes to the top
+FIRST_WORD_WEIGHT = 6.0
+
+# a word typed in full beats a word that was only started, which beats a word that was misspelled
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.7
+FUZZY_SCORE = 0.4
+
+# how close a misspelled word has to be to count, as the share of trigrams it has in common
+FUZZY_SIMILARITY = 0.3
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+def trigrams(token):
+    padded = '^%s$' % token
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class SearchIndex(object):
+    """
+    Maps every word of a button's name, description, help and tab to the buttons using it,
+    every tab a script appears in is a separate result since each one runs its own command
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.entry_tokens = {}
+        self.file_entries = {}
+        self.postings = {}
+        self.trigrams = {}
+        self.next_id = 0
+
+        # the vocabulary in order, rebuilt on the first search after words were added or removed
+        self.sorted_tokens = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, script):
+        """
+        index the buttons of a script, a script that was indexed before is replaced
+        :param script: Script, a valid script
+        """
+        self.remove(script.file_path)
+
+        field_tokens = [(tokenize(getattr(script, field)), weight) for field, weight in FIELD_WEIGHTS]
+        field_tokens.append((tokenize(script.button_name)[:1], FIRST_WORD_WEIGHT))
+        entry_ids = []
+        for tab in script.tab_names:
+            entry_id = self.next_id
+            self.next_id += 1
+
+            weights = {}
+            for tokens, weight in field_tokens + [(tokenize(tab), TAB_WEIGHT)]:
+                for token in tokens:
+                    if weights.get(token, 0) < weight:
+                        weights[token] = weight
+
+            for token, weight in weights.items():
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = {}
+                    for trigram in trigrams(token):
+                        self.trigrams.setdefault(trigram, set()).add(token)
+                    self.sorted_tokens = None
+                postings.setdefault(weight, set()).add(entry_id)
+
+            self.entries[entry_id] = (script, tab)
+            self.entry_tokens[entry_id] = list(weights.items())
+            entry_ids.append(entry_id)
+
+        self.file_entries[script.file_path] = entry_ids
+
+    def remove(self, file_path):
+        """
+        :param file_path: str, path of the script whose buttons should no longer be found
+        """
+        for entry_id in self.file_entries.pop(file_path, []):
+            del self.entries[entry_id]
+            for token, weight in self.entry_tokens.pop(entry_id):
+                postings = self.postings[token]
+                postings[weight].discard(entry_id)
+                if not postings[weight]:
+                    del postings[weight]
+                if not postings:
+                    del self.postings[token]
+                    for trigram in trigrams(token):
+                        self.trigrams[trigram].discard(token)
+                    self.sorted_tokens = None
+
+    def clear(self):
+        self.__init__()
+
+    def expand(self, term):
+        """
+        finds the words of the index a typed word could stand for
+        :param term: str, a lower case word from the query
+        :return: list(tuple(str, float)), the matching words and how well they match
+        """
+        if self.sorted_tokens is None:
+            self.sorted_tokens = sorted(self.postings)
+
+        matches = []
+        start = bisect_left(self.sorted_tokens, term)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches.append((token, EXACT_SCORE if token == term else PREFIX_SCORE))
+
+        if matches or len(term) < 3:
+            return matches
+
+        # nothing starts with it, maybe it was misspelled
+        term_trigrams = trigrams(term)
+        shared = {}
+        for trigram in term_trigrams:
+            for token in self.trigrams.get(trigram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        for token, count in shared.items():
+            similarity = float(count) / max(len(term_trigrams), len(token))
+            if similarity >= FUZZY_SIMILARITY:
+                matches.append((token, FUZZY_SCORE * similarity))
+
+        return matches
+
+    def search(self, text, limit=50):
+        """
+        :param text: str, what the user typed, every word has to match for a button to be found
+        :param limit: int, the most results to return
+        :return: list(tuple(Script, str)), the matching scripts and the tab of the button, best match first
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        scores = None
+        for term in set(terms):
+            # postings are grouped by weight, applying the groups from the lowest score up leaves every button with
+            # its best score for the word without a python loop over each button
+            groups = [(weight * match_score, entry_ids) for token, match_score in self.expand(term)
+                      for weight, entry_ids in self.postings[token].items()]
+            groups.sort(key=itemgetter(0))
+
+            term_scores = {}
+            for score, entry_ids in groups:
+                term_scores.update(dict.fromkeys(entry_ids, score))
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = dict((entry_id, scores[entry_id] + term_scores[entry_id])
+                              for entry_id in set(scores).intersection(term_scores))
+
+            if not scores:
+                return []
+
+        best = heapq.nlargest(limit, scores, key=scores.get)
+        best.sort(key=lambda entry_id: (-scores[entry_id], self.entries[entry_id][0].button_name.lower()))
+        return [self.entries[entry_id] for entry_id in best]
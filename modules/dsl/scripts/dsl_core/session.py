@@ -0,0 +1,140 @@
+"""Everything a library adds to the python session, so it can all be taken out again when switching libraries"""
+
+import os
+import sys
+
+from .importer import LibraryFinder
+from .loader import ModuleLoader, MelSourcer
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.abspath(path)).replace('\\', '/')
+
+
+def normalize_roots(roots):
+    """
+    :param roots: str or list(str), a library folder, or the folders of a merged library
+    :return: tuple(str), the normalized folders, each ending with a slash
+    """
+    if isinstance(roots, (list, tuple)):
+        return tuple(normalize_path(root).rstrip('/') + '/' for root in roots)
+
+    return normalize_roots([roots])
+
+
+class LibrarySession(object):
+    """
+    The importer, loaded modules, sourced mel files and path entries that belong to one library,
+    or to the folders of a merged library
+    """
+
+    def __init__(self, roots, mel_evaluate=None):
+        """
+        :param roots: str or list(str), the library folder or folders
+        :param mel_evaluate: callable, runs a string of mel, maya.mel.eval in maya
+        """
+        self.roots = normalize_roots(roots)
+        self.finder = LibraryFinder()
+        self.loader = ModuleLoader()
+        self.mel = MelSourcer(mel_evaluate)
+        self.initial_paths = set(sys.path)
+        self.active = False
+
+    def start(self):
+        self.finder.install()
+        self.active = True
+
+    def set_modules(self, modules):
+        """
+        :param modules: dict, module name to the folder holding it, as found by the scanner
+        """
+        self.finder.set_modules(modules)
+
+    def run(self, module_name, command, file_path):
+        return self.loader.run(module_name, command, file_path)
+
+    def run_mel(self, command, file_path):
+        return self.mel.run(command, file_path)
+
+    def prewarm(self, module_name, file_path):
+        """
+        import a script ahead of its first click, a script that is already loaded and current is left alone
+        :param module_name: str, the module name of the script
+        :param file_path: str, path to the script
+        """
+        self.loader.load(module_name, file_path)
+
+    def owns(self, path):
+        """
+        :param path: str, a file or folder
+        :return: bool, True if the path is inside the library
+        """
+        return bool(path) and (normalize_path(path) + '/').startswith(self.roots)
+
+    def introduced_modules(self):
+        """
+        :return: list(str), the names of the loaded modules that came from the library, helpers included
+        """
+        return [name for name, module in list(sys.modules.items())
+                if self.owns(getattr(module, '__file__', None))]
+
+    def close(self):
+        """
+        remove the library from the python session, its modules are unloaded and the path entries it added dropped
+        :return: int, the number of modules that were unloaded
+        """
+        self.finder.uninstall()
+
+        module_names = self.introduced_modules()
+        for name in module_names:
+            del sys.modules[name]
+        self.loader.modules.clear()
+        self.mel.forget()
+
+        # scripts that extend sys.path themselves are cleaned up too
+        sys.path[:] = [path for path in sys.path if path in self.initial_paths or not self.owns(path)]
+        for path in list(sys.path_importer_cache.keys()):
+            if self.owns(path):
+                del sys.path_importer_cache[path]
+
+        self.active = False
+        return len(module_names)
+
+
+class SessionManager(object):
+    """
+    Keeps track of the library that is currently loaded, switching to another one closes the old session first
+    """
+
+    def __init__(self, mel_evaluate=None):
+        """
+        :param mel_evaluate: callable, runs a string of mel, maya.mel.eval in maya
+        """
+        self.mel_evaluate = mel_evaluate
+        self.current = None
+
+    def is_current(self, roots):
+        """
+        :param roots: str or list(str), a library folder or folders
+        :return: bool, True if the current session belongs to exactly these folders
+        """
+        return self.current is not None and bool(roots) and normalize_roots(roots) == self.current.roots
+
+    def switch(self, roots):
+        """
+        :param roots: str or list(str), the library folder or folders to switch to, None unloads the current library
+        :return: LibrarySession, the session of the library, None if no root was given
+        """
+        if self.current is not None:
+            if self.is_current(roots):
+                return self.current
+
+            unloaded = self.current.close()
+            print('unloaded %s modules of %s' % (unloaded, ', '.join(self.current.roots)))
+            self.current = None
+
+        if roots:
+            self.current = LibrarySession(roots, self.mel_evaluate)
+            self.current.start()
+
+        return self.current
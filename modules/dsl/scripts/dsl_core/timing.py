@@ -0,0 +1,171 @@
+"""Timing spans around the phases of dsl, off unless turned on from the File menu
+
+spans recorded in the background threads show up on their own rows of the trace, headers parsed in a process pool
+are not recorded since every process has its own tracer
+"""
+
+import os
+import time
+import threading
+from functools import wraps
+
+from .files import write_json
+
+
+class Span(object):
+    """
+    Times one run of a phase, used as a context manager
+    """
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(self.name, self.start, time.time() - self.start, self.args)
+        return False
+
+
+class NullSpan(object):
+    """
+    What a span is while the tracer is off, entering and leaving it costs next to nothing
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer(object):
+    """
+    Counts and times named spans, and keeps every run of them for a trace up to a limit
+    """
+
+    def __init__(self, max_events=200000):
+        """
+        :param max_events: int, runs kept for the trace, counts and totals keep going past it
+        """
+        self.enabled = False
+        self.max_events = max_events
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.events = []
+        self.stats = {}
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def span(self, name, **args):
+        """
+        :param name: str, the phase being timed
+        :param args: extra info kept with the run, such as the script it was for
+        :return: Span, a context manager timing the phase, a shared do-nothing one while the tracer is off
+        """
+        if not self.enabled:
+            return NULL_SPAN
+
+        return Span(self, name, args)
+
+    def timed(self, name):
+        """
+        a decorator timing every call of a function as a span
+        :param name: str, the phase the function is
+        """
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with Span(self, name, {}):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start, duration, args=None):
+        """
+        :param name: str, the phase
+        :param start: float, when the run started
+        :param duration: float, how long it took in seconds
+        :param args: dict, extra info about the run
+        """
+        thread_id = threading.current_thread().ident
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {'count': 0, 'total': 0.0, 'max': 0.0}
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['max'] = max(stats['max'], duration)
+
+            if len(self.events) < self.max_events:
+                self.events.append((name, start, duration, thread_id, args))
+
+    def clear(self):
+        with self.lock:
+            self.events = []
+            self.stats = {}
+            self.start_time = time.time()
+
+    def summary(self):
+        """
+        :return: list(dict), the name, count, total, mean and max time of every phase, slowest total first
+        """
+        with self.lock:
+            stats = [dict(stats, name=name, mean=stats['total'] / stats['count']) for name, stats in self.stats.items()]
+
+        return sorted(stats, key=lambda phase: phase['total'], reverse=True)
+
+    def format_summary(self):
+        """
+        :return: str, the summary as a table for the script editor
+        """
+        lines = ['%-24s %8s %12s %12s %12s' % ('phase', 'count', 'total ms', 'mean ms', 'max ms')]
+        for phase in self.summary():
+            lines.append('%-24s %8d %12.2f %12.3f %12.3f' % (phase['name'], phase['count'], phase['total'] * 1e3,
+                                                              phase['mean'] * 1e3, phase['max'] * 1e3))
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """
+        :return: dict, every recorded run as complete events of the chrome trace format,
+                 chrome://tracing and ui.perfetto.dev open it
+        """
+        with self.lock:
+            events = list(self.events)
+
+        process_id = os.getpid()
+        return {'traceEvents': [{'name': name, 'cat': 'dsl', 'ph': 'X', 'pid': process_id, 'tid': thread_id,
+                                 'ts': int((start - self.start_time) * 1e6), 'dur': int(duration * 1e6), 'args': args}
+                                for name, start, duration, thread_id, args in events],
+                'displayTimeUnit': 'ms',
+                'otherData': {'summary': self.summary()}}
+
+    def save(self, file_path, trace_format='chrome'):
+        """
+        :param file_path: str, the json file to write
+        :param trace_format: str, 'chrome' for a chrome trace, 'json' for the summary and the raw runs
+        """
+        if trace_format == 'chrome':
+            data = self.chrome_trace()
+        else:
+            with self.lock:
+                events = [{'name': name, 'start': start - self.start_time, 'duration': duration, 'thread': thread_id,
+                           'args': args} for name, start, duration, thread_id, args in self.events]
+            data = {'summary': self.summary(), 'events': events}
+
+        write_json(file_path, data)
+
+
+# the tracer every part of dsl records to
+tracer = Tracer()
@@ -0,0 +1,201 @@
+"""Which buttons get used, and warming up the favorites so their first click doesn't pay for the import
+
+the stats stay on the workstation, in the user prefs next to the other dsl files
+"""
+
+import os
+import json
+import time
+import threading
+from functools import partial
+
+from .files import write_json
+from .preferences import pref_path
+
+USAGE_FILE = 'dsl_usage.json'
+
+# a click counts half as much after this many days
+HALF_LIFE_DAYS = 7.0
+
+
+class UsageStats(object):
+    """
+    How often each script was run, when it was last run and how long its runs take, keyed by script path.
+    Clicks are saved in the background a moment after the last one
+    """
+
+    version = 1
+
+    def __init__(self, usage_file=None, save_delay=5.0):
+        """
+        :param usage_file: str, the json file of the stats, dsl_usage.json in the user prefs by default
+        :param save_delay: float, seconds to wait for more clicks before saving
+        """
+        self.usage_file = usage_file
+        self.save_delay = save_delay
+        self.scripts = None
+
+        # clicks recorded since the last save
+        self.dirty = False
+        self.save_timer = None
+        self.lock = threading.RLock()
+
+    def file_path(self):
+        # the prefs folder is looked up once the stats are first needed, maya may not be up at import time,
+        # and on the main thread since saves happen on a timer thread where maya.cmds can't be used
+        if self.usage_file is None:
+            self.usage_file = pref_path(USAGE_FILE)
+
+        return self.usage_file
+
+    def load(self):
+        """
+        read the stats from disk, unreadable stats start over
+        """
+        self.scripts = {}
+        if os.path.isfile(self.file_path()):
+            try:
+                with open(self.file_path(), 'r') as read_file:
+                    data = json.load(read_file)
+
+                if data.get('version') == self.version:
+                    self.scripts = data.get('scripts', {})
+            except (IOError, ValueError) as e:
+                print('unable to read the usage stats %s' % e)
+
+    def save(self):
+        with self.lock:
+            try:
+                write_json(self.file_path(), {'version': self.version, 'scripts': self.scripts})
+            except (IOError, OSError) as e:
+                print('unable to save the usage stats %s' % e)
+                return
+
+            self.dirty = False
+
+    def schedule_save(self):
+        self.file_path()
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """
+        save the clicks that are waiting right away
+        """
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if self.dirty:
+                self.save()
+
+    def record(self, script_path, run_time, now=None):
+        """
+        :param script_path: str, the script that was run
+        :param run_time: float, how long the run took in seconds
+        :param now: float, when the script was run, the current time by default
+        """
+        if self.scripts is None:
+            self.load()
+
+        # a save on the timer thread may be writing the stats out
+        with self.lock:
+            stats = self.scripts.setdefault(script_path, {'clicks': 0, 'last_used': 0.0, 'total_time': 0.0,
+                                                          'last_time': 0.0})
+            stats['clicks'] += 1
+            stats['last_used'] = time.time() if now is None else now
+            stats['total_time'] += run_time
+            stats['last_time'] = run_time
+            self.dirty = True
+
+    def get(self, script_path):
+        """
+        :param script_path: str, path to a script
+        :return: dict, the clicks, last used time, total and last run time of the script, None if it never ran
+        """
+        if self.scripts is None:
+            self.load()
+
+        return self.scripts.get(script_path)
+
+    def frecency(self, script_path, now=None):
+        """
+        :param script_path: str, path to a script
+        :param now: float, the time to rank at, the current time by default
+        :return: float, the clicks of the script, fading with the time since it was last used
+        """
+        stats = self.get(script_path)
+        if stats is None:
+            return 0.0
+
+        age_days = max(0.0, (time.time() if now is None else now) - stats['last_used']) / 86400.0
+        return stats['clicks'] * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+    def most_frecent(self, script_paths, count, now=None):
+        """
+        :param script_paths: iterable(str), the scripts to pick from
+        :param count: int, how many to pick
+        :param now: float, the time to rank at, the current time by default
+        :return: list(str), the scripts that were used the most lately, most frecent first, unused scripts are left out
+        """
+        ranked = [(self.frecency(script_path, now), script_path) for script_path in script_paths]
+        ranked = sorted((rank for rank in ranked if rank[0] > 0), reverse=True)
+
+        return [script_path for _, script_path in ranked[:count]]
+
+
+class Prewarmer(object):
+    """
+    Runs a queue of warm up tasks one at a time whenever the host is idle, until the queue or the time budget runs out
+    """
+
+    def __init__(self, schedule):
+        """
+        :param schedule: callable, runs a function once the host is idle, maya.utils.executeDeferred in maya
+        """
+        self.schedule = schedule
+        self.generation = 0
+        self.tasks = []
+        self.budget = 0.0
+        self.warmed = []
+
+    def start(self, tasks, budget):
+        """
+        replace whatever is still queued with new tasks
+        :param tasks: list(tuple(str, callable)), a name and a function for every task, in the order to run them
+        :param budget: float, seconds the tasks may take together, the task crossing it is the last one
+        """
+        self.generation += 1
+        self.tasks = list(tasks)
+        self.budget = budget
+        self.warmed = []
+        if self.tasks:
+            self.schedule(partial(self.step, self.generation))
+
+    def stop(self):
+        self.generation += 1
+        self.tasks = []
+
+    def step(self, generation):
+        """
+        run the next task and queue the one after it
+        :param generation: int, the start call the step belongs to, steps queued for replaced tasks do nothing
+        """
+        if generation != self.generation or not self.tasks or self.budget <= 0:
+            return
+
+        name, task = self.tasks.pop(0)
+        start_time = time.time()
+        try:
+            task()
+            self.warmed.append(name)
+        except Exception as e:
+            print('unable to prewarm %s: %s' % (name, e))
+        self.budget -= time.time() - start_time
+
+        if self.tasks and self.budget > 0:
+            self.schedule(partial(self.step, generation))